@@ -5,9 +5,12 @@ import time
 from util import generate_draft_url, is_windows_path, url_to_hash
 import re
 from typing import Optional, Dict, Tuple, List
-from pyJianYingDraft import exceptions, Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, CapCut_Voice_filters_effect_type,CapCut_Voice_characters_effect_type,CapCut_Speech_to_song_effect_type, trange
+from pyJianYingDraft import exceptions, trange
 from create_draft import get_or_create_draft
 from settings.local import IS_CAPCUT_ENV
+import logging
+
+logger = logging.getLogger('flask_video_generator')
 
 def add_audio_track(
     audio_url: str,
@@ -56,6 +59,45 @@ def add_audio_track(
     else:
        script.add_track(draft.Track_type.audio)
 
+    audio_segment = build_audio_segment(
+        draft_id,
+        audio_url,
+        draft_folder=draft_folder,
+        start=start,
+        end=end,
+        target_start=target_start,
+        volume=volume,
+        speed=speed,
+        sound_effects=sound_effects,
+        duration=duration
+    )
+
+    # Add audio segment to track
+    script.add_segment(audio_segment, track_name=track_name)
+    
+    return {
+        "draft_id": draft_id,
+        "draft_url": generate_draft_url(draft_id)
+    }
+
+
+def build_audio_segment(
+    draft_id: str,
+    audio_url: str,
+    draft_folder: Optional[str] = None,
+    start: float = 0,
+    end: Optional[float] = None,
+    target_start: float = 0,
+    volume: float = 1.0,
+    speed: float = 1.0,
+    sound_effects: Optional[List[Tuple[str, Optional[List[Optional[float]]]]]] = None,
+    duration: Optional[float] = None
+) -> draft.Audio_segment:
+    """
+    Build an audio segment without adding it to a track, parameters are the same as add_audio_track
+    :param draft_id: Draft ID, used to build the replacement path under draft_folder
+    :return: The audio segment
+    """
     # If duration parameter is provided, prioritize it; otherwise use default audio duration of 0 seconds, real duration will be obtained during download
     if duration is not None:
         # Use the provided duration, skip duration retrieval and checking
@@ -100,7 +142,7 @@ def add_audio_track(
     
     # Create audio segment
     if draft_audio_path:
-        print('replace_path:', draft_audio_path)
+        logger.info(f"replace_path: {draft_audio_path}")
         audio_material = draft.Audio_material(replace_path=draft_audio_path, remote_url=audio_url, material_name=material_name, duration=audio_duration)
     else:
         audio_material = draft.Audio_material(remote_url=audio_url, material_name=material_name, duration=audio_duration)
@@ -121,29 +163,29 @@ def add_audio_track(
             if IS_CAPCUT_ENV:
                 # In CapCut environment, look for effects in CapCut_Voice_filters_effect_type
                 try:
-                    effect_type = getattr(CapCut_Voice_filters_effect_type, effect_name)
+                    effect_type = getattr(draft.CapCut_Voice_filters_effect_type, effect_name)
                 except AttributeError:
                     try:
                         # Look for effects in CapCut_Voice_characters_effect_type
-                        effect_type = getattr(CapCut_Voice_characters_effect_type, effect_name)
+                        effect_type = getattr(draft.CapCut_Voice_characters_effect_type, effect_name)
                     except AttributeError:
                         # If still not found, look for effects in CapCut_Speech_to_song_effect_type
                         try:
-                            effect_type = getattr(CapCut_Speech_to_song_effect_type, effect_name)
+                            effect_type = getattr(draft.CapCut_Speech_to_song_effect_type, effect_name)
                         except AttributeError:
                             effect_type = None
             else:
                 # In JianYing environment, look for effects in Audio_scene_effect_type
                 try:
-                    effect_type = getattr(Audio_scene_effect_type, effect_name)
+                    effect_type = getattr(draft.Audio_scene_effect_type, effect_name)
                 except AttributeError:
                     # If not found in Audio_scene_effect_type, continue searching in other effect types
                     try:
-                        effect_type = getattr(Tone_effect_type, effect_name)
+                        effect_type = getattr(draft.Tone_effect_type, effect_name)
                     except AttributeError:
                         # If still not found, look for effects in Speech_to_song_type
                         try:
-                            effect_type = getattr(Speech_to_song_type, effect_name)
+                            effect_type = getattr(draft.Speech_to_song_type, effect_name)
                         except AttributeError:
                             effect_type = None
             
@@ -151,12 +193,6 @@ def add_audio_track(
             if effect_type:
                 audio_segment.add_effect(effect_type, params)
             else:
-                print(f"Warning: Audio effect named {effect_name} not found")
-    
-    # Add audio segment to track
-    script.add_segment(audio_segment, track_name=track_name)
-    
-    return {
-        "draft_id": draft_id,
-        "draft_url": generate_draft_url(draft_id)
-    }
+                logger.warning(f"Audio effect named {effect_name} not found")
+
+    return audio_segment
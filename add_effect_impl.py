@@ -1,4 +1,4 @@
-from pyJianYingDraft import trange, Video_scene_effect_type, Video_character_effect_type, CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type, exceptions
+from pyJianYingDraft import trange, exceptions
 import pyJianYingDraft as draft
 from typing import Optional, Dict, List, Union, Literal
 from create_draft import get_or_create_draft
@@ -40,51 +40,63 @@ def add_effect_impl(
     duration = end - start
     t_range = trange(f"{start}s", f"{duration}s")
 
+    effect_enum = resolve_effect_type(effect_type, effect_category)
+
+    # Add effect track (only when track doesn't exist)
+    if track_name is not None:
+        try:
+            imported_track=script.get_imported_track(draft.Track_type.effect, name=track_name)
+            # If no exception is thrown, the track already exists
+        except exceptions.TrackNotFound:
+            # Track doesn't exist, create a new track
+            script.add_track(draft.Track_type.effect, track_name=track_name)
+    else:
+        script.add_track(draft.Track_type.effect)
+
+    # Add effect
+    script.add_effect(effect_enum, t_range, params=params[::-1], track_name=track_name)
+
+    return {
+        "draft_id": draft_id,
+        "draft_url": generate_draft_url(draft_id)
+    }
+
+
+def resolve_effect_type(effect_type: str, effect_category: Literal["scene", "character"]):
+    """
+    Look up a video effect by name in the effect catalog of the current environment
+    :param effect_type: Effect type name
+    :param effect_category: Effect category, "scene" or "character"
+    :return: The effect enum member
+    """
     # Select the corresponding effect type based on effect category and environment
     effect_enum = None
     if IS_CAPCUT_ENV:
         # If in CapCut environment, use CapCut effects
         if effect_category == "scene":
             try:
-                effect_enum = CapCut_Video_scene_effect_type[effect_type]
+                effect_enum = draft.CapCut_Video_scene_effect_type[effect_type]
             except:
                 effect_enum = None
         elif effect_category == "character":
             try:
-                effect_enum = CapCut_Video_character_effect_type[effect_type]
+                effect_enum = draft.CapCut_Video_character_effect_type[effect_type]
             except:
                 effect_enum = None
     else:
         # Default to using JianYing effects
         if effect_category == "scene":
             try:
-                effect_enum = Video_scene_effect_type[effect_type]
+                effect_enum = draft.Video_scene_effect_type[effect_type]
             except:
                 effect_enum = None
         elif effect_category == "character":
             try:
-                effect_enum = Video_character_effect_type[effect_type]
+                effect_enum = draft.Video_character_effect_type[effect_type]
             except:
                 effect_enum = None
     
     if effect_enum is None:
         raise ValueError(f"Unknown {effect_category} effect type: {effect_type}")
 
-    # Add effect track (only when track doesn't exist)
-    if track_name is not None:
-        try:
-            imported_track=script.get_imported_track(draft.Track_type.effect, name=track_name)
-            # If no exception is thrown, the track already exists
-        except exceptions.TrackNotFound:
-            # Track doesn't exist, create a new track
-            script.add_track(draft.Track_type.effect, track_name=track_name)
-    else:
-        script.add_track(draft.Track_type.effect)
-
-    # Add effect
-    script.add_effect(effect_enum, t_range, params=params[::-1], track_name=track_name)
-
-    return {
-        "draft_id": draft_id,
-        "draft_url": generate_draft_url(draft_id)
-    }
+    return effect_enum
@@ -9,6 +9,9 @@ import re
 from typing import Optional, Dict
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
+import logging
+
+logger = logging.getLogger('flask_video_generator')
 
 def add_image_impl(
     image_url: str,
@@ -129,7 +132,7 @@ def add_image_impl(
             draft_image_path = os.path.join(draft_folder, draft_id, "assets", "image", material_name)
         
         # Print path information
-        print('replace_path:', draft_image_path)
+        logger.info(f"replace_path: {draft_image_path}")
     
     # Create image material
     if draft_image_path:
@@ -2,8 +2,8 @@ import pyJianYingDraft as draft
 from util import generate_draft_url, hex_to_rgb
 from create_draft import get_or_create_draft
 from pyJianYingDraft.text_segment import TextBubble, TextEffect
+from downloader import fetch_text
 from typing import Optional
-import requests
 import os
 
 def add_subtitle_impl(
@@ -49,7 +49,7 @@ def add_subtitle_impl(
 ):
     """
     Add subtitles to draft
-    :param srt_path: Subtitle file path or URL or SRT text content
+    :param srt_path: Subtitle file path or URL or subtitle text content, SRT or WebVTT
     :param draft_id: Draft ID, if None, create a new draft
     :param track_name: Track name, default is "subtitle"
     :param time_offset: Time offset, default is "0"s
@@ -71,19 +71,13 @@ def add_subtitle_impl(
     # Check if it's a URL
     if srt_path.startswith(('http://', 'https://')):
         try:
-            response = requests.get(srt_path)
-            response.raise_for_status()
-
-            response.encoding = 'utf-8'
-            srt_content = response.text
+            # Pooled, with a timeout, and cached: the same URL applied to many drafts is downloaded once
+            srt_content = fetch_text(srt_path)
         except Exception as e:
             raise Exception(f"Failed to download subtitle file: {str(e)}")
     elif os.path.isfile(srt_path):  # Check if it's a file
-        try:
-            with open(srt_path, 'r', encoding='utf-8-sig') as f:
-                srt_content = f.read()
-        except Exception as e:
-            raise Exception(f"Failed to read local subtitle file: {str(e)}")
+        # import_srt reads local files line by line itself
+        srt_content = srt_path
     else:
         # If not a URL or local file, use content directly
         srt_content = srt_path
@@ -101,7 +95,7 @@ def add_subtitle_impl(
             alpha=border_alpha,
             color=hex_to_rgb(border_color),
             width=border_width
-        )
+        ).intern()
     
     # Create text_background
     text_background = None
@@ -110,7 +104,7 @@ def add_subtitle_impl(
             color=background_color,
             style=background_style,
             alpha=background_alpha
-        )
+        ).intern()
     
     # Create text_style
     text_style = draft.Text_style(
@@ -122,7 +116,7 @@ def add_subtitle_impl(
         align=1,  # Keep center alignment
         vertical=vertical,  # Use the passed vertical parameter
         alpha=alpha  # Use the passed alpha parameter
-    )
+    ).intern()
     
     # Create bubble effect
     text_bubble = None
@@ -1,11 +1,14 @@
 import pyJianYingDraft as draft
 from settings.local import IS_CAPCUT_ENV
 from util import generate_draft_url, hex_to_rgb
-from pyJianYingDraft import trange, Font_type
+from pyJianYingDraft import trange
 from typing import Optional, List  # add List type hint
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
-from pyJianYingDraft.text_segment import TextBubble, TextEffect, TextStyleRange
+from pyJianYingDraft.text_segment import TextBubble, TextEffect, TextStyleRange, Text_style, Text_border
+import logging
+
+logger = logging.getLogger('flask_video_generator')
 
 def add_text_impl(
     text: str,
@@ -101,24 +104,6 @@ def add_text_impl(
     :param text_styles: 文本的不同部分的样式列表，每个元素是一个TextStyleRange
     :return: Updated draft information
     """
-    # Validate if font is in Font_type
-    if font is None:
-        font_type = None
-    else:
-        try:
-            font_type = getattr(Font_type, font)
-        except:
-            available_fonts = [attr for attr in dir(Font_type) if not attr.startswith('_')]
-            raise ValueError(f"Unsupported font: {font}, please use one of the fonts in Font_type: {available_fonts}")
-    
-    # Validate alpha value range
-    if not 0.0 <= font_alpha <= 1.0:
-        raise ValueError("alpha value must be between 0.0 and 1.0")
-    if not 0.0 <= border_alpha <= 1.0:
-        raise ValueError("border_alpha value must be between 0.0 and 1.0")
-    if not 0.0 <= background_alpha <= 1.0:
-        raise ValueError("background_alpha value must be between 0.0 and 1.0")
-    
     # Get or create draft
     draft_id, script = get_or_create_draft(
         draft_id=draft_id,
@@ -126,6 +111,47 @@ def add_text_impl(
         height=height
     )
 
+    text_segment = build_text_segment(
+        script,
+        text=text,
+        start=start,
+        end=end,
+        transform_y=transform_y,
+        transform_x=transform_x,
+        font=font,
+        font_color=font_color,
+        font_size=font_size,
+        vertical=vertical,
+        font_alpha=font_alpha,
+        border_alpha=border_alpha,
+        border_color=border_color,
+        border_width=border_width,
+        background_color=background_color,
+        background_style=background_style,
+        background_alpha=background_alpha,
+        background_round_radius=background_round_radius,
+        background_height=background_height,
+        background_width=background_width,
+        background_horizontal_offset=background_horizontal_offset,
+        background_vertical_offset=background_vertical_offset,
+        shadow_enabled=shadow_enabled,
+        shadow_alpha=shadow_alpha,
+        shadow_angle=shadow_angle,
+        shadow_color=shadow_color,
+        shadow_distance=shadow_distance,
+        shadow_smoothing=shadow_smoothing,
+        bubble_effect_id=bubble_effect_id,
+        bubble_resource_id=bubble_resource_id,
+        effect_effect_id=effect_effect_id,
+        intro_animation=intro_animation,
+        intro_duration=intro_duration,
+        outro_animation=outro_animation,
+        outro_duration=outro_duration,
+        fixed_width=fixed_width,
+        fixed_height=fixed_height,
+        text_styles=text_styles
+    )
+
     # Add text track
     if track_name is not None:
         try:
@@ -137,6 +163,84 @@ def add_text_impl(
     else:
         script.add_track(draft.Track_type.audio)
 
+    # Add text segment to track
+    script.add_segment(text_segment, track_name=track_name)
+
+    return {
+        "draft_id": draft_id,
+        "draft_url": generate_draft_url(draft_id)
+    }
+
+
+def build_text_segment(
+    script: draft.Script_file,
+    text: str,
+    start: float,
+    end: float,
+    transform_y: float = -0.8,
+    transform_x: float = 0,
+    font: Optional[str] = None,
+    font_color: str = "#ffffff",
+    font_size: float = 8.0,
+    vertical: bool = False,
+    font_alpha: float = 1.0,
+    # Border parameters
+    border_alpha: float = 1.0,
+    border_color: str = "#000000",
+    border_width: float = 0.0,
+    # Background parameters
+    background_color: str = "#000000",
+    background_style: int = 1,
+    background_alpha: float = 0.0,
+    background_round_radius: float = 0.0,
+    background_height: float = 0.14,
+    background_width: float = 0.14,
+    background_horizontal_offset: float = 0.5,
+    background_vertical_offset: float = 0.5,
+    # Shadow parameters
+    shadow_enabled: bool = False,
+    shadow_alpha: float = 0.9,
+    shadow_angle: float = -45.0,
+    shadow_color: str = "#000000",
+    shadow_distance: float = 5.0,
+    shadow_smoothing: float = 0.15,
+    # Bubble effect
+    bubble_effect_id: str | None = None,
+    bubble_resource_id: str | None = None,
+    # Text effect
+    effect_effect_id: str | None = None,
+    intro_animation: str | None = None,
+    intro_duration: float = 0.5,
+    outro_animation: str | None = None,
+    outro_duration: float = 0.5,
+    fixed_width: float = -1,  # Text fixed width ratio, default -1 means not fixed
+    fixed_height: float = -1,  # Text fixed height ratio, default -1 means not fixed
+    # 多样式文本参数
+    text_styles: Optional[List[TextStyleRange]] = None,  # 文本的不同部分的样式列表
+) -> draft.Text_segment:
+    """
+    Build a text segment without adding it to a track, parameters are the same as add_text_impl
+    :param script: Draft the segment is built for, its canvas size is used by fixed_width and fixed_height
+    :return: The text segment
+    """
+    # Validate if font is in Font_type
+    if font is None:
+        font_type = None
+    else:
+        try:
+            font_type = getattr(draft.Font_type, font)
+        except:
+            available_fonts = [attr for attr in dir(draft.Font_type) if not attr.startswith('_')]
+            raise ValueError(f"Unsupported font: {font}, please use one of the fonts in Font_type: {available_fonts}")
+    
+    # Validate alpha value range
+    if not 0.0 <= font_alpha <= 1.0:
+        raise ValueError("alpha value must be between 0.0 and 1.0")
+    if not 0.0 <= border_alpha <= 1.0:
+        raise ValueError("border_alpha value must be between 0.0 and 1.0")
+    if not 0.0 <= background_alpha <= 1.0:
+        raise ValueError("background_alpha value must be between 0.0 and 1.0")
+    
     # Convert hexadecimal color to RGB tuple
     try:
         rgb_color = hex_to_rgb(font_color)
@@ -151,7 +255,7 @@ def add_text_impl(
             alpha=border_alpha,
             color=rgb_border_color,
             width=border_width
-        )
+        ).intern()
     
     # Create text_background
     text_background = None
@@ -165,7 +269,7 @@ def add_text_impl(
             width=background_width,
             horizontal_offset=background_horizontal_offset,
             vertical_offset=background_vertical_offset
-        )
+        ).intern()
     
     # 创建text_shadow (阴影)
     text_shadow = None
@@ -177,7 +281,7 @@ def add_text_impl(
             color=shadow_color,
             distance=shadow_distance,
             smoothing=shadow_smoothing
-        )
+        ).intern()
 
     # Create bubble effect
     text_bubble = None
@@ -213,7 +317,7 @@ def add_text_impl(
             align=1,
             vertical=vertical,  # Set whether to display vertically
             alpha=font_alpha  # Set transparency
-        ),
+        ).intern(),
         clip_settings=draft.Clip_settings(transform_y=transform_y, transform_x=transform_x),
         border=text_border,
         background=text_background,
@@ -248,7 +352,7 @@ def add_text_impl(
             duration_microseconds = int(intro_duration * 1000000)
             text_segment.add_animation(animation_type, duration_microseconds)  # Add intro animation, set duration
         except:
-            print(f"Warning: Unsupported intro animation type {intro_animation}, this parameter will be ignored")
+            logger.warning(f"Unsupported intro animation type {intro_animation}, this parameter will be ignored")
 
     # Add outro animation
     if outro_animation:
@@ -261,12 +365,74 @@ def add_text_impl(
             duration_microseconds = int(outro_duration * 1000000)
             text_segment.add_animation(animation_type, duration_microseconds)  # Add outro animation, set duration
         except:
-            print(f"Warning: Unsupported outro animation type {outro_animation}, this parameter will be ignored")
+            logger.warning(f"Unsupported outro animation type {outro_animation}, this parameter will be ignored")
 
-    # Add text segment to track
-    script.add_segment(text_segment, track_name=track_name)
+    return text_segment
 
-    return {
-        "draft_id": draft_id,
-        "draft_url": generate_draft_url(draft_id)
-    }
+def parse_text_styles(
+    text_styles_data: Optional[List[dict]],
+    font: Optional[str] = None,
+    font_size: float = 8.0,
+    font_color: str = "#ffffff",
+    font_alpha: float = 1.0,
+    vertical: bool = False,
+    border_alpha: float = 1.0,
+    border_color: str = "#000000",
+    border_width: float = 0.0
+) -> Optional[List[TextStyleRange]]:
+    """
+    Build TextStyleRange objects from the JSON text_styles format accepted by /add_text
+    :param text_styles_data: List of {"start", "end", "style": {...}, "border": {...}, "font"} dicts
+    :param font: Default font of the ranges
+    :param font_size: Default font size of the ranges
+    :param font_color: Default font color of the ranges
+    :param font_alpha: Default font transparency of the ranges
+    :param vertical: Default vertical layout of the ranges
+    :param border_alpha: Default border transparency of the ranges
+    :param border_color: Default border color of the ranges
+    :param border_width: Default border width of the ranges
+    :return: List of TextStyleRange, None if no styles are given
+    """
+    text_styles = None
+    if text_styles_data:
+        text_styles = []
+        for style_data in text_styles_data:
+            # Get style range
+            start_pos = style_data.get('start', 0)
+            end_pos = style_data.get('end', 0)
+            
+            # Create text style
+            style = Text_style(
+                size=style_data.get('style', {}).get('size', font_size),
+                bold=style_data.get('style', {}).get('bold', False),
+                italic=style_data.get('style', {}).get('italic', False),
+                underline=style_data.get('style', {}).get('underline', False),
+                color=hex_to_rgb(style_data.get('style', {}).get('color', font_color)),
+                alpha=style_data.get('style', {}).get('alpha', font_alpha),
+                align=style_data.get('style', {}).get('align', 1),
+                vertical=style_data.get('style', {}).get('vertical', vertical),
+                letter_spacing=style_data.get('style', {}).get('letter_spacing', 0),
+                line_spacing=style_data.get('style', {}).get('line_spacing', 0)
+            ).intern()
+            
+            # Create border (if any)
+            border = None
+            if style_data.get('border', {}).get('width', 0) > 0:
+                border = Text_border(
+                    alpha=style_data.get('border', {}).get('alpha', border_alpha),
+                    color=hex_to_rgb(style_data.get('border', {}).get('color', border_color)),
+                    width=style_data.get('border', {}).get('width', border_width)
+                ).intern()
+            
+            # Create style range object
+            style_range = TextStyleRange(
+                start=start_pos,
+                end=end_pos,
+                style=style,
+                border=border,
+                font_str=style_data.get('font', font)
+            )
+            
+            text_styles.append(style_range)
+
+    return text_styles
@@ -1,7 +1,10 @@
+import numpy as np
 import pyJianYingDraft as draft
 from pyJianYingDraft import exceptions
+from pyJianYingDraft.keyframe import Columnar_keyframe_list
+from pyJianYingDraft.keyframe_curve import generate_keyframes, simplify_rdp
 from create_draft import get_or_create_draft
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 
 from util import generate_draft_url
 
@@ -116,17 +119,121 @@ def add_video_keyframe_impl(
         raise Exception(f"Failed to add keyframe: {str(e)}")
 
 
-def _add_single_keyframe(track, property_type: str, time: float, value: str):
+def add_video_keyframe_curve_impl(
+    draft_id: Optional[str] = None,
+    track_name: str = "main",
+    property_type: str = "alpha",
+    start: float = 0.0,
+    end: float = 1.0,
+    start_value: Optional[Union[str, float]] = None,
+    end_value: Optional[Union[str, float]] = None,
+    easing: str = "linear",
+    bezier: Optional[List[float]] = None,
+    samples: Optional[List[Union[str, float]]] = None,
+    sample_rate: float = 30.0,
+    tolerance: Optional[float] = None
+) -> Dict[str, str]:
     """
-    Internal function to add a single keyframe
+    Generate keyframes from a curve description and add them to the segments of the specified track
+    :param draft_id: Draft ID, if None or corresponding zip file not found, a new draft will be created
+    :param track_name: Track name, default "main"
+    :param property_type: Keyframe property type, same values as add_video_keyframe_impl
+    :param start: Curve start time on the track (seconds), default 0.0
+    :param end: Curve end time on the track (seconds), default 1.0
+    :param start_value: Value at the start time, same format as the value of add_video_keyframe_impl (e.g. "45deg", "50%")
+    :param end_value: Value at the end time, same format as start_value
+    :param easing: Easing function name, e.g. linear, ease_in_quad, ease_out_cubic, ease_in_out_sine, default "linear"
+    :param bezier: CSS style cubic bezier control points [x1, y1, x2, y2], overrides easing when provided
+    :param samples: Sampled values evenly spaced between start and end, overrides start_value/end_value/easing when provided
+    :param sample_rate: Number of keyframes generated per second before simplification, default 30
+    :param tolerance: If provided, redundant keyframes are dropped (Ramer-Douglas-Peucker) as long as
+        linear interpolation stays within this distance of the curve, in the parsed value unit (e.g. degrees, 0-1 for alpha)
+    Note: the curve is split at segment boundaries, each segment overlapping [start, end] receives the part of the
+    curve inside its target range with exact values at the cut points
+    :return: Updated draft information including the number of generated keyframes
+    """
+    # Get or create draft
+    draft_id, script = get_or_create_draft(
+        draft_id=draft_id
+    )
+
+    try:
+        property_enum = _get_keyframe_property(property_type)
+
+        if end <= start:
+            raise Exception(f"Curve end time {end} must be later than start time {start}")
+        start_us, end_us = int(round(start * draft.SEC)), int(round(end * draft.SEC))
+
+        if samples is not None:
+            samples = [_parse_keyframe_value(property_type, v) for v in samples]
+        if start_value is not None:
+            start_value = _parse_keyframe_value(property_type, start_value)
+        if end_value is not None:
+            end_value = _parse_keyframe_value(property_type, end_value)
+
+        # Sample the whole curve first, simplification is done per segment after splitting
+        times, values = generate_keyframes(start_us, end_us - start_us,
+                                           start_value=start_value, end_value=end_value,
+                                           easing=bezier if bezier is not None else easing,
+                                           samples=samples, sample_rate=sample_rate)
+        # Validate the whole curve up front so that no segment is left half updated
+        Columnar_keyframe_list(property_enum).validate(times, values)
+
+        # Get specified track
+        track = script.get_track(draft.Video_segment, track_name=track_name)
+        if not track.segments:
+            raise Exception(f"No segments in track {track_name}")
+
+        added_count = 0
+        segments_count = 0
+        for segment in track.segments:
+            clip_start = max(start_us, segment.target_timerange.start)
+            clip_end = min(end_us, segment.target_timerange.end)
+            if clip_start >= clip_end:
+                continue
+
+            inner = (times > clip_start) & (times < clip_end)
+            seg_times = np.concatenate(([clip_start], times[inner], [clip_end]))
+            seg_values = np.interp(seg_times, times, values)
+            if tolerance is not None:
+                seg_times, seg_values = simplify_rdp(seg_times, seg_values, tolerance)
+
+            segment.add_keyframes(property_enum, seg_times.astype(np.int64) - segment.target_timerange.start, seg_values)
+            added_count += len(seg_times)
+            segments_count += 1
+
+        if segments_count == 0:
+            raise Exception(f"No segment in track {track_name} overlaps the curve range [{start}s, {end}s]")
+
+        return {
+            "draft_id": draft_id,
+            "draft_url": generate_draft_url(draft_id),
+            "added_keyframes_count": added_count,
+            "segments_count": segments_count
+        }
+
+    except exceptions.TrackNotFound:
+        raise Exception(f"Track named {track_name} not found")
+    except Exception as e:
+        raise Exception(f"Failed to add keyframe curve: {str(e)}")
+
+
+def _get_keyframe_property(property_type: str) -> draft.Keyframe_property:
+    """
+    Convert property type string to enum value, validate if property type is valid
     """
-    # Convert property type string to enum value, validate if property type is valid
     try:
-        property_enum = getattr(draft.Keyframe_property, property_type)
+        return getattr(draft.Keyframe_property, property_type)
     except:
         raise Exception(f"Unsupported keyframe property type: {property_type}")
-        
-    # Parse value based on property type
+
+
+def _parse_keyframe_value(property_type: str, value: Union[str, float]) -> float:
+    """
+    Parse a keyframe value string (e.g. "45deg", "50%", "+0.5") into the float used by the draft
+    """
+    if isinstance(value, (int, float)):
+        value = str(value)
     try:
         if property_type in ['position_x', 'position_y']:
             # Handle position, range [0,1]
@@ -164,6 +271,16 @@ def _add_single_keyframe(track, property_type: str, time: float, value: str):
             float_value = float(value)
     except ValueError:
         raise Exception(f"Invalid value format: {value}")
-    
+    return float_value
+
+
+def _add_single_keyframe(track, property_type: str, time: float, value: str):
+    """
+    Internal function to add a single keyframe
+    """
+    # Validate property type and value before queueing the keyframe
+    _get_keyframe_property(property_type)
+    _parse_keyframe_value(property_type, value)
+
     # If track object is provided, use the track's add_pending_keyframe method
-    track.add_pending_keyframe(property_type, time, value)
\ No newline at end of file
+    track.add_pending_keyframe(property_type, time, value)
@@ -8,6 +8,9 @@ import re
 from typing import Optional, Dict
 from pyJianYingDraft import exceptions
 from create_draft import get_or_create_draft
+import logging
+
+logger = logging.getLogger('flask_video_generator')
 
 def add_video_track(
     video_url: str,
@@ -100,7 +103,81 @@ def add_video_track(
             script.add_track(draft.Track_type.video, track_name=track_name, relative_index=relative_index)
     else:
         script.add_track(draft.Track_type.video, relative_index=relative_index)
+
+    video_segment = build_video_segment(
+        script,
+        draft_id,
+        video_url,
+        draft_folder=draft_folder,
+        start=start,
+        end=end,
+        target_start=target_start,
+        transform_y=transform_y,
+        scale_x=scale_x,
+        scale_y=scale_y,
+        transform_x=transform_x,
+        speed=speed,
+        duration=duration,
+        transition=transition,
+        transition_duration=transition_duration,
+        mask_type=mask_type,
+        mask_center_x=mask_center_x,
+        mask_center_y=mask_center_y,
+        mask_size=mask_size,
+        mask_rotation=mask_rotation,
+        mask_feather=mask_feather,
+        mask_invert=mask_invert,
+        mask_rect_width=mask_rect_width,
+        mask_round_corner=mask_round_corner,
+        volume=volume,
+        background_blur=background_blur
+    )
+
+    # Add video segment to track
+    # if imported_track is not None:
+    #     imported_track.add_segment(video_segment)
+    # else:
+    script.add_segment(video_segment, track_name=track_name)
     
+    return {
+        "draft_id": draft_id,
+        "draft_url": generate_draft_url(draft_id)
+    }
+
+def build_video_segment(
+    script: draft.Script_file,
+    draft_id: str,
+    video_url: str,
+    draft_folder: Optional[str] = None,
+    start: float = 0,
+    end: Optional[float] = None,
+    target_start: float = 0,
+    transform_y: float = 0,
+    scale_x: float = 1,
+    scale_y: float = 1,
+    transform_x: float = 0,
+    speed: float = 1.0,
+    duration: Optional[float] = None,
+    transition: Optional[str] = None,
+    transition_duration: Optional[float] = 0.5,
+    mask_type: Optional[str] = None,
+    mask_center_x: float = 0.5,
+    mask_center_y: float = 0.5,
+    mask_size: float = 1.0,
+    mask_rotation: float = 0.0,
+    mask_feather: float = 0.0,
+    mask_invert: bool = False,
+    mask_rect_width: Optional[float] = None,
+    mask_round_corner: Optional[float] = None,
+    volume: float = 1.0,
+    background_blur: Optional[int] = None
+) -> draft.Video_segment:
+    """
+    Build a video segment without adding it to a track, parameters are the same as add_video_track
+    :param script: Draft the segment is built for, its canvas size is used by masks
+    :param draft_id: Draft ID, used to build the replacement path under draft_folder
+    :return: The video segment
+    """
     # If duration parameter is passed, use it preferentially; otherwise use default duration of 0 seconds, and get the real duration when downloading the draft
     if duration is not None:
         # Use the passed duration, skip duration retrieval and check
@@ -138,7 +215,7 @@ def add_video_track(
             draft_video_path = os.path.join(draft_folder, draft_id, "assets", "video", material_name)
         
         # Print path information
-        print('replace_path:', draft_video_path)
+        logger.info(f"replace_path: {draft_video_path}")
 
     # Set video end time
     video_end = end if end is not None else video_duration
@@ -227,14 +304,6 @@ def add_video_track(
         
         # Add background blur
         video_segment.add_background_filling("blur", blur=blur_values[background_blur])
-    
-    # Add video segment to track
-    # if imported_track is not None:
-    #     imported_track.add_segment(video_segment)
-    # else:
-    script.add_segment(video_segment, track_name=track_name)
-    
-    return {
-        "draft_id": draft_id,
-        "draft_url": generate_draft_url(draft_id)
-    }
+
+    return video_segment
+
@@ -0,0 +1,107 @@
+import copy
+from typing import Any, Dict, List, Literal, Optional
+
+from add_audio_track import add_audio_track
+from add_effect_impl import add_effect_impl
+from add_image_impl import add_image_impl
+from add_sticker_impl import add_sticker_impl
+from add_subtitle_impl import add_subtitle_impl
+from add_text_impl import add_text_impl, parse_text_styles
+from add_video_keyframe_impl import add_video_keyframe_impl, add_video_keyframe_curve_impl
+from add_video_track import add_video_track
+from create_draft import get_or_create_draft
+from draft_cache import get_draft_lock, update_cache
+from util import generate_draft_url
+
+# Operation name -> implementation, the names match the single-operation endpoints and MCP tools
+BATCH_OPERATIONS = {
+    "add_video": add_video_track,
+    "add_audio": add_audio_track,
+    "add_image": add_image_impl,
+    "add_text": add_text_impl,
+    "add_subtitle": add_subtitle_impl,
+    "add_effect": add_effect_impl,
+    "add_sticker": add_sticker_impl,
+    "add_video_keyframe": add_video_keyframe_impl,
+    "add_video_keyframe_curve": add_video_keyframe_curve_impl,
+}
+
+BATCH_MODES = ("atomic", "best_effort")
+
+
+def _prepare_params(op: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert JSON parameters that the implementation expects as objects"""
+    if op == "add_text" and params.get("text_styles"):
+        params["text_styles"] = parse_text_styles(
+            params["text_styles"],
+            font=params.get("font"),
+            font_size=params.get("font_size", 8.0),
+            font_color=params.get("font_color", "#ffffff"),
+            font_alpha=params.get("font_alpha", 1.0),
+            vertical=params.get("vertical", False),
+            border_alpha=params.get("border_alpha", 1.0),
+            border_color=params.get("border_color", "#000000"),
+            border_width=params.get("border_width", 0.0)
+        )
+    return params
+
+
+def batch_impl(
+    operations: List[Dict[str, Any]],
+    draft_id: Optional[str] = None,
+    mode: Literal["atomic", "best_effort"] = "atomic",
+    width: int = 1080,
+    height: int = 1920
+) -> Dict[str, Any]:
+    """
+    Apply an ordered list of operations to one draft in a single call
+    :param operations: List of {"op": operation name, "params": keyword arguments of that operation}, see BATCH_OPERATIONS
+    :param draft_id: Draft ID, if None or not found, a new draft will be created; draft_id inside params is ignored
+    :param mode: "atomic" rolls the draft back and stops at the first failing operation,
+                 "best_effort" records the failure and continues with the next operation
+    :param width: Video width of a newly created draft, default 1080
+    :param height: Video height of a newly created draft, default 1920
+    :return: Draft information, overall success flag and one result per executed operation
+    """
+    if mode not in BATCH_MODES:
+        raise ValueError(f"Unsupported batch mode: {mode}, supported modes: {', '.join(BATCH_MODES)}")
+    if not isinstance(operations, list):
+        raise ValueError("operations must be a list")
+
+    # Validate the whole batch before touching the draft
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict) or operation.get("op") not in BATCH_OPERATIONS:
+            op = operation.get("op") if isinstance(operation, dict) else operation
+            raise ValueError(f"Unsupported operation at index {index}: {op}, supported operations: {', '.join(BATCH_OPERATIONS)}")
+        if not isinstance(operation.get("params", {}), dict):
+            raise ValueError(f"params of operation at index {index} must be an object")
+
+    # Resolve the draft once, every operation then finds it in the cache
+    draft_id, script = get_or_create_draft(draft_id=draft_id, width=width, height=height)
+
+    results = []
+    rolled_back = False
+    with get_draft_lock(draft_id):
+        snapshot = copy.deepcopy(script) if mode == "atomic" else None
+
+        for index, operation in enumerate(operations):
+            op = operation["op"]
+            params = dict(operation.get("params") or {})
+            params["draft_id"] = draft_id
+            try:
+                output = BATCH_OPERATIONS[op](**_prepare_params(op, params))
+                results.append({"index": index, "op": op, "success": True, "output": output, "error": ""})
+            except Exception as e:
+                results.append({"index": index, "op": op, "success": False, "output": "", "error": str(e)})
+                if mode == "atomic":
+                    update_cache(draft_id, snapshot)
+                    rolled_back = True
+                    break
+
+    return {
+        "draft_id": draft_id,
+        "draft_url": generate_draft_url(draft_id),
+        "success": all(result["success"] for result in results),
+        "rolled_back": rolled_back,
+        "results": results
+    }
@@ -0,0 +1,75 @@
+"""Compare loading the metadata catalogs from source versus the compiled JSON catalog.
+
+Every catalog module is loaded in a fresh interpreter in three modes:
+
+* ``source-cold``: import the generated ``.py`` with an empty bytecode cache,
+  as on a serverless cold start without ``__pycache__``;
+* ``source-pyc``: import the generated ``.py`` with a warm bytecode cache;
+* ``catalog``: build the enums from ``metadata/data/*.json`` via ``catalog.load_module``.
+
+Run ``python -m pyJianYingDraft.metadata.build_catalog`` first if the catalog is missing.
+
+Usage:
+    python benchmarks/bench_catalog_load.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pyJianYingDraft.metadata.build_catalog import CATALOG_MODULES  # noqa: E402
+
+SNIPPETS = {
+    "source-cold": "import importlib; importlib.import_module('pyJianYingDraft.metadata.{module}')",
+    "source-pyc": "import importlib; importlib.import_module('pyJianYingDraft.metadata.{module}')",
+    "catalog": "from pyJianYingDraft.metadata.catalog import load_module; load_module('{module}')",
+}
+PREPARE = {
+    # drop the cached bytecode of every generated catalog module, keep the rest of the package warm
+    "source-cold": ("import glob, os, sys, importlib.util; sys.dont_write_bytecode = True; "
+                    "[os.remove(importlib.util.cache_from_source(path)) for path in "
+                    "glob.glob(os.path.join(os.path.dirname(pyJianYingDraft.metadata.__file__), '*_meta.py')) "
+                    "if os.path.basename(path) != 'effect_meta.py' and os.path.exists(importlib.util.cache_from_source(path))]"),
+    "source-pyc": "pass",
+    "catalog": "pass",
+}
+TIMER = ("import time, pyJianYingDraft.metadata; {prepare}; t = time.perf_counter(); {snippet}; "
+         "print((time.perf_counter() - t) * 1000)")
+
+
+def load_ms(module: str, mode: str, pycache: str) -> float:
+    """Load ``module`` in a fresh interpreter and return the elapsed milliseconds"""
+    snippet = SNIPPETS[mode].format(module=module)
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run([sys.executable, "-c", TIMER.format(prepare=PREPARE[mode], snippet=snippet)],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return float(proc.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module and mode")
+    args = parser.parse_args()
+
+    totals = {"source-cold": 0.0, "source-pyc": 0.0, "catalog": 0.0}
+    print(f"{'module':<28}{'source-cold':>14}{'source-pyc':>14}{'catalog':>14}")
+    with tempfile.TemporaryDirectory() as warm_cache:
+        for module in CATALOG_MODULES:
+            row = {}
+            for mode in totals:
+                load_ms(module, "source-pyc", warm_cache)  # (re)populate the bytecode cache
+                row[mode] = statistics.median(load_ms(module, mode, warm_cache) for _ in range(args.repeat))
+            for mode, value in row.items():
+                totals[mode] += value
+            print(f"{module:<28}" + "".join(f"{row[mode]:>11.1f} ms" for mode in totals))
+    print(f"{'total':<28}" + "".join(f"{totals[mode]:>11.1f} ms" for mode in totals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure duplicating a template draft the way ``save_draft`` does.
+
+A copy of ``template_jianying`` whose ``draft_info.json`` is padded to
+``--segments`` segments per track is duplicated ``--count`` times with:
+
+* ``duplicate_as_template``: copy the folder and open the copy, the parsed
+  template is reused while ``draft_info.json`` is unchanged;
+* ``duplicate``: copy the folder only, what ``save_draft`` needs since it
+  rewrites ``draft_info.json`` from the draft in memory.
+
+The first ``duplicate_as_template`` call (cold cache) is reported separately.
+
+Usage:
+    python benchmarks/bench_duplicate_template.py [--segments 2000] [--count 50]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft import trange  # noqa: E402
+
+SEGMENT_US = 1_000_000
+
+
+def write_template(folder: str, segments: int) -> None:
+    shutil.copytree(os.path.join(ROOT, "template_jianying"), os.path.join(folder, "template"))
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.video, "main").add_track(draft.Track_type.text, "captions")
+    material = draft.Video_material(material_type="video", remote_url="https://example.com/clip.mp4",
+                                    material_name="clip.mp4", duration=3600.0, width=1920, height=1080)
+    script.add_segments([draft.Video_segment(material, trange(i * SEGMENT_US, SEGMENT_US),
+                                             source_timerange=trange(0, SEGMENT_US))
+                         for i in range(segments)], "main")
+    script.add_segments([draft.Text_segment(f"caption number {i}", trange(i * SEGMENT_US, SEGMENT_US))
+                         for i in range(segments)], "captions")
+    script.dump(os.path.join(folder, "template", "draft_info.json"))
+
+
+def time_calls(func, count: int):
+    times = []
+    for i in range(count):
+        start = time.perf_counter()
+        func(f"draft_{i}")
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=2000, help="segments per track of the template")
+    parser.add_argument("--count", type=int, default=50, help="duplications per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        write_template(folder, args.segments)
+        size_kb = os.path.getsize(os.path.join(folder, "template", "draft_info.json")) / 1024
+        drafts = draft.Draft_folder(folder)
+        draft.util.clear_json_cache()
+
+        results = {}
+        for mode in ("duplicate_as_template", "duplicate"):
+            method = getattr(drafts, mode)
+            results[mode] = time_calls(lambda name: method("template", name, allow_replace=True), args.count)
+            for i in range(args.count):
+                drafts.remove(f"draft_{i}")
+
+    print(f"template: {args.segments} video + {args.segments} text segments, {size_kb:.0f} KB draft_info.json")
+    cold = results["duplicate_as_template"].pop(0)
+    print(f"{'duplicate_as_template (cold)':<30}{cold:>9.2f} ms")
+    print(f"{'duplicate_as_template (cached)':<30}{statistics.median(results['duplicate_as_template']):>9.2f} ms")
+    print(f"{'duplicate (copy only)':<30}{statistics.median(results['duplicate']):>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Measure importing a long subtitle file into a draft.
+
+Writes a subtitle file with ``--cues`` cues (SRT, or WebVTT with ``--vtt``)
+and times ``Script_file.import_srt`` on the file path, once with the default
+style and once with a style reference segment. Also reports the peak memory
+traced during each import.
+
+Usage:
+    python benchmarks/bench_import_srt.py [--cues 10000] [--repeat 3] [--vtt]
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft import trange  # noqa: E402
+
+
+def timestamp(us: int, separator: str) -> str:
+    ms = us // 1000
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}{separator}{ms % 1000:03d}"
+
+
+def write_subtitles(path: str, cues: int, vtt: bool) -> None:
+    separator = "." if vtt else ","
+    with open(path, "w", encoding="utf-8") as f:
+        if vtt:
+            f.write("WEBVTT\n\n")
+        for i in range(cues):
+            start, end = i * 2_000_000, i * 2_000_000 + 1_500_000
+            f.write(f"{i + 1}\n{timestamp(start, separator)} --> {timestamp(end, separator)}\n"
+                    f"Subtitle line number {i + 1}\nsecond line\n\n")
+
+
+def time_import(path: str, repeat: int, **kwargs):
+    times = []
+    for _ in range(repeat):
+        script = draft.Script_file(1080, 1920)
+        start = time.perf_counter()
+        script.import_srt(path, "subtitles", **kwargs)
+        times.append((time.perf_counter() - start) * 1000)
+        assert len(script.tracks["subtitles"].segments) > 0
+
+    gc.collect()
+    script = draft.Script_file(1080, 1920)
+    tracemalloc.start()
+    script.import_srt(path, "subtitles", **kwargs)
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return statistics.median(times), peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=10000, help="cues in the subtitle file")
+    parser.add_argument("--repeat", type=int, default=3, help="runs, the median is reported")
+    parser.add_argument("--vtt", action="store_true", help="write WebVTT instead of SRT")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "subtitles.vtt" if args.vtt else "subtitles.srt")
+        write_subtitles(path, args.cues, args.vtt)
+        reference = draft.Text_segment("reference", trange(0, 1_000_000),
+                                       style=draft.Text_style(size=6.0, color=(1.0, 0.87, 0.0)),
+                                       border=draft.Text_border(width=40.0))
+
+        print(f"{args.cues} cues, {os.path.getsize(path) / 1024:.0f} KB of {'WebVTT' if args.vtt else 'SRT'}")
+        print(f"{'style':<18}{'import':>12}{'peak memory':>14}")
+        for name, kwargs in (("default", {}), ("style_reference", {"style_reference": reference})):
+            elapsed_ms, peak_mb = time_import(path, args.repeat, **kwargs)
+            print(f"{name:<18}{elapsed_ms:>9.1f} ms{peak_mb:>11.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure cold import time with ``python -X importtime``.
+
+Each target module is imported in a fresh interpreter several times; the
+median cumulative import time is reported together with the slowest
+modules of the last run, and how much of it was spent in the metadata
+catalogs.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 5] [--top 10] [module ...]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGETS = ["pyJianYingDraft", "capcut_server", "mcp_server"]
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def import_times(module: str):
+    """Import ``module`` in a fresh interpreter and return ``{name: (self_us, cumulative_us)}``"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS, help="modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        import_times(module)  # warm-up run so that .pyc files exist
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total = statistics.median(run[module][1] for run in runs)
+        catalogs = statistics.median(sum(t[0] for name, t in run.items() if name.startswith("pyJianYingDraft.metadata"))
+                                     for run in runs)
+        print(f"{module}: {total / 1000:.1f} ms (median of {args.repeat}), metadata catalogs {catalogs / 1000:.1f} ms")
+        for name, (self_us, _) in sorted(runs[-1].items(), key=lambda item: -item[1][0])[:args.top]:
+            print(f"    {self_us / 1000:>7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare per-object and columnar keyframe storage.
+
+Adds one position keyframe per frame (30 fps) to a segment, once through
+``add_keyframe`` and once through the columnar ``add_keyframes``, and reports
+retained bytes per keyframe and the time spent building and exporting.
+
+Usage:
+    python benchmarks/bench_keyframes.py [--frames 18000]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft import Keyframe_property, trange, SEC  # noqa: E402
+
+FRAME = SEC // 30
+
+
+def _segment(frames: int):
+    return draft.Sticker_segment("7226264888031613496", trange(0, frames * FRAME))
+
+
+def build_per_object(frames: int):
+    seg = _segment(frames)
+    for i in range(frames):
+        seg.add_keyframe(Keyframe_property.position_x, i * FRAME, (i % 100) / 100)
+    return seg
+
+
+def build_columnar(frames: int):
+    seg = _segment(frames)
+    offsets = np.arange(frames, dtype=np.int64) * FRAME
+    seg.add_keyframes(Keyframe_property.position_x, offsets, (np.arange(frames) % 100) / 100)
+    return seg
+
+
+def run(name: str, builder, frames: int):
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    seg = builder(frames)
+    build_time = time.perf_counter() - start
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    size = len(json.dumps([kf_list.export_json() for kf_list in seg.common_keyframes]))
+    export_time = time.perf_counter() - start
+    print(f"{name:<10} {(after - before) / frames:>8.1f} bytes/keyframe  "
+          f"build {build_time * 1000:>8.1f} ms  export {export_time * 1000:>7.1f} ms  ({size} bytes JSON)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=18000, help="number of keyframes (default: 10 minutes at 30 fps)")
+    args = parser.parse_args()
+
+    run("per-object", build_per_object, args.frames)
+    run("columnar", build_columnar, args.frames)
+
+
+if __name__ == "__main__":
+    main()
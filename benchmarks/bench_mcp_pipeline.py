@@ -0,0 +1,186 @@
+"""Pipeline JSON-RPC requests to the MCP server and measure throughput.
+
+Starts ``mcp_server.py`` as a subprocess (the way an MCP client does) and sends
+a mix of ``--requests`` tool calls:
+
+* slow calls: ``add_subtitle`` with an SRT URL served by a local HTTP server
+  that answers after ``--latency`` seconds, standing in for tools that wait on
+  the network (downloads, ``save_draft``);
+* fast calls: ``create_draft`` and ``search_catalog``.
+
+The same calls are sent twice:
+
+* ``lock-step``: one request in flight at a time, what a client of a
+  sequential server gets;
+* ``pipelined``: every request written at once, replies matched by JSON-RPC id
+  as they arrive, in any order.
+
+For the pipelined run the script also cancels ``--cancel`` extra slow calls
+right after sending them and checks that none of them is answered.
+
+Usage:
+    python benchmarks/bench_mcp_pipeline.py [--requests 200] [--slow-ratio 0.25] [--latency 0.2] [--cancel 4]
+"""
+import argparse
+import http.server
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SRT = "1\n00:00:00,000 --> 00:00:02,000\nhello\n\n2\n00:00:02,000 --> 00:00:04,000\nworld\n"
+
+
+def start_srt_server(latency: float) -> http.server.ThreadingHTTPServer:
+    class SlowSrtHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = SRT.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowSrtHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class McpClient:
+    """Line-delimited JSON-RPC client, replies are collected by id on a reader thread"""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "mcp_server.py")], cwd=ROOT,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, bufsize=1)
+        self.replies = {}  # id -> (reply, arrival time)
+        self.arrival_order = []
+        self.condition = threading.Condition()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            reply = json.loads(line)
+            with self.condition:
+                self.replies[reply.get("id")] = (reply, time.perf_counter())
+                self.arrival_order.append(reply.get("id"))
+                self.condition.notify_all()
+
+    def send(self, message: dict) -> float:
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+        return time.perf_counter()
+
+    def wait(self, ids, timeout: float = 300) -> None:
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while not all(request_id in self.replies for request_id in ids):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    missing = [request_id for request_id in ids if request_id not in self.replies]
+                    raise TimeoutError(f"no reply for {len(missing)} requests, e.g. {missing[:5]}")
+                self.condition.wait(remaining)
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        self.process.wait(timeout=60)
+
+
+def tool_call(request_id: int, name: str, arguments: dict) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}}
+
+
+def workload(count: int, slow_ratio: float, srt_url: str, first_id: int):
+    slow_every = max(1, round(1 / slow_ratio)) if slow_ratio > 0 else 0
+    calls = []
+    for i in range(count):
+        request_id = first_id + i
+        if slow_every and i % slow_every == 0:
+            calls.append((True, tool_call(request_id, "add_subtitle", {"srt_path": srt_url, "font": "Anson"})))
+        elif i % 2:
+            calls.append((False, tool_call(request_id, "create_draft", {"width": 1080, "height": 1920})))
+        else:
+            calls.append((False, tool_call(request_id, "search_catalog", {"query": "fade", "limit": 5})))
+    return calls
+
+
+def run(client: McpClient, calls, pipelined: bool, cancel_calls=()):
+    sent_at = {}
+    start = time.perf_counter()
+    if pipelined:
+        for _, call in calls:
+            sent_at[call["id"]] = client.send(call)
+        for call in cancel_calls:
+            client.send(call)
+            client.send({"jsonrpc": "2.0", "method": "notifications/cancelled",
+                         "params": {"requestId": call["id"], "reason": "benchmark"}})
+        client.wait(list(sent_at))
+    else:
+        for _, call in calls:
+            sent_at[call["id"]] = client.send(call)
+            client.wait([call["id"]])
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for request_id in sent_at
+                 if "error" in client.replies[request_id][0]
+                 or not json.loads(client.replies[request_id][0]["result"]["content"][0]["text"])["success"])
+    fast_latency = [(client.replies[call["id"]][1] - sent_at[call["id"]]) * 1000
+                    for slow, call in calls if not slow]
+    order = [request_id for request_id in client.arrival_order if request_id in sent_at]
+    out_of_order = sum(1 for a, b in zip(order, order[1:]) if b < a)
+    return elapsed, failed, statistics.median(fast_latency) if fast_latency else 0.0, out_of_order
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="tool calls per run")
+    parser.add_argument("--slow-ratio", type=float, default=0.25, help="share of slow (network bound) calls")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds the SRT server waits before answering")
+    parser.add_argument("--cancel", type=int, default=4, help="slow calls cancelled right after sending them")
+    args = parser.parse_args()
+
+    srt_server = start_srt_server(args.latency)
+    srt_url = f"http://127.0.0.1:{srt_server.server_port}/subtitle.srt"
+
+    client = McpClient()
+    try:
+        client.send({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}})
+        client.wait([0], timeout=120)  # Covers the import time of the server
+        client.send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+        print(f"{args.requests} calls, {args.slow_ratio:.0%} waiting {args.latency * 1000:.0f} ms on the network")
+        print(f"{'mode':<12}{'time':>10}{'calls/s':>10}{'fast p50':>12}{'out of order':>14}{'failed':>8}")
+        next_id = 1
+        for mode in ("lock-step", "pipelined"):
+            calls = workload(args.requests, args.slow_ratio, srt_url, next_id)
+            next_id += args.requests
+            cancel_calls = []
+            if mode == "pipelined":
+                cancel_calls = [tool_call(next_id + i, "add_subtitle", {"srt_path": srt_url, "font": "Anson"}) for i in range(args.cancel)]
+                next_id += args.cancel
+            elapsed, failed, fast_p50, out_of_order = run(client, calls, mode == "pipelined", cancel_calls)
+            print(f"{mode:<12}{elapsed:>8.2f} s{args.requests / elapsed:>10.1f}{fast_p50:>9.1f} ms"
+                  f"{out_of_order:>14}{failed:>8}")
+
+        if cancel_calls:
+            time.sleep(args.latency * 2)  # Give late replies to cancelled calls a chance to show up
+            answered = [call["id"] for call in cancel_calls if call["id"] in client.replies]
+            print(f"cancelled calls answered: {len(answered)} of {len(cancel_calls)}")
+    finally:
+        client.close()
+        srt_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure the memory footprint of timeline segments.
+
+Builds a batch of video and audio segments (each with a couple of keyframes)
+that share one material, then reports the average number of bytes retained
+per segment as measured by ``tracemalloc``.
+
+Usage:
+    python benchmarks/bench_segment_memory.py [--count 20000]
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft import Keyframe_property, trange  # noqa: E402
+
+
+def _build_video_segments(count: int):
+    material = draft.Video_material(material_type="video", remote_url="https://example.com/video.mp4",
+                                    material_name="video.mp4", duration=3600.0, width=1920, height=1080)
+    segments = []
+    for i in range(count):
+        seg = draft.Video_segment(material, trange(i * 1_000_000, 1_000_000),
+                                  source_timerange=trange(0, 1_000_000),
+                                  clip_settings=draft.Clip_settings(transform_x=0.1))
+        seg.add_keyframe(Keyframe_property.alpha, 0, 0.0)
+        seg.add_keyframe(Keyframe_property.alpha, 500_000, 1.0)
+        segments.append(seg)
+    return segments
+
+
+def _build_audio_segments(count: int):
+    material = draft.Audio_material(remote_url="https://example.com/audio.mp3",
+                                    material_name="audio.mp3", duration=3600.0)
+    segments = []
+    for i in range(count):
+        seg = draft.Audio_segment(material, trange(i * 1_000_000, 1_000_000),
+                                  source_timerange=trange(0, 1_000_000))
+        seg.add_keyframe(0, 1.0)
+        seg.add_keyframe(500_000, 0.5)
+        segments.append(seg)
+    return segments
+
+
+def measure(builder, count: int) -> float:
+    """Return the average number of bytes retained per segment"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    segments = builder(count)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del segments
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="number of segments per kind")
+    args = parser.parse_args()
+
+    for name, builder in (("Video_segment", _build_video_segments), ("Audio_segment", _build_audio_segments)):
+        per_segment = measure(builder, args.count)
+        print(f"{name:<14} {args.count:>7} segments  {per_segment:>9.0f} bytes/segment")
+
+
+if __name__ == "__main__":
+    main()
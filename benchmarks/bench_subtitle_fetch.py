@@ -0,0 +1,104 @@
+"""Measure fetching the same remote subtitle file for many drafts.
+
+Serves an SRT file with ``--cues`` cues from a local HTTP server that answers
+after ``--latency`` milliseconds and supports ``ETag`` / ``If-None-Match``,
+then fetches it ``--drafts`` times, as when one subtitle URL is applied to
+many localized variants of a draft:
+
+* ``requests.get``: a new connection and a full download per draft, as
+  ``add_subtitle_impl`` used to do;
+* ``fetch_text, revalidate``: ``downloader.fetch_text`` with ``max_age=0``,
+  one conditional request per draft answered with 304 Not Modified;
+* ``fetch_text, cached``: ``downloader.fetch_text`` within
+  ``subtitle_cache_ttl``, the file is downloaded once.
+
+Reports the total time, the requests received by the server and the bytes it sent.
+
+Usage:
+    python benchmarks/bench_subtitle_fetch.py [--drafts 50] [--cues 2000] [--latency 50]
+"""
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import downloader  # noqa: E402
+
+
+def make_server(body: bytes, latency: float) -> ThreadingHTTPServer:
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.server.requests += 1
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-subrip")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self.server.bytes_sent += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = server.bytes_sent = 0
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drafts", type=int, default=50, help="drafts the subtitle URL is applied to")
+    parser.add_argument("--cues", type=int, default=2000, help="cues in the subtitle file")
+    parser.add_argument("--latency", type=float, default=50, help="server response delay in milliseconds")
+    args = parser.parse_args()
+
+    body = "".join(f"{i + 1}\n00:{i // 60 % 60:02d}:{i % 60:02d},000 --> 00:{i // 60 % 60:02d}:{i % 60:02d},900\n"
+                   f"Subtitle line number {i + 1}\n\n" for i in range(args.cues)).encode("utf-8")
+    server = make_server(body, args.latency / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/subtitles.srt"
+
+    def bare_get():
+        response = requests.get(url)
+        response.raise_for_status()
+        response.encoding = "utf-8"
+        return response.text
+
+    modes = [
+        ("requests.get", bare_get),
+        ("fetch_text, revalidate", lambda: downloader.fetch_text(url, max_age=0)),
+        ("fetch_text, cached", lambda: downloader.fetch_text(url)),
+    ]
+    print(f"{args.drafts} drafts, {len(body) / 1024:.0f} KB subtitle file, {args.latency:g} ms server latency")
+    print(f"{'mode':<24} {'time':>10} {'requests':>9} {'KB sent':>9}")
+    for name, fetch in modes:
+        downloader.clear_text_cache()
+        server.requests = server.bytes_sent = 0
+        start = time.perf_counter()
+        for _ in range(args.drafts):
+            assert fetch().startswith("1\n")
+        elapsed = time.perf_counter() - start
+        print(f"{name:<24} {elapsed * 1000:>7.0f} ms {server.requests:>9} {server.bytes_sent / 1024:>9.0f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
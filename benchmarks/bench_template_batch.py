@@ -0,0 +1,95 @@
+"""Render many variants of one template and measure throughput.
+
+A synthetic template draft with ``--segments`` video and text segments is
+rendered into ``--variants`` drafts, each replacing the first caption and one
+of the ``--clips`` video materials:
+
+* ``reload``: what a caller did before the batch API, ``load_template`` and a
+  deep copy of the draft for every variant, then ``dump``, in one process;
+* ``batch, 1 process``: ``render_template_batch_impl`` with ``workers=0``;
+* ``batch, N processes``: ``render_template_batch_impl`` with ``--workers``.
+
+Usage:
+    python benchmarks/bench_template_batch.py [--segments 1000] [--clips 20] [--variants 100] [--workers 4]
+"""
+import argparse
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft import trange  # noqa: E402
+from template_batch_impl import render_template_batch_impl  # noqa: E402
+
+SEGMENT_US = 1_000_000
+
+
+def write_template(folder: str, segments: int, clips: int) -> None:
+    shutil.copytree(os.path.join(ROOT, "template_jianying"), folder)
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.video, "main").add_track(draft.Track_type.text, "captions")
+    materials = [draft.Video_material(material_type="video", remote_url=f"https://example.com/clip_{i}.mp4",
+                                      material_name=f"clip_{i}.mp4", duration=3600.0, width=1920, height=1080)
+                 for i in range(clips)]
+    script.add_segments([draft.Video_segment(materials[i % clips], trange(i * SEGMENT_US, SEGMENT_US),
+                                             source_timerange=trange(0, SEGMENT_US))
+                         for i in range(segments)], "main")
+    script.add_segments([draft.Text_segment(f"caption number {i}", trange(i * SEGMENT_US, SEGMENT_US))
+                         for i in range(segments)], "captions")
+    script.dump(os.path.join(folder, "draft_info.json"))
+
+
+def render_by_reloading(template: str, variants, output_folder: str) -> None:
+    json_path = os.path.join(template, "draft_info.json")
+    for variant in variants:
+        script = copy.deepcopy(draft.Script_file.load_template(json_path))
+        script.replace_text(script.get_imported_track(draft.Track_type.text, name="captions"), 0,
+                            variant["text:captions:0"])
+        name = next(column for column in variant if column.startswith("video:")).partition(":")[2]
+        script.replace_material_by_name(name, draft.Video_material(
+            material_type="video", remote_url=variant[f"video:{name}"], material_name=f"new_{name}",
+            duration=3600.0, width=1920, height=1080))
+        draft_path = os.path.join(output_folder, variant["name"])
+        shutil.copytree(template, draft_path, ignore=shutil.ignore_patterns("draft_info.json"))
+        script.dump(os.path.join(draft_path, "draft_info.json"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=1000, help="segments per track of the template")
+    parser.add_argument("--clips", type=int, default=20, help="distinct video materials")
+    parser.add_argument("--variants", type=int, default=100, help="drafts rendered per mode")
+    parser.add_argument("--workers", type=int, default=4, help="processes of the parallel run")
+    args = parser.parse_args()
+
+    variants = [{"name": f"variant_{i}", "text:captions:0": f"Variant {i}",
+                 f"video:clip_{i % args.clips}.mp4": f"https://example.com/variant_{i}.mp4"}
+                for i in range(args.variants)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        template = os.path.join(folder, "template")
+        write_template(template, args.segments, args.clips)
+        print(f"template: {args.segments} video + {args.segments} text segments, "
+              f"{args.variants} variants")
+        print(f"{'mode':<24}{'time':>10}{'variants/s':>12}{'failed':>8}")
+
+        start = time.perf_counter()
+        render_by_reloading(template, variants, os.path.join(folder, "reload"))
+        elapsed = time.perf_counter() - start
+        print(f"{'reload':<24}{elapsed:>8.2f} s{args.variants / elapsed:>12.1f}{0:>8}")
+
+        for workers in (0, args.workers):
+            output = os.path.join(folder, f"batch_{workers}")
+            result = render_template_batch_impl(template, variants, output, workers=workers)
+            mode = "batch, 1 process" if workers == 0 else f"batch, {workers} processes"
+            print(f"{mode:<24}{result['seconds']:>8.2f} s{result['variants_per_second']:>12.1f}{result['failed']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Measure opening, editing and exporting a large draft in template mode.
+
+A synthetic template with ``--segments`` segments on each of a video and a
+text track (video segments cycle through ``--clips`` materials, every text
+segment has its own text material) is written to a temporary
+``draft_info.json``. The script then times:
+
+* ``load_template``: ``Script_file.load_template`` on that file;
+* ``replace``: ``replace_material_by_name`` on every video material;
+* ``dumps``: exporting the edited draft to a JSON string;
+
+and reports the memory retained by the loaded draft as measured by
+``tracemalloc``. The cache of parsed templates is cleared before every load,
+so ``load_template`` always includes parsing the file. With many distinct
+``--clips``, ``load_template`` and ``replace`` also show how material lookups
+scale.
+
+Usage:
+    python benchmarks/bench_template_load.py [--segments 10000] [--clips 20] [--repeat 3]
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+from pyJianYingDraft import trange  # noqa: E402
+
+SEGMENT_US = 1_000_000
+
+
+def write_template(path: str, segments: int, clips: int) -> None:
+    script = draft.Script_file(1080, 1920)
+    script.add_track(draft.Track_type.video, "main").add_track(draft.Track_type.text, "captions")
+    materials = [draft.Video_material(material_type="video", remote_url=f"https://example.com/clip_{i}.mp4",
+                                      material_name=f"clip_{i}.mp4", duration=3600.0, width=1920, height=1080)
+                 for i in range(clips)]
+    video_segments = [draft.Video_segment(materials[i % clips], trange(i * SEGMENT_US, SEGMENT_US),
+                                          source_timerange=trange(0, SEGMENT_US))
+                      for i in range(segments)]
+    text_segments = [draft.Text_segment(f"caption number {i}", trange(i * SEGMENT_US, SEGMENT_US),
+                                        style=draft.Text_style(size=6.0, color=(1.0, 0.87, 0.0)))
+                     for i in range(segments)]
+    script.add_segments(video_segments, "main")
+    script.add_segments(text_segments, "captions")
+    script.dump(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=10000, help="segments per track")
+    parser.add_argument("--clips", type=int, default=20, help="distinct video materials")
+    parser.add_argument("--repeat", type=int, default=3, help="runs, the median is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "draft_info.json")
+        write_template(path, args.segments, args.clips)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        replacements = [draft.Video_material(material_type="video", remote_url=f"https://example.com/new_clip_{i}.mp4",
+                                             material_name=f"new_clip_{i}.mp4", duration=3600.0, width=1280, height=720)
+                        for i in range(args.clips)]
+
+        load_ms, edit_ms, dumps_ms = [], [], []
+        for _ in range(args.repeat):
+            draft.util.clear_json_cache()
+            start = time.perf_counter()
+            script = draft.Script_file.load_template(path)
+            load_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            for material in replacements:
+                script.replace_material_by_name(material.material_name.replace("new_", ""), material)
+            edit_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            script.dumps()
+            dumps_ms.append((time.perf_counter() - start) * 1000)
+            del script
+
+        draft.util.clear_json_cache()
+        gc.collect()
+        tracemalloc.start()
+        script = draft.Script_file.load_template(path)
+        gc.collect()
+        retained_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        tracemalloc.stop()
+        del script
+
+    print(f"template: {args.segments} video + {args.segments} text segments, {size_mb:.1f} MB of JSON")
+    print(f"load_template {statistics.median(load_ms):>9.1f} ms")
+    print(f"replace       {statistics.median(edit_ms):>9.1f} ms  ({args.clips} materials)")
+    print(f"dumps         {statistics.median(dumps_ms):>9.1f} ms")
+    print(f"retained      {retained_mb:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
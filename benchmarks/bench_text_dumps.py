@@ -0,0 +1,67 @@
+"""Measure repeated exports of a large subtitle draft.
+
+Imports ``--cues`` subtitles with ``Script_file.import_srt`` and times
+``Script_file.dumps``: the first call, which exports and encodes every text
+material, further calls on the unchanged draft (what repeated
+``/query_script`` or save calls do), and a call after editing the text of
+``--edited`` percent of the segments.
+
+Usage:
+    python benchmarks/bench_text_dumps.py [--cues 10000] [--repeat 3] [--edited 1]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pyJianYingDraft as draft  # noqa: E402
+
+
+def timestamp(us: int) -> str:
+    ms = us // 1000
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+def build_script(cues: int) -> draft.Script_file:
+    srt = "".join(f"{i + 1}\n{timestamp(i * 2_000_000)} --> {timestamp(i * 2_000_000 + 1_500_000)}\n"
+                  f"Subtitle line number {i + 1}\nsecond line\n\n" for i in range(cues))
+    script = draft.Script_file(1080, 1920)
+    script.import_srt(srt, "subtitles", border=draft.Text_border(width=30.0))
+    return script
+
+
+def timed_dumps(script: draft.Script_file) -> float:
+    start = time.perf_counter()
+    script.dumps()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cues", type=int, default=10000, help="subtitle cues")
+    parser.add_argument("--repeat", type=int, default=3, help="runs, the median is reported")
+    parser.add_argument("--edited", type=float, default=1.0, help="percent of segments edited before the last dumps")
+    args = parser.parse_args()
+
+    first_ms, again_ms, edited_ms = [], [], []
+    for _ in range(args.repeat):
+        script = build_script(args.cues)
+        segments = script.tracks["subtitles"].segments
+        first_ms.append(timed_dumps(script))
+        again_ms.append(timed_dumps(script))
+        step = max(1, int(100 / args.edited)) if args.edited > 0 else len(segments) + 1
+        for segment in segments[::step]:
+            segment.text += " (edited)"
+        edited_ms.append(timed_dumps(script))
+
+    print(f"draft with {args.cues} subtitle segments")
+    print(f"first dumps   {statistics.median(first_ms):>9.1f} ms")
+    print(f"repeat dumps  {statistics.median(again_ms):>9.1f} ms")
+    print(f"after edits   {statistics.median(edited_ms):>9.1f} ms  ({args.edited:g}% of segments)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare building a timeline through /build_timeline versus one add_* call per segment.
+
+The same timeline (one video, one audio and one text track with ``--segments``
+back-to-back segments each) is built twice in a fresh draft:
+
+* ``add_*_impl``: ``add_video_track`` / ``add_audio_track`` / ``add_text_impl``
+  once per segment, as a client driving the single-operation endpoints would;
+* ``build_timeline``: one ``build_timeline_impl`` call, which inserts each
+  track's segments in a single pre-sorted pass and checks overlaps once.
+
+The print statements of the implementations are silenced so that only the
+draft work is timed.
+
+Usage:
+    python benchmarks/bench_timeline_ingest.py [--segments 200 1000 2000] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from add_audio_track import add_audio_track  # noqa: E402
+from add_text_impl import add_text_impl  # noqa: E402
+from add_video_track import add_video_track  # noqa: E402
+from draft_cache import DRAFT_CACHE  # noqa: E402
+from timeline_impl import build_timeline_impl  # noqa: E402
+
+SEGMENT_SECONDS = 2
+
+
+def timeline(segments: int):
+    return [
+        {"type": "video", "name": "main", "segments": [
+            {"video_url": f"https://example.com/clip_{i % 20}.mp4", "start": 0, "end": SEGMENT_SECONDS,
+             "target_start": i * SEGMENT_SECONDS, "duration": 10} for i in range(segments)]},
+        {"type": "audio", "name": "audio_main", "segments": [
+            {"audio_url": f"https://example.com/track_{i % 5}.mp3", "start": 0, "end": SEGMENT_SECONDS,
+             "target_start": i * SEGMENT_SECONDS, "duration": 10} for i in range(segments)]},
+        {"type": "text", "name": "text_main", "segments": [
+            {"text": f"caption {i}", "start": i * SEGMENT_SECONDS, "end": (i + 1) * SEGMENT_SECONDS,
+             "font_color": "#ffde00", "border_width": 2} for i in range(segments)]},
+    ]
+
+
+def build_sequential(tracks) -> str:
+    video, audio, text = tracks
+    draft_id = add_video_track(track_name=video["name"], **video["segments"][0])["draft_id"]
+    for params in video["segments"][1:]:
+        add_video_track(draft_id=draft_id, track_name=video["name"], **params)
+    for params in audio["segments"]:
+        add_audio_track(draft_id=draft_id, track_name=audio["name"], **params)
+    for params in text["segments"]:
+        add_text_impl(draft_id=draft_id, track_name=text["name"], **params)
+    return draft_id
+
+
+def build_bulk(tracks) -> str:
+    return build_timeline_impl(tracks)["draft_id"]
+
+
+def run_ms(builder, segments: int) -> float:
+    tracks = timeline(segments)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        draft_id = builder(tracks)
+        elapsed = (time.perf_counter() - start) * 1000
+    DRAFT_CACHE.pop(draft_id)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, nargs="+", default=[200, 1000, 2000], help="segments per track")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size and method")
+    args = parser.parse_args()
+
+    print(f"{'segments/track':<16}{'add_*_impl':>14}{'build_timeline':>16}{'speedup':>10}")
+    for segments in args.segments:
+        sequential = statistics.median(run_ms(build_sequential, segments) for _ in range(args.repeat))
+        bulk = statistics.median(run_ms(build_bulk, segments) for _ in range(args.repeat))
+        print(f"{segments:<16}{sequential:>11.1f} ms{bulk:>13.1f} ms{sequential / bulk:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
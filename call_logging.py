@@ -0,0 +1,102 @@
+"""Structured diagnostic logging with per-call context.
+
+The implementation modules log through the ``flask_video_generator`` logger
+instead of printing, so standard output stays free for protocol frames (the
+MCP server's JSON-RPC stream). The fields of the call being served (JSON-RPC
+request id, tool name, draft id) are kept in a context variable and attached
+to every record logged while the call runs, in whichever thread it runs::
+
+    with call_context(request_id=7, tool="add_text", draft_id="dfd_..."):
+        add_text_impl(...)  # every log record carries the three fields
+
+Context variables are not inherited by pool threads, so work submitted to an
+executor from within a call is wrapped with ``run_in_call_context``.
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator
+
+LOGGER_NAME = "flask_video_generator"
+
+# Fields of the call being served, empty outside of a call
+_call_fields: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("call_fields", default={})
+
+
+@contextlib.contextmanager
+def call_context(**fields) -> Iterator[None]:
+    """Attach fields to every record logged in this context until the block exits, nested blocks add to the outer fields"""
+    token = _call_fields.set({**_call_fields.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _call_fields.reset(token)
+
+
+def run_in_call_context(func: Callable, *args, **kwargs) -> Callable[[], Any]:
+    """Bind func to a copy of the current context, for ``executor.submit`` from within a call"""
+    context = contextvars.copy_context()
+    return lambda: context.run(func, *args, **kwargs)
+
+
+class CallContextFilter(logging.Filter):
+    """Copies the current call fields onto each record as ``record.call``"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.call = _call_fields.get()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, call fields and the traceback if any"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "call", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text with the call fields appended as key=value pairs"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        call = getattr(record, "call", {})
+        if call:
+            text += " [" + " ".join(f"{key}={value}" for key, value in call.items()) + "]"
+        return text
+
+
+def configure_logging(stream=None, level: int = logging.INFO, json_lines: bool = True) -> logging.Logger:
+    """Send the project logger to stream (default stderr), replacing any handler installed by a previous call
+
+    :param stream: Stream the records are written to, never the stream carrying protocol frames
+    :param level: Minimum level of the records written
+    :param json_lines: Write one JSON object per record, otherwise plain text
+    :return: The project logger
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in [h for h in logger.handlers if getattr(h, "_call_logging", False)]:
+        logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    handler._call_logging = True
+    handler.addFilter(CallContextFilter())
+    handler.setFormatter(JsonLinesFormatter() if json_lines else TextFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
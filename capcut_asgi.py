@@ -0,0 +1,260 @@
+"""ASGI entry point of the HTTP API.
+
+Serves the same routes as ``capcut_server.py`` from an async server::
+
+    uvicorn capcut_asgi:app --host 0.0.0.0 --port 9001
+
+or ``python capcut_asgi.py``. The routes whose work is long and blocking
+(``/save_draft`` downloads and zips every material, ``/query_script`` probes
+every material with ffprobe) are served natively and run on a dedicated thread
+pool sized by ``asgi_blocking_workers``, so they can neither block the event
+loop nor starve the pool used by short requests. ``/query_draft_status``
+accepts an optional ``wait`` (seconds) to long-poll for the next status change
+and ``/draft_status_stream`` pushes every progress update as server-sent
+events; neither holds a thread while waiting. Every other route is the Flask
+view from ``capcut_server.py``, mounted through ``a2wsgi.WSGIMiddleware``, which
+runs each WSGI call in a worker thread.
+"""
+import asyncio
+import contextlib
+import functools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from a2wsgi import WSGIMiddleware
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from call_logging import configure_logging
+from capcut_server import app as flask_app
+from save_draft_impl import save_draft_impl, query_task_status, query_script_impl
+from save_task_cache import TERMINAL_TASK_STATUSES, subscribe_task
+from settings.local import PORT, ASGI_BLOCKING_WORKERS
+
+MAX_STREAM_TIMEOUT = 3600.0  # Longest a /draft_status_stream connection may stay open, in seconds
+STREAM_KEEPALIVE = 15.0  # Seconds without progress after which a keepalive comment is sent
+MAX_STATUS_WAIT = 30.0  # Longest a /query_draft_status long-poll may wait, in seconds
+
+blocking_executor = ThreadPoolExecutor(max_workers=ASGI_BLOCKING_WORKERS, thread_name_prefix="capcut-blocking")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Also runs under `uvicorn capcut_asgi:app`, which never executes the __main__ block
+    configure_logging(json_lines=False)
+    yield
+    blocking_executor.shutdown(wait=False)
+
+
+app = FastAPI(title="CapCutAPI", lifespan=lifespan)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the blocking executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(func, *args, **kwargs))
+
+
+async def read_json(request: Request) -> dict:
+    """Request body as a dict, like ``request.get_json()`` in the Flask routes"""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    return data if isinstance(data, dict) else {}
+
+
+@app.post("/save_draft")
+async def save_draft(request: Request):
+    data = await read_json(request)
+
+    # Get required parameters
+    draft_id = data.get('draft_id')
+    draft_folder = data.get('draft_folder')  # Draft folder parameter
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    # Validate required parameters
+    if not draft_id:
+        error_message = "Hi, the required parameter 'draft_id' is missing. Please add it and try again."
+        result["error"] = error_message
+        return result
+
+    try:
+        # Downloads and zipping run on the blocking executor
+        draft_result = await run_blocking(save_draft_impl, draft_id, draft_folder)
+
+        result["success"] = True
+        result["output"] = draft_result
+        return result
+
+    except Exception as e:
+        error_message = f"Error occurred while saving draft: {str(e)}. "
+        result["error"] = error_message
+        return result
+
+
+@app.post("/query_script")
+async def query_script(request: Request):
+    data = await read_json(request)
+
+    # Get required parameters
+    draft_id = data.get('draft_id')
+    force_update = data.get('force_update', True)
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    # Validate required parameters
+    if not draft_id:
+        error_message = "Hi, the required parameter 'draft_id' is missing. Please add it and try again."
+        result["error"] = error_message
+        return result
+
+    try:
+        # Metadata refresh (ffprobe/downloads) and serialization run on the blocking executor
+        def query():
+            script = query_script_impl(draft_id=draft_id, force_update=force_update)
+            return None if script is None else script.dumps()
+
+        script_str = await run_blocking(query)
+
+        if script_str is None:
+            error_message = f"Draft {draft_id} does not exist in cache."
+            result["error"] = error_message
+            return result
+
+        result["success"] = True
+        result["output"] = script_str
+        return result
+
+    except Exception as e:
+        error_message = f"Error occurred while querying script: {str(e)}. "
+        result["error"] = error_message
+        return result
+
+
+@app.post("/query_draft_status")
+async def query_draft_status(request: Request):
+    data = await read_json(request)
+
+    # Get required parameters
+    task_id = data.get('task_id')
+    wait = data.get('wait', 0)  # Optional long-poll: seconds to wait for the status to change
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    # Validate required parameters
+    if not task_id:
+        error_message = "Hi, the required parameter 'task_id' is missing. Please add it and try again."
+        result["error"] = error_message
+        return result
+
+    try:
+        # Get task status, if asked to wait until the next published update without holding a thread
+        wait = min(max(float(wait or 0), 0.0), MAX_STATUS_WAIT)
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        unsubscribe = subscribe_task(task_id, lambda _: loop.call_soon_threadsafe(changed.set))
+        try:
+            # The status may be read from the durable task store, which blocks
+            task_status = await run_blocking(query_task_status, task_id)
+            if wait > 0 and task_status["status"] not in TERMINAL_TASK_STATUSES:
+                try:
+                    await asyncio.wait_for(changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                task_status = await run_blocking(query_task_status, task_id)
+        finally:
+            unsubscribe()
+
+        if task_status["status"] == "not_found":
+            error_message = f"Task with ID {task_id} not found. Please check if the task ID is correct."
+            result["error"] = error_message
+            return result
+
+        result["success"] = True
+        result["output"] = task_status
+        return result
+
+    except Exception as e:
+        error_message = f"Error occurred while querying task status: {str(e)}."
+        result["error"] = error_message
+        return result
+
+
+@app.get("/draft_status_stream")
+async def draft_status_stream(task_id: str = "", timeout: float = 600):
+    """Server-sent events with the progress of a save task, same protocol as the Flask route.
+    Waiting for the next update holds no thread: the publisher wakes the stream through the event loop."""
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    if not task_id:
+        result["error"] = "Hi, the required parameter 'task_id' is missing. Please add it and try again."
+        return result
+
+    # An unknown task never publishes anything, so fail at once instead of streaming keepalives until the timeout
+    if (await run_blocking(query_task_status, task_id))["status"] == "not_found":
+        result["error"] = f"Task with ID {task_id} not found. Please check if the task ID is correct."
+        return JSONResponse(status_code=404, content=result)
+
+    deadline = time.monotonic() + min(max(timeout, 0.0), MAX_STREAM_TIMEOUT)
+
+    def event(task_status: dict) -> str:
+        return f"event: status\ndata: {json.dumps(task_status, ensure_ascii=False)}\n\n"
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue = asyncio.Queue()
+        unsubscribe = subscribe_task(task_id, lambda task_status: loop.call_soon_threadsafe(updates.put_nowait, task_status))
+        try:
+            task_status = await run_blocking(query_task_status, task_id)
+            if task_status["status"] != "not_found":
+                yield event(task_status)
+                if task_status["status"] in TERMINAL_TASK_STATUSES:
+                    return
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    task_status = await asyncio.wait_for(updates.get(), min(STREAM_KEEPALIVE, remaining))
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                # Only the latest of several queued updates is worth sending
+                while not updates.empty():
+                    task_status = updates.get_nowait()
+                yield event(task_status)
+                if task_status["status"] in TERMINAL_TASK_STATUSES:
+                    return
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# Every other route is served by the Flask app
+app.mount("/", WSGIMiddleware(flask_app))
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=PORT)
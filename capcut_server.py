@@ -1,42 +1,91 @@
 import requests
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, stream_with_context
 from datetime import datetime
 import pyJianYingDraft as draft
-from pyJianYingDraft.metadata.animation_meta import Intro_type, Outro_type, Group_animation_type
-from pyJianYingDraft.metadata.capcut_animation_meta import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
-from pyJianYingDraft.metadata.transition_meta import Transition_type
-from pyJianYingDraft.metadata.capcut_transition_meta import CapCut_Transition_type
-from pyJianYingDraft.metadata.mask_meta import Mask_type
-from pyJianYingDraft.metadata.capcut_mask_meta import CapCut_Mask_type
-from pyJianYingDraft.metadata.audio_effect_meta import Tone_effect_type, Audio_scene_effect_type, Speech_to_song_type
-from pyJianYingDraft.metadata.capcut_audio_effect_meta import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
-from pyJianYingDraft.metadata.font_meta import Font_type
-from pyJianYingDraft.metadata.animation_meta import Text_intro, Text_outro, Text_loop_anim
-from pyJianYingDraft.metadata.capcut_text_animation_meta import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
-from pyJianYingDraft.metadata.video_effect_meta import Video_scene_effect_type, Video_character_effect_type
-from pyJianYingDraft.metadata.capcut_effect_meta import CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type
 import random
 import uuid
 import json
 import codecs
+import gzip
+import hashlib
+import functools
 from add_audio_track import add_audio_track
 from add_video_track import add_video_track
-from add_text_impl import add_text_impl
+from add_text_impl import add_text_impl, parse_text_styles
 from add_subtitle_impl import add_subtitle_impl
 from add_image_impl import add_image_impl
-from add_video_keyframe_impl import add_video_keyframe_impl
-from save_draft_impl import save_draft_impl, query_task_status, query_script_impl
+from add_video_keyframe_impl import add_video_keyframe_impl, add_video_keyframe_curve_impl
+from save_draft_impl import save_draft_impl, query_task_status, query_script_impl, stream_task_status
 from add_effect_impl import add_effect_impl
 from add_sticker_impl import add_sticker_impl
+from search_catalog_impl import search_catalog_impl
+from batch_impl import batch_impl
+from template_batch_impl import render_template_batch_impl, resolve_in_root
+from timeline_impl import build_timeline_impl
 from create_draft import create_draft
-from util import generate_draft_url as utilgenerate_draft_url, hex_to_rgb
-from pyJianYingDraft.text_segment import TextStyleRange, Text_style, Text_border
+from draft_cache import get_draft_lock
+from util import generate_draft_url as utilgenerate_draft_url
+from call_logging import configure_logging
 
-from settings.local import IS_CAPCUT_ENV, DRAFT_DOMAIN, PREVIEW_ROUTER, PORT
+from settings.local import IS_CAPCUT_ENV, DRAFT_DOMAIN, PREVIEW_ROUTER, PORT, TEMPLATE_BATCH_ROOT
 
 app = Flask(__name__)
+
+CATALOG_CACHE_MAX_AGE = 86400  # Seconds clients may reuse a /get_*_types response before revalidating it
+
+_catalog_responses = {}  # View name -> (json body, gzip body, etag)
+
+def cached_catalog_response(view):
+    """Serve a static catalog endpoint from pre-encoded bytes
+
+    The catalogs only depend on IS_CAPCUT_ENV, so the first successful response of the view
+    is encoded once (plain and gzip-compressed) and reused. Responses carry an ETag and long
+    cache headers, and If-None-Match requests are answered with 304 Not Modified.
+    """
+    @functools.wraps(view)
+    def wrapper():
+        cached = _catalog_responses.get(view.__name__)
+        if cached is None:
+            response = view()
+            if not response.get_json().get("success"):
+                return response  # Do not cache errors
+            body = response.get_data()
+            cached = (body, gzip.compress(body, 9), hashlib.sha1(body).hexdigest())
+            _catalog_responses[view.__name__] = cached
+
+        body, gzip_body, etag = cached
+        if request.accept_encodings["gzip"]:
+            response = Response(gzip_body, mimetype="application/json")
+            response.headers["Content-Encoding"] = "gzip"
+            response.set_etag(etag + "-gzip")
+        else:
+            response = Response(body, mimetype="application/json")
+            response.set_etag(etag)
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.max_age = CATALOG_CACHE_MAX_AGE
+        return response.make_conditional(request)
+    return wrapper
+
+def draft_locked(view):
+    """Run an editing endpoint while holding the lock of the draft named by its draft_id
+
+    Serializes single edits with /batch and /build_timeline on the same draft, so a rollback
+    of those calls cannot drop an edit made concurrently. Requests without a draft_id create a
+    new draft that nobody else can reach yet and are not locked.
+    """
+    @functools.wraps(view)
+    def wrapper():
+        data = request.get_json(silent=True)
+        draft_id = data.get('draft_id') if isinstance(data, dict) else None
+        if not isinstance(draft_id, str) or not draft_id:
+            return view()
+        with get_draft_lock(draft_id):
+            return view()
+    return wrapper
  
 @app.route('/add_video', methods=['POST'])
+@draft_locked
 def add_video():
     data = request.get_json()
     # Get required parameters
@@ -129,6 +178,7 @@ def add_video():
         return jsonify(result)
 
 @app.route('/add_audio', methods=['POST'])
+@draft_locked
 def add_audio():
     data = request.get_json()
     
@@ -224,6 +274,7 @@ def create_draft_service():
         return jsonify(result)
         
 @app.route('/add_subtitle', methods=['POST'])
+@draft_locked
 def add_subtitle():
     data = request.get_json()
     
@@ -315,6 +366,7 @@ def add_subtitle():
         return jsonify(result)
 
 @app.route('/add_text', methods=['POST'])
+@draft_locked
 def add_text():
     data = request.get_json()
     
@@ -377,48 +429,17 @@ def add_text():
     outro_duration = data.get('outro_duration', 0.5)
 
     # Multi-style text parameters
-    text_styles_data = data.get('text_styles', [])
-    text_styles = None
-    if text_styles_data:
-        text_styles = []
-        for style_data in text_styles_data:
-            # Get style range
-            start_pos = style_data.get('start', 0)
-            end_pos = style_data.get('end', 0)
-            
-            # Create text style
-            style = Text_style(
-                size=style_data.get('style',{}).get('size', font_size),
-                bold=style_data.get('style',{}).get('bold', False),
-                italic=style_data.get('style',{}).get('italic', False),
-                underline=style_data.get('style',{}).get('underline', False),
-                color=hex_to_rgb(style_data.get('style',{}).get('color', font_color)),
-                alpha=style_data.get('style',{}).get('alpha', font_alpha),
-                align=style_data.get('style',{}).get('align', 1),
-                vertical=style_data.get('style',{}).get('vertical', vertical),
-                letter_spacing=style_data.get('style',{}).get('letter_spacing', 0),
-                line_spacing=style_data.get('style',{}).get('line_spacing', 0)
-            )
-            
-            # Create border (if any)
-            border = None
-            if style_data.get('border',{}).get('width', 0) > 0:
-                border = Text_border(
-                    alpha=style_data.get('border',{}).get('alpha', border_alpha),
-                    color=hex_to_rgb(style_data.get('border',{}).get('color', border_color)),
-                    width=style_data.get('border',{}).get('width', border_width)
-                )
-            
-            # Create style range object
-            style_range = TextStyleRange(
-                start=start_pos,
-                end=end_pos,
-                style=style,
-                border=border,
-                font_str=style_data.get('font', font)
-            )
-            
-            text_styles.append(style_range)
+    text_styles = parse_text_styles(
+        data.get('text_styles', []),
+        font=font,
+        font_size=font_size,
+        font_color=font_color,
+        font_alpha=font_alpha,
+        vertical=vertical,
+        border_alpha=border_alpha,
+        border_color=border_color,
+        border_width=border_width
+    )
 
     result = {
         "success": False,
@@ -489,6 +510,7 @@ def add_text():
         return jsonify(result)
 
 @app.route('/add_image', methods=['POST'])
+@draft_locked
 def add_image():
     data = request.get_json()
     
@@ -590,6 +612,7 @@ def add_image():
         return jsonify(result)
 
 @app.route('/add_video_keyframe', methods=['POST'])
+@draft_locked
 def add_video_keyframe():
     data = request.get_json()
     
@@ -635,7 +658,60 @@ def add_video_keyframe():
         result["error"] = error_message
         return jsonify(result)
 
+@app.route('/add_video_keyframe_curve', methods=['POST'])
+@draft_locked
+def add_video_keyframe_curve():
+    data = request.get_json()
+
+    # Get required parameters
+    draft_id = data.get('draft_id')
+    track_name = data.get('track_name', 'video_main')  # Default main track
+    property_type = data.get('property_type', 'alpha')  # Default opacity
+    start = data.get('start', 0.0)  # Curve start time (seconds)
+    end = data.get('end', 1.0)  # Curve end time (seconds)
+
+    # Curve description: easing/bezier between start_value and end_value, or sampled values
+    start_value = data.get('start_value')
+    end_value = data.get('end_value')
+    easing = data.get('easing', 'linear')  # Easing function name
+    bezier = data.get('bezier')  # Cubic bezier control points [x1, y1, x2, y2]
+    samples = data.get('samples')  # Values evenly spaced between start and end
+    sample_rate = data.get('sample_rate', 30.0)  # Keyframes per second before simplification
+    tolerance = data.get('tolerance')  # Maximum deviation allowed when dropping redundant keyframes
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    try:
+        draft_result = add_video_keyframe_curve_impl(
+            draft_id=draft_id,
+            track_name=track_name,
+            property_type=property_type,
+            start=start,
+            end=end,
+            start_value=start_value,
+            end_value=end_value,
+            easing=easing,
+            bezier=bezier,
+            samples=samples,
+            sample_rate=sample_rate,
+            tolerance=tolerance
+        )
+
+        result["success"] = True
+        result["output"] = draft_result
+        return jsonify(result)
+
+    except Exception as e:
+        error_message = f"Error occurred while adding keyframe curve: {str(e)}."
+        result["error"] = error_message
+        return jsonify(result)
+
 @app.route('/add_effect', methods=['POST'])
+@draft_locked
 def add_effect():
     data = request.get_json()
     
@@ -797,6 +873,50 @@ def query_draft_status():
         result["error"] = error_message
         return jsonify(result)
 
+@app.route('/draft_status_stream', methods=['GET'])
+def draft_status_stream():
+    """Push the progress of a save task as server-sent events instead of polling /query_draft_status
+
+    Every published progress update is sent as a "status" event whose data is the same JSON object as the
+    output of /query_draft_status; the stream ends after the completed or failed status.
+    """
+    task_id = request.args.get('task_id')
+    timeout = request.args.get('timeout', 600)
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    if not task_id:
+        result["error"] = "Hi, the required parameter 'task_id' is missing. Please add it and try again."
+        return jsonify(result)
+
+    try:
+        timeout = float(timeout)
+    except ValueError:
+        timeout = None
+    if timeout is None or not timeout > 0:
+        result["error"] = "Hi, the parameter 'timeout' must be a positive number of seconds."
+        return jsonify(result)
+    timeout = min(timeout, 3600)
+
+    # An unknown task never publishes anything, so fail at once instead of streaming keepalives until the timeout
+    if query_task_status(task_id)["status"] == "not_found":
+        result["error"] = f"Task with ID {task_id} not found. Please check if the task ID is correct."
+        return jsonify(result), 404
+
+    def events():
+        for task_status in stream_task_status(task_id, timeout=timeout):
+            if task_status is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: status\ndata: {json.dumps(task_status, ensure_ascii=False)}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.route('/generate_draft_url', methods=['POST'])
 def generate_draft_url():
     data = request.get_json()
@@ -830,6 +950,7 @@ def generate_draft_url():
         return jsonify(result)
 
 @app.route('/add_sticker', methods=['POST'])
+@draft_locked
 def add_sticker():
     data = request.get_json()
     # Get required parameters
@@ -892,7 +1013,154 @@ def add_sticker():
         result["error"] = error_message
         return jsonify(result)
 
+@app.route('/batch', methods=['POST'])
+def batch():
+    data = request.get_json()
+
+    # Get required parameters
+    operations = data.get('operations')
+    draft_id = data.get('draft_id')
+    mode = data.get('mode', 'atomic')  # "atomic" (all-or-nothing) or "best_effort"
+    width = data.get('width', 1080)
+    height = data.get('height', 1920)
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    # Validate required parameters
+    if not operations:
+        error_message = "Hi, the required parameter 'operations' is missing."
+        result["error"] = error_message
+        return jsonify(result)
+
+    try:
+        # Call batch_impl method
+        batch_result = batch_impl(
+            operations=operations,
+            draft_id=draft_id,
+            mode=mode,
+            width=width,
+            height=height
+        )
+
+        result["success"] = batch_result["success"]
+        result["output"] = batch_result
+        if not batch_result["success"]:
+            failed = [r for r in batch_result["results"] if not r["success"]]
+            result["error"] = f"{len(failed)} operation(s) failed, first failure at index {failed[0]['index']} ({failed[0]['op']}): {failed[0]['error']}"
+        return jsonify(result)
+
+    except Exception as e:
+        error_message = f"Error occurred while processing batch: {str(e)}"
+        result["error"] = error_message
+        return jsonify(result)
+
+@app.route('/render_template_batch', methods=['POST'])
+def render_template_batch():
+    data = request.get_json()
+
+    # Get required parameters
+    template_path = data.get('template_path')
+    variants = data.get('variants')  # List of variants, or path of a .csv/.jsonl substitution table
+    output_folder = data.get('output_folder')
+    workers = data.get('workers')
+    chunk_size = data.get('chunk_size', 16)
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    # Validate required parameters
+    if not template_path or not variants or not output_folder:
+        error_message = "Hi, the required parameters 'template_path', 'variants' and 'output_folder' are missing."
+        result["error"] = error_message
+        return jsonify(result)
+
+    if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 1:
+        result["error"] = "Hi, the parameter 'chunk_size' must be a positive integer."
+        return jsonify(result)
+
+    # Paths come from the client: they are resolved against template_batch_root and may not leave it
+    try:
+        template_path = resolve_in_root(template_path, TEMPLATE_BATCH_ROOT)
+        output_folder = resolve_in_root(output_folder, TEMPLATE_BATCH_ROOT)
+        if isinstance(variants, str):
+            variants = resolve_in_root(variants, TEMPLATE_BATCH_ROOT)
+    except (ValueError, TypeError) as e:
+        result["error"] = f"Hi, {str(e)}. Paths must lie inside the template_batch_root directory."
+        return jsonify(result)
+
+    try:
+        # Call render_template_batch_impl method
+        render_result = render_template_batch_impl(
+            template_path=template_path,
+            variants=variants,
+            output_folder=output_folder,
+            workers=workers,
+            chunk_size=chunk_size
+        )
+
+        result["success"] = render_result["success"]
+        result["output"] = render_result
+        if not render_result["success"]:
+            failed = [r for r in render_result["results"] if not r["success"]]
+            result["error"] = f"{len(failed)} variant(s) failed, first failure {failed[0]['name']}: {failed[0]['error']}"
+        return jsonify(result)
+
+    except Exception as e:
+        error_message = f"Error occurred while rendering template batch: {str(e)}"
+        result["error"] = error_message
+        return jsonify(result)
+
+@app.route('/build_timeline', methods=['POST'])
+def build_timeline():
+    data = request.get_json()
+
+    # Get required parameters
+    tracks = data.get('tracks')
+    draft_id = data.get('draft_id')
+    draft_folder = data.get('draft_folder')
+    width = data.get('width', 1080)
+    height = data.get('height', 1920)
+
+    result = {
+        "success": False,
+        "output": "",
+        "error": ""
+    }
+
+    # Validate required parameters
+    if not tracks:
+        error_message = "Hi, the required parameter 'tracks' is missing."
+        result["error"] = error_message
+        return jsonify(result)
+
+    try:
+        # Call build_timeline_impl method
+        timeline_result = build_timeline_impl(
+            tracks=tracks,
+            draft_id=draft_id,
+            draft_folder=draft_folder,
+            width=width,
+            height=height
+        )
+
+        result["success"] = True
+        result["output"] = timeline_result
+        return jsonify(result)
+
+    except Exception as e:
+        error_message = f"Error occurred while building timeline: {str(e)}"
+        result["error"] = error_message
+        return jsonify(result)
+
 @app.route('/get_intro_animation_types', methods=['GET'])
+@cached_catalog_response
 def get_intro_animation_types():
     """Return supported entrance animation type list
     
@@ -910,13 +1178,13 @@ def get_intro_animation_types():
         
         if IS_CAPCUT_ENV:
             # Return entrance animation types in CapCut environment
-            for name, member in CapCut_Intro_type.__members__.items():
+            for name, member in draft.CapCut_Intro_type.__members__.items():
                 animation_types.append({
                     "name": name
                 })
         else:
             # Return entrance animation types in JianYing environment
-            for name, member in Intro_type.__members__.items():
+            for name, member in draft.Intro_type.__members__.items():
                 animation_types.append({
                     "name": name
                 })
@@ -930,6 +1198,7 @@ def get_intro_animation_types():
         return jsonify(result)
         
 @app.route('/get_outro_animation_types', methods=['GET'])
+@cached_catalog_response
 def get_outro_animation_types():
     """Return supported exit animation type list
     
@@ -947,13 +1216,13 @@ def get_outro_animation_types():
         
         if IS_CAPCUT_ENV:
             # Return exit animation types in CapCut environment
-            for name, member in CapCut_Outro_type.__members__.items():
+            for name, member in draft.CapCut_Outro_type.__members__.items():
                 animation_types.append({
                     "name": name
                 })
         else:
             # Return exit animation types in JianYing environment
-            for name, member in Outro_type.__members__.items():
+            for name, member in draft.Outro_type.__members__.items():
                 animation_types.append({
                     "name": name
                 })
@@ -968,6 +1237,7 @@ def get_outro_animation_types():
 
 
 @app.route('/get_combo_animation_types', methods=['GET'])
+@cached_catalog_response
 def get_combo_animation_types():
     """Return supported combo animation type list
     
@@ -985,13 +1255,13 @@ def get_combo_animation_types():
         
         if IS_CAPCUT_ENV:
             # Return combo animation types in CapCut environment
-            for name, member in CapCut_Group_animation_type.__members__.items():
+            for name, member in draft.CapCut_Group_animation_type.__members__.items():
                 animation_types.append({
                     "name": name
                 })
         else:
             # Return combo animation types in JianYing environment
-            for name, member in Group_animation_type.__members__.items():
+            for name, member in draft.Group_animation_type.__members__.items():
                 animation_types.append({
                     "name": name
                 })
@@ -1006,6 +1276,7 @@ def get_combo_animation_types():
 
 
 @app.route('/get_transition_types', methods=['GET'])
+@cached_catalog_response
 def get_transition_types():
     """Return supported transition animation type list
     
@@ -1023,13 +1294,13 @@ def get_transition_types():
         
         if IS_CAPCUT_ENV:
             # Return transition animation types in CapCut environment
-            for name, member in CapCut_Transition_type.__members__.items():
+            for name, member in draft.CapCut_Transition_type.__members__.items():
                 transition_types.append({
                     "name": name
                 })
         else:
             # Return transition animation types in JianYing environment
-            for name, member in Transition_type.__members__.items():
+            for name, member in draft.Transition_type.__members__.items():
                 transition_types.append({
                     "name": name
                 })
@@ -1044,6 +1315,7 @@ def get_transition_types():
 
 
 @app.route('/get_mask_types', methods=['GET'])
+@cached_catalog_response
 def get_mask_types():
     """Return supported mask type list
     
@@ -1061,13 +1333,13 @@ def get_mask_types():
         
         if IS_CAPCUT_ENV:
             # Return mask types in CapCut environment
-            for name, member in CapCut_Mask_type.__members__.items():
+            for name, member in draft.CapCut_Mask_type.__members__.items():
                 mask_types.append({
                     "name": name
                 })
         else:
             # Return mask types in JianYing environment
-            for name, member in Mask_type.__members__.items():
+            for name, member in draft.Mask_type.__members__.items():
                 mask_types.append({
                     "name": name
                 })
@@ -1082,6 +1354,7 @@ def get_mask_types():
 
 
 @app.route('/get_audio_effect_types', methods=['GET'])
+@cached_catalog_response
 def get_audio_effect_types():
     """Return supported audio effect type list
     
@@ -1102,7 +1375,7 @@ def get_audio_effect_types():
         if IS_CAPCUT_ENV:
             # Return audio effect types in CapCut environment
             # 1. Voice filters effect types
-            for name, member in CapCut_Voice_filters_effect_type.__members__.items():
+            for name, member in draft.CapCut_Voice_filters_effect_type.__members__.items():
                 params_info = []
                 for param in member.value.params:
                     params_info.append({
@@ -1119,7 +1392,7 @@ def get_audio_effect_types():
                 })
             
             # 2. Voice characters effect types
-            for name, member in CapCut_Voice_characters_effect_type.__members__.items():
+            for name, member in draft.CapCut_Voice_characters_effect_type.__members__.items():
                 params_info = []
                 for param in member.value.params:
                     params_info.append({
@@ -1136,7 +1409,7 @@ def get_audio_effect_types():
                 })
             
             # 3. Speech to song effect types
-            for name, member in CapCut_Speech_to_song_effect_type.__members__.items():
+            for name, member in draft.CapCut_Speech_to_song_effect_type.__members__.items():
                 params_info = []
                 for param in member.value.params:
                     params_info.append({
@@ -1154,7 +1427,7 @@ def get_audio_effect_types():
         else:
             # Return audio effect types in JianYing environment
             # 1. Tone effect types
-            for name, member in Tone_effect_type.__members__.items():
+            for name, member in draft.Tone_effect_type.__members__.items():
                 params_info = []
                 for param in member.value.params:
                     params_info.append({
@@ -1171,7 +1444,7 @@ def get_audio_effect_types():
                 })
             
             # 2. Audio scene effect types
-            for name, member in Audio_scene_effect_type.__members__.items():
+            for name, member in draft.Audio_scene_effect_type.__members__.items():
                 params_info = []
                 for param in member.value.params:
                     params_info.append({
@@ -1188,7 +1461,7 @@ def get_audio_effect_types():
                 })
             
             # 3. Speech to song effect types
-            for name, member in Speech_to_song_type.__members__.items():
+            for name, member in draft.Speech_to_song_type.__members__.items():
                 params_info = []
                 for param in member.value.params:
                     params_info.append({
@@ -1214,6 +1487,7 @@ def get_audio_effect_types():
 
 
 @app.route('/get_font_types', methods=['GET'])
+@cached_catalog_response
 def get_font_types():
     """Return supported font type list
     
@@ -1229,7 +1503,7 @@ def get_font_types():
         font_types = []
         
         # Return font types in JianYing environment
-        for name, member in Font_type.__members__.items():
+        for name, member in draft.Font_type.__members__.items():
             font_types.append({
                 "name": name
             })
@@ -1244,6 +1518,7 @@ def get_font_types():
 
 
 @app.route('/get_text_intro_types', methods=['GET'])
+@cached_catalog_response
 def get_text_intro_types():
     """Return supported text entrance animation type list
     
@@ -1261,13 +1536,13 @@ def get_text_intro_types():
         
         if IS_CAPCUT_ENV:
             # Return text entrance animation types in CapCut environment
-            for name, member in CapCut_Text_intro.__members__.items():
+            for name, member in draft.CapCut_Text_intro.__members__.items():
                 text_intro_types.append({
                     "name": name
                 })
         else:
             # Return text entrance animation types in JianYing environment
-            for name, member in Text_intro.__members__.items():
+            for name, member in draft.Text_intro.__members__.items():
                 text_intro_types.append({
                     "name": name
                 })
@@ -1281,6 +1556,7 @@ def get_text_intro_types():
         return jsonify(result)
 
 @app.route('/get_text_outro_types', methods=['GET'])
+@cached_catalog_response
 def get_text_outro_types():
     """Return supported text exit animation type list
     
@@ -1298,13 +1574,13 @@ def get_text_outro_types():
         
         if IS_CAPCUT_ENV:
             # Return text exit animation types in CapCut environment
-            for name, member in CapCut_Text_outro.__members__.items():
+            for name, member in draft.CapCut_Text_outro.__members__.items():
                 text_outro_types.append({
                     "name": name
                 })
         else:
             # Return text exit animation types in JianYing environment
-            for name, member in Text_outro.__members__.items():
+            for name, member in draft.Text_outro.__members__.items():
                 text_outro_types.append({
                     "name": name
                 })
@@ -1318,6 +1594,7 @@ def get_text_outro_types():
         return jsonify(result)
 
 @app.route('/get_text_loop_anim_types', methods=['GET'])
+@cached_catalog_response
 def get_text_loop_anim_types():
     """Return supported text loop animation type list
     
@@ -1335,13 +1612,13 @@ def get_text_loop_anim_types():
         
         if IS_CAPCUT_ENV:
             # Return text loop animation types in CapCut environment
-            for name, member in CapCut_Text_loop_anim.__members__.items():
+            for name, member in draft.CapCut_Text_loop_anim.__members__.items():
                 text_loop_anim_types.append({
                     "name": name
                 })
         else:
             # Return text loop animation types in JianYing environment
-            for name, member in Text_loop_anim.__members__.items():
+            for name, member in draft.Text_loop_anim.__members__.items():
                 text_loop_anim_types.append({
                     "name": name
                 })
@@ -1356,6 +1633,7 @@ def get_text_loop_anim_types():
 
 
 @app.route('/get_video_scene_effect_types', methods=['GET'])
+@cached_catalog_response
 def get_video_scene_effect_types():
     """Return supported scene effect type list
     
@@ -1373,13 +1651,13 @@ def get_video_scene_effect_types():
         
         if IS_CAPCUT_ENV:
             # Return scene effect types in CapCut environment
-            for name, member in CapCut_Video_scene_effect_type.__members__.items():
+            for name, member in draft.CapCut_Video_scene_effect_type.__members__.items():
                 effect_types.append({
                     "name": name
                 })
         else:
             # Return scene effect types in JianYing environment
-            for name, member in Video_scene_effect_type.__members__.items():
+            for name, member in draft.Video_scene_effect_type.__members__.items():
                 effect_types.append({
                     "name": name
                 })
@@ -1394,6 +1672,7 @@ def get_video_scene_effect_types():
 
 
 @app.route('/get_video_character_effect_types', methods=['GET'])
+@cached_catalog_response
 def get_video_character_effect_types():
     """Return supported character effect type list
     
@@ -1411,13 +1690,13 @@ def get_video_character_effect_types():
         
         if IS_CAPCUT_ENV:
             # Return character effect types in CapCut environment
-            for name, member in CapCut_Video_character_effect_type.__members__.items():
+            for name, member in draft.CapCut_Video_character_effect_type.__members__.items():
                 effect_types.append({
                     "name": name
                 })
         else:
             # Return character effect types in JianYing environment
-            for name, member in Video_character_effect_type.__members__.items():
+            for name, member in draft.Video_character_effect_type.__members__.items():
                 effect_types.append({
                     "name": name
                 })
@@ -1431,5 +1710,41 @@ def get_video_character_effect_types():
         return jsonify(result)
 
 
+@app.route('/search_catalog', methods=['GET'])
+def search_catalog():
+    """Search the effect/animation/transition/mask/font catalogs of the current environment
+
+    Query parameters: q, category (comma separated), is_vip, has_params, offset, limit
+    """
+    result = {
+        "success": True,
+        "output": "",
+        "error": ""
+    }
+
+    def parse_bool(value):
+        if value is None or value == "":
+            return None
+        return value.lower() in ("1", "true", "yes")
+
+    try:
+        category = request.args.get('category')
+        result["output"] = search_catalog_impl(
+            query=request.args.get('q', ''),
+            category=category.split(',') if category else None,
+            is_vip=parse_bool(request.args.get('is_vip')),
+            has_params=parse_bool(request.args.get('has_params')),
+            offset=request.args.get('offset', 0, type=int),
+            limit=request.args.get('limit', 20, type=int)
+        )
+        return jsonify(result)
+
+    except Exception as e:
+        result["success"] = False
+        result["error"] = f"Error occurred while searching catalog: {str(e)}"
+        return jsonify(result)
+
+
 if __name__ == '__main__':
+    configure_logging(json_lines=False)
     app.run(host='0.0.0.0', port=PORT)
@@ -1,7 +1,10 @@
 import uuid
 import pyJianYingDraft as draft
 import time
-from draft_cache import DRAFT_CACHE, update_cache
+import logging
+from draft_cache import get_cached_draft, update_cache
+
+logger = logging.getLogger('flask_video_generator')
 
 def create_draft(width=1080, height=1920):
     """
@@ -31,17 +34,15 @@ def get_or_create_draft(draft_id=None, width=1080, height=1920):
     :param height: Video height, default 1920
     :return: (draft_name, draft_path, draft_id, draft_dir, script)
     """
-    global DRAFT_CACHE  # Declare use of global variable
-    
-    if draft_id is not None and draft_id in DRAFT_CACHE:
-        # Get existing draft information from cache
-        print(f"Getting draft from cache: {draft_id}")
-        # Update last access time
-        update_cache(draft_id, DRAFT_CACHE[draft_id])
-        return draft_id, DRAFT_CACHE[draft_id]
+    if draft_id is not None:
+        # Get existing draft information from cache, this also updates its last access time
+        script = get_cached_draft(draft_id)
+        if script is not None:
+            logger.info(f"Getting draft from cache: {draft_id}")
+            return draft_id, script
 
     # Create new draft logic
-    print("Creating new draft")
+    logger.info("Creating new draft")
     script, generate_draft_id = create_draft(
         width=width,
         height=height,
@@ -3,9 +3,44 @@ import subprocess
 import time
 import requests
 import shutil
+import logging
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout
 from urllib.parse import urlparse, unquote
 
+from settings.local import SUBTITLE_FETCH_TIMEOUT, SUBTITLE_CACHE_TTL
+
+logger = logging.getLogger('flask_video_generator')
+
+TEXT_CACHE_SIZE = 64  # Remote text files (subtitles) kept in memory by fetch_text
+TEXT_CACHE_MAX_FILE_BYTES = 4 * 1024 * 1024  # Larger files are downloaded every time instead of being cached
+TEXT_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Total size of the cached files
+TEXT_FETCH_POOL_SIZE = 16  # Connections kept open per host, shared by all request threads
+
+# One pooled session for the whole process, so request threads reuse each other's connections
+_text_session = requests.Session()
+_text_adapter = HTTPAdapter(pool_connections=TEXT_FETCH_POOL_SIZE, pool_maxsize=TEXT_FETCH_POOL_SIZE)
+_text_session.mount("http://", _text_adapter)
+_text_session.mount("https://", _text_adapter)
+
+
+class _Cached_text(NamedTuple):
+    text: str
+    size: int  # Bytes of the downloaded body
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float  # time.monotonic() of the last response from the server
+    server_max_age: Optional[float]  # Freshness allowed by Cache-Control (0 for no-cache), None if not given
+
+
+# URL -> cached text, least recently used first
+_text_cache: "OrderedDict[str, _Cached_text]" = OrderedDict()
+_text_cache_bytes = 0
+_text_cache_lock = threading.Lock()
+
 def download_video(video_url, draft_name, material_name):
     """
     Download video to specified directory
@@ -23,7 +58,7 @@ def download_video(video_url, draft_name, material_name):
     
     # Check if file already exists
     if os.path.exists(local_path):
-        print(f"Video file already exists: {local_path}")
+        logger.info(f"Video file already exists: {local_path}")
         return local_path
     
     try:
@@ -56,7 +91,7 @@ def download_image(image_url, draft_name, material_name):
     
     # Check if file already exists
     if os.path.exists(local_path):
-        print(f"Image file already exists: {local_path}")
+        logger.info(f"Image file already exists: {local_path}")
         return local_path
     
     try:
@@ -92,7 +127,7 @@ def download_audio(audio_url, draft_name, material_name):
     
     # Check if file already exists
     if os.path.exists(local_path):
-        print(f"Audio file already exists: {local_path}")
+        logger.info(f"Audio file already exists: {local_path}")
         return local_path
     
     try:
@@ -119,16 +154,16 @@ def download_file(url:str, local_filename, max_retries=3, timeout=180):
         # 创建目标目录（如果不存在）
         if directory and not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
-            print(f"Created directory: {directory}")
+            logger.info(f"Created directory: {directory}")
         
-        print(f"Copying local file: {url} to {local_filename}")
+        logger.info(f"Copying local file: {url} to {local_filename}")
         start_time = time.time()
         
         # 复制文件
         shutil.copy2(url, local_filename)
         
-        print(f"Copy completed in {time.time()-start_time:.2f} seconds")
-        print(f"File saved as: {os.path.abspath(local_filename)}")
+        logger.info(f"Copy completed in {time.time()-start_time:.2f} seconds")
+        logger.info(f"File saved as: {os.path.abspath(local_filename)}")
         return True
     
     # 原有的下载逻辑
@@ -140,16 +175,16 @@ def download_file(url:str, local_filename, max_retries=3, timeout=180):
         try:
             if retries > 0:
                 wait_time = 2 ** retries  # Exponential backoff strategy
-                print(f"Retrying in {wait_time} seconds... (Attempt {retries+1}/{max_retries})")
+                logger.warning(f"Retrying in {wait_time} seconds... (Attempt {retries+1}/{max_retries})")
                 time.sleep(wait_time)
             
-            print(f"Downloading file: {local_filename}")
+            logger.info(f"Downloading file: {local_filename}")
             start_time = time.time()
             
             # Create directory (if it doesn't exist)
             if directory and not os.path.exists(directory):
                 os.makedirs(directory, exist_ok=True)
-                print(f"Created directory: {directory}")
+                logger.info(f"Created directory: {directory}")
 
             # Add headers
             headers = {
@@ -176,25 +211,110 @@ def download_file(url:str, local_filename, max_retries=3, timeout=180):
                                 progress = bytes_written / total_size * 100
                                 # For frequently updated progress, consider using logger.debug or more granular control to avoid large log files
                                 # Or only output progress to console, not write to file
-                                print(f"\r[PROGRESS] {progress:.2f}% ({bytes_written/1024:.2f}KB/{total_size/1024:.2f}KB)", end='')
+                                logger.debug(f"[PROGRESS] {progress:.2f}% ({bytes_written/1024:.2f}KB/{total_size/1024:.2f}KB)")
                                 pass # Avoid printing too much progress information in log files
                 
                 if total_size > 0:
                     # print() # Original newline
                     pass
-                print(f"Download completed in {time.time()-start_time:.2f} seconds")
-                print(f"File saved as: {os.path.abspath(local_filename)}")
+                logger.info(f"Download completed in {time.time()-start_time:.2f} seconds")
+                logger.info(f"File saved as: {os.path.abspath(local_filename)}")
                 return True
                 
         except Timeout:
-            print(f"Download timed out after {timeout} seconds")
+            logger.warning(f"Download timed out after {timeout} seconds")
         except RequestException as e:
-            print(f"Request failed: {e}")
+            logger.warning(f"Request failed: {e}")
         except Exception as e:
-            print(f"Unexpected error during download: {e}")
+            logger.warning(f"Unexpected error during download: {e}")
         
         retries += 1
     
-    print(f"Download failed after {max_retries} attempts for URL: {url}")
+    logger.error(f"Download failed after {max_retries} attempts for URL: {url}")
     return False
 
+
+def _cache_control(headers) -> Tuple[bool, Optional[float]]:
+    """Parse Cache-Control into (may be stored, seconds it stays fresh or None if the header does not say)"""
+    directives = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name.lower()] = value.strip('"')
+    if "no-store" in directives:
+        return False, None
+    if "no-cache" in directives:
+        return True, 0.0
+    try:
+        return True, max(0.0, float(directives["max-age"]))
+    except (KeyError, ValueError):
+        return True, None
+
+
+def _forget_text(url: str) -> None:
+    """Drop url from the cache, the cache lock must be held"""
+    global _text_cache_bytes
+    cached = _text_cache.pop(url, None)
+    if cached is not None:
+        _text_cache_bytes -= cached.size
+
+
+def fetch_text(url: str, timeout: Optional[float] = None, max_age: Optional[float] = None) -> str:
+    """
+    Download a small text file (such as a subtitle file) as UTF-8 through a pooled session, with an in-memory cache:
+    a URL fetched less than max_age seconds ago is served without contacting the server, an older one is
+    revalidated with its ETag / Last-Modified and only downloaded again if the server reports a change.
+    The server's Cache-Control is honoured: no-store is never cached, no-cache is always revalidated and
+    max-age shortens max_age. Files larger than TEXT_CACHE_MAX_FILE_BYTES are not cached
+    :param url: http(s) URL of the file
+    :param timeout: Connect and read timeout in seconds, default is subtitle_fetch_timeout
+    :param max_age: Seconds a cached copy is used without revalidating it, default is subtitle_cache_ttl; 0 always revalidates
+    :return: Content of the file
+    """
+    timeout = SUBTITLE_FETCH_TIMEOUT if timeout is None else timeout
+    max_age = SUBTITLE_CACHE_TTL if max_age is None else max_age
+
+    with _text_cache_lock:
+        cached = _text_cache.get(url)
+        if cached is not None:
+            _text_cache.move_to_end(url)
+    if cached is not None:
+        fresh_for = max_age if cached.server_max_age is None else min(max_age, cached.server_max_age)
+        if time.monotonic() - cached.fetched_at < fresh_for:
+            return cached.text
+
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    response = _text_session.get(url, headers=headers, timeout=timeout)
+    if cached is not None and response.status_code == 304:
+        logger.debug(f"Cached copy of {url} is still valid.")
+        text, size = cached.text, cached.size
+        etag, last_modified = cached.etag, cached.last_modified
+    else:
+        response.raise_for_status()
+        response.encoding = 'utf-8-sig'  # Same as local subtitle files, a byte order mark is dropped
+        text, size = response.text, len(response.content)
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    storable, server_max_age = _cache_control(response.headers)
+
+    global _text_cache_bytes
+    with _text_cache_lock:
+        _forget_text(url)
+        if storable and size <= TEXT_CACHE_MAX_FILE_BYTES:
+            _text_cache[url] = _Cached_text(text, size, etag, last_modified, time.monotonic(), server_max_age)
+            _text_cache_bytes += size
+            while len(_text_cache) > TEXT_CACHE_SIZE or _text_cache_bytes > TEXT_CACHE_MAX_BYTES:
+                _forget_text(next(iter(_text_cache)))
+    return text
+
+
+def clear_text_cache() -> None:
+    """Forget every file cached by fetch_text"""
+    global _text_cache_bytes
+    with _text_cache_lock:
+        _text_cache.clear()
+        _text_cache_bytes = 0
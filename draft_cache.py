@@ -1,19 +1,99 @@
 from collections import OrderedDict
+import contextlib
+import threading
+import logging
 import pyJianYingDraft as draft
-from typing import Dict
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger('flask_video_generator')
 
 # Modify global variable, use OrderedDict to implement LRU cache, limit the maximum number to 10000
 DRAFT_CACHE: Dict[str, 'draft.Script_file'] = OrderedDict()  # Use Dict for type hinting
 MAX_CACHE_SIZE = 10000
 
+class DraftLock:
+    """Lock of one draft and the number of callers currently using it"""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.users = 0  # Callers between get_draft_lock and the release of the lock, guarded by _draft_locks_guard
+
+
+# Per-draft locks for callers that apply several edits to one draft as a unit (see batch_impl)
+# An entry lives as long as its draft is cached or someone uses it, it is never dropped while in use
+DRAFT_LOCKS: Dict[str, DraftLock] = {}
+_draft_locks_guard = threading.Lock()
+
+# Guards DRAFT_CACHE itself, request threads read and reorder it concurrently
+# Lock order: DRAFT_CACHE_LOCK before _draft_locks_guard; neither is held while waiting for a draft lock
+DRAFT_CACHE_LOCK = threading.RLock()
+
+def _evict_one() -> None:
+    """Remove the least recently used draft whose lock is not in use, caller holds DRAFT_CACHE_LOCK"""
+    with _draft_locks_guard:
+        for evicted_key in DRAFT_CACHE:
+            entry = DRAFT_LOCKS.get(evicted_key)
+            if entry is None:
+                break
+            # Skip drafts that are being edited or about to be, including by the current thread
+            if entry.users == 0:
+                del DRAFT_LOCKS[evicted_key]
+                break
+        else:
+            logger.warning("Cache is full and every cached draft is locked, not evicting")
+            return
+    DRAFT_CACHE.pop(evicted_key)
+
 def update_cache(key: str, value: draft.Script_file) -> None:
     """Update LRU cache"""
-    if key in DRAFT_CACHE:
-        # If the key exists, delete the old item
-        DRAFT_CACHE.pop(key)
-    elif len(DRAFT_CACHE) >= MAX_CACHE_SIZE:
-        print(f"{key}, Cache is full, deleting the least recently used item")
-        # If the cache is full, delete the least recently used item (the first item)
-        DRAFT_CACHE.popitem(last=False)
-    # Add new item to the end (most recently used)
-    DRAFT_CACHE[key] = value
\ No newline at end of file
+    with DRAFT_CACHE_LOCK:
+        if key in DRAFT_CACHE:
+            # If the key exists, delete the old item
+            DRAFT_CACHE.pop(key)
+        elif len(DRAFT_CACHE) >= MAX_CACHE_SIZE:
+            logger.info(f"{key}, Cache is full, deleting the least recently used item")
+            # If the cache is full, delete the least recently used item that nobody is editing
+            _evict_one()
+        # Add new item to the end (most recently used)
+        DRAFT_CACHE[key] = value
+
+def get_cached_draft(key: str) -> Optional[draft.Script_file]:
+    """Return a cached draft and mark it as recently used, None if it is not cached"""
+    with DRAFT_CACHE_LOCK:
+        script = DRAFT_CACHE.get(key)
+        if script is not None:
+            DRAFT_CACHE.move_to_end(key)
+        return script
+
+def remove_from_cache(key: str) -> None:
+    """Drop a draft from the cache, if present, together with its lock unless the lock is in use"""
+    with DRAFT_CACHE_LOCK:
+        DRAFT_CACHE.pop(key, None)
+        with _draft_locks_guard:
+            entry = DRAFT_LOCKS.get(key)
+            if entry is not None and entry.users == 0:
+                del DRAFT_LOCKS[key]
+
+@contextlib.contextmanager
+def get_draft_lock(key: str) -> Iterator[None]:
+    """Hold the lock guarding a draft for the duration of a with block, creating it on first use
+
+    The lock is reentrant. It is registered as in use from this call until it is released, so it
+    cannot be dropped (and replaced by a second lock for the same draft) while a caller waits for it.
+    """
+    with _draft_locks_guard:
+        entry = DRAFT_LOCKS.get(key)
+        if entry is None:
+            entry = DRAFT_LOCKS[key] = DraftLock()
+        entry.users += 1
+    try:
+        with entry.lock:
+            yield
+    finally:
+        with DRAFT_CACHE_LOCK, _draft_locks_guard:
+            entry.users -= 1
+            # Locks of drafts that are not (or no longer) cached are dropped by their last user
+            if entry.users == 0 and key not in DRAFT_CACHE and DRAFT_LOCKS.get(key) is entry:
+                del DRAFT_LOCKS[key]
@@ -1,6 +1,9 @@
 import subprocess
 import json
 import time
+import logging
+
+logger = logging.getLogger('flask_video_generator')
 
 def get_video_duration(video_url):
     """
@@ -15,7 +18,7 @@ def get_video_duration(video_url):
     timeout_seconds = 10 # Set timeout for each attempt
 
     for attempt in range(max_retries):
-        print(f"Attempting to get video duration (Attempt {attempt + 1}/{max_retries}) ...")
+        logger.info(f"Attempting to get video duration (Attempt {attempt + 1}/{max_retries}) ...")
         result = {"success": False, "output": 0, "error": None} # Reset result before each retry
         
         try:
@@ -54,29 +57,29 @@ def get_video_duration(video_url):
             
             # If duration is successfully obtained, return result directly without retrying
             if result["success"]:
-                print(f"Successfully obtained duration: {result['output']:.2f} seconds")
+                logger.info(f"Successfully obtained duration: {result['output']:.2f} seconds")
                 return result
 
         except subprocess.TimeoutExpired:
             result["error"] = f"Getting video duration timed out (exceeded {timeout_seconds} seconds)."
-            print(f"Attempt {attempt + 1} timed out.")
+            logger.warning(f"Attempt {attempt + 1} timed out.")
         except subprocess.CalledProcessError as e:
             result["error"] = f"Error executing ffprobe command (exit code {e.returncode}): {e.stderr.strip()}"
-            print(f"Attempt {attempt + 1} failed. Error: {e.stderr.strip()}")
+            logger.warning(f"Attempt {attempt + 1} failed. Error: {e.stderr.strip()}")
         except json.JSONDecodeError as e:
             result["error"] = f"Error parsing JSON data: {e}"
-            print(f"Attempt {attempt + 1} failed. JSON parsing error: {e}")
+            logger.warning(f"Attempt {attempt + 1} failed. JSON parsing error: {e}")
         except FileNotFoundError:
             result["error"] = "ffprobe command not found. Please ensure FFmpeg is installed and in system PATH."
-            print("Error: ffprobe command not found, please check installation.")
+            logger.error("Error: ffprobe command not found, please check installation.")
             return result # No need to retry if ffprobe itself is not found
         except Exception as e:
             result["error"] = f"Unknown error occurred: {e}"
-            print(f"Attempt {attempt + 1} failed. Unknown error: {e}")
+            logger.warning(f"Attempt {attempt + 1} failed. Unknown error: {e}")
         
         # Try using remote service to get duration after each local failure
         if not result["success"]:
-            print(f"Local retrieval failed")
+            logger.warning(f"Local retrieval failed")
             # try:
             #     remote_duration = get_duration(video_url)
             #     if remote_duration is not None:
@@ -92,9 +95,9 @@ def get_video_duration(video_url):
         
         # If current attempt failed and max retries not reached, wait and prepare for next retry
         if not result["success"] and attempt < max_retries - 1:
-            print(f"Waiting {retry_delay_seconds} seconds before retrying...")
+            logger.info(f"Waiting {retry_delay_seconds} seconds before retrying...")
             time.sleep(retry_delay_seconds)
         elif not result["success"] and attempt == max_retries - 1:
-            print(f"Maximum retry count {max_retries} reached, both local and remote services unable to get duration.")
+            logger.error(f"Maximum retry count {max_retries} reached, both local and remote services unable to get duration.")
             
     return result # Return the last failure result after all retries fail
\ No newline at end of file
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+CapCut API MCP stdio桥接
+
+将标准输入输出上的JSON-RPC消息原样转发到以socket方式运行的MCP服务器
+(python mcp_server.py --listen ADDRESS)。MCP客户端只能启动stdio进程时, 用本脚本代替mcp_server.py,
+多个客户端即可共享同一个已预热的服务器进程及其草稿缓存。本脚本只依赖标准库, 启动开销很小。
+
+用法: python mcp_bridge.py unix:/tmp/capcut-mcp.sock  或  python mcp_bridge.py 127.0.0.1:9002
+"""
+
+import socket
+import sys
+import threading
+
+
+def connect(address: str) -> socket.socket:
+    """连接unix:/path/to.sock或host:port"""
+    if address.startswith("unix:"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address[len("unix:"):])
+    else:
+        host, _, port = address.rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)))
+    return sock
+
+
+def forward_stdin(sock: socket.socket) -> None:
+    """将标准输入逐行发送给服务器, 输入结束后关闭写端, 服务器回复完未完成的调用后关闭连接"""
+    try:
+        for line in sys.stdin.buffer:
+            sock.sendall(line)
+    except OSError:
+        pass
+    finally:
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__.strip().splitlines()[-1], file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        sock = connect(sys.argv[1])
+    except OSError as e:
+        print(f"[ERROR] Could not connect to MCP server at {sys.argv[1]}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    threading.Thread(target=forward_stdin, args=(sock,), daemon=True).start()
+    with sock.makefile("rb") as server_output:
+        for line in server_output:
+            sys.stdout.buffer.write(line)
+            sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
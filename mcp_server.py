@@ -9,13 +9,22 @@ import sys
 import os
 import json
 import traceback
-import io
+import argparse
+import asyncio
+import socket
+import stat
 import contextlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from call_logging import LOGGER_NAME, call_context, configure_logging, run_in_call_context
+
+logger = logging.getLogger(LOGGER_NAME)
+
 # 导入CapCut API功能
 try:
     from create_draft import get_or_create_draft
@@ -26,14 +35,27 @@ try:
     from add_subtitle_impl import add_subtitle_impl
     from add_effect_impl import add_effect_impl
     from add_sticker_impl import add_sticker_impl
-    from add_video_keyframe_impl import add_video_keyframe_impl
+    from add_video_keyframe_impl import add_video_keyframe_impl, add_video_keyframe_curve_impl
     from get_duration_impl import get_video_duration
+    from search_catalog_impl import search_catalog_impl
+    from batch_impl import batch_impl
+    from timeline_impl import build_timeline_impl
     from save_draft_impl import save_draft_impl
+    from draft_cache import get_draft_lock
     from pyJianYingDraft.text_segment import TextStyleRange
+    from settings.local import MCP_MAX_CONCURRENCY, MCP_MAX_CONNECTIONS, MCP_CONNECTION_MAX_CALLS
     CAPCUT_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Could not import CapCut modules: {e}", file=sys.stderr)
     CAPCUT_AVAILABLE = False
+    MCP_MAX_CONCURRENCY = 8
+    MCP_MAX_CONNECTIONS = 64
+    MCP_CONNECTION_MAX_CALLS = 4
+
+# socket传输中单条JSON-RPC消息的最大字节数(build_timeline等批量请求可能很大)
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+# 拒绝超出连接数上限的连接时, 等待客户端关闭的最长秒数
+REJECT_LINGER = 1.0
 
 # 完整的工具定义
 TOOLS = [
@@ -234,6 +256,97 @@ TOOLS = [
             }
         }
     },
+    {
+        "name": "add_video_keyframe_curve",
+        "description": "按曲线批量生成视频关键帧，支持缓动函数、贝塞尔曲线或采样数组，可去除冗余关键帧",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "draft_id": {"type": "string", "description": "草稿ID"},
+                "track_name": {"type": "string", "default": "main", "description": "轨道名称"},
+                "property_type": {"type": "string", "description": "关键帧属性类型(position_x, position_y, rotation, scale_x, scale_y, uniform_scale, alpha, saturation, contrast, brightness, volume)"},
+                "start": {"type": "number", "default": 0.0, "description": "曲线开始时间（秒）"},
+                "end": {"type": "number", "default": 1.0, "description": "曲线结束时间（秒）"},
+                "start_value": {"type": "string", "description": "开始时间的关键帧值"},
+                "end_value": {"type": "string", "description": "结束时间的关键帧值"},
+                "easing": {"type": "string", "default": "linear", "description": "缓动函数(linear, ease_in_quad, ease_out_quad, ease_in_out_quad, ease_in_cubic, ease_out_cubic, ease_in_out_cubic, ease_in_sine, ease_out_sine, ease_in_out_sine, ease_in_expo, ease_out_expo)"},
+                "bezier": {"type": "array", "description": "三次贝塞尔控制点[x1, y1, x2, y2]，提供时覆盖easing"},
+                "samples": {"type": "array", "description": "在开始与结束时间之间均匀分布的采样值，提供时覆盖start_value/end_value/easing"},
+                "sample_rate": {"type": "number", "default": 30.0, "description": "每秒生成的关键帧数"},
+                "tolerance": {"type": "number", "description": "去除冗余关键帧时允许的最大偏差，不提供则不简化"}
+            }
+        }
+    },
+    {
+        "name": "batch",
+        "description": "在一次调用中按顺序对同一草稿执行多个操作，返回每个操作的结果，支持全部成功或尽力执行两种模式",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "draft_id": {"type": "string", "description": "草稿ID，不提供则创建新草稿"},
+                "operations": {
+                    "type": "array",
+                    "description": "操作列表，每项为{op, params}，op可为add_video, add_audio, add_image, add_text, add_subtitle, add_effect, add_sticker, add_video_keyframe, add_video_keyframe_curve，params与对应工具的参数相同",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "op": {"type": "string", "description": "操作名称"},
+                            "params": {"type": "object", "description": "操作参数"}
+                        },
+                        "required": ["op"]
+                    }
+                },
+                "mode": {"type": "string", "enum": ["atomic", "best_effort"], "default": "atomic", "description": "atomic: 任一操作失败则回滚草稿并停止；best_effort: 记录失败并继续执行"},
+                "width": {"type": "integer", "default": 1080, "description": "新建草稿的视频宽度"},
+                "height": {"type": "integer", "default": 1920, "description": "新建草稿的视频高度"}
+            },
+            "required": ["operations"]
+        }
+    },
+    {
+        "name": "build_timeline",
+        "description": "根据一份声明式时间线一次性构建草稿的全部轨道和片段，每条轨道的片段批量插入并只做一次重叠检查，任一片段无效时不修改草稿",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "draft_id": {"type": "string", "description": "草稿ID，不提供则创建新草稿"},
+                "tracks": {
+                    "type": "array",
+                    "description": "轨道列表，片段参数与add_video, add_audio, add_text, add_effect工具相同(不含draft_id, track_name, width, height)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "type": {"type": "string", "enum": ["video", "audio", "text", "effect"], "description": "轨道类型"},
+                            "name": {"type": "string", "description": "轨道名称，默认与对应工具的默认轨道名相同"},
+                            "relative_index": {"type": "integer", "default": 0, "description": "相对图层位置"},
+                            "mute": {"type": "boolean", "default": False, "description": "轨道是否静音"},
+                            "segments": {"type": "array", "items": {"type": "object"}, "description": "片段参数列表"}
+                        },
+                        "required": ["type", "segments"]
+                    }
+                },
+                "draft_folder": {"type": "string", "description": "草稿文件夹路径，用于生成素材的本地路径"},
+                "width": {"type": "integer", "default": 1080, "description": "新建草稿的视频宽度"},
+                "height": {"type": "integer", "default": 1920, "description": "新建草稿的视频高度"}
+            },
+            "required": ["tracks"]
+        }
+    },
+    {
+        "name": "search_catalog",
+        "description": "按名称搜索特效、动画、转场、蒙版、字体等资源，支持前缀、模糊及拼音匹配，结果按相关度排序并分页",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "default": "", "description": "搜索文本，为空时列出全部"},
+                "category": {"type": "array", "items": {"type": "string"}, "description": "限定分类(intro_animation, outro_animation, combo_animation, transition, mask, audio_effect, font, text_intro, text_outro, text_loop_anim, video_scene_effect, video_character_effect)"},
+                "is_vip": {"type": "boolean", "description": "只返回VIP(true)或免费(false)资源"},
+                "has_params": {"type": "boolean", "description": "只返回有(true)或没有(false)可调参数的资源"},
+                "offset": {"type": "integer", "default": 0, "description": "跳过的结果数"},
+                "limit": {"type": "integer", "default": 20, "description": "返回的最大结果数，最多100"}
+            }
+        }
+    },
     {
         "name": "get_video_duration",
         "description": "获取视频时长",
@@ -257,16 +370,6 @@ TOOLS = [
     }
 ]
 
-@contextlib.contextmanager
-def capture_stdout():
-    """捕获标准输出，防止CapCut API的调试信息干扰JSON响应"""
-    old_stdout = sys.stdout
-    sys.stdout = io.StringIO()
-    try:
-        yield sys.stdout
-    finally:
-        sys.stdout = old_stdout
-
 def convert_text_styles(text_styles_data):
     """将字典格式的text_styles转换为TextStyleRange对象列表"""
     if not text_styles_data:
@@ -287,19 +390,22 @@ def convert_text_styles(text_styles_data):
             text_style_ranges.append(style_range)
         return text_style_ranges
     except Exception as e:
-        print(f"[ERROR] Error converting text_styles: {e}", file=sys.stderr)
+        logger.error(f"Error converting text_styles: {e}")
         return None
 
 def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
     """执行具体的工具"""
     try:
-        print(f"[DEBUG] Executing tool: {tool_name} with args: {arguments}", file=sys.stderr)
+        logger.debug(f"Executing tool: {tool_name} with args: {arguments}")
         
         if not CAPCUT_AVAILABLE:
             return {"success": False, "error": "CapCut modules not available"}
         
-        # 捕获标准输出，防止调试信息干扰
-        with capture_stdout() as captured:
+        # 同一草稿上的调用可能被并发执行, 按草稿串行化; 不同草稿之间互不阻塞
+        draft_id = arguments.get("draft_id")
+        draft_lock = get_draft_lock(draft_id) if draft_id else contextlib.nullcontext()
+
+        with draft_lock:
             if tool_name == "create_draft":
                 draft_id, script = get_or_create_draft(
                     width=arguments.get("width", 1080),
@@ -340,6 +446,18 @@ def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
             elif tool_name == "add_video_keyframe":
                 result = add_video_keyframe_impl(**arguments)
                 
+            elif tool_name == "add_video_keyframe_curve":
+                result = add_video_keyframe_curve_impl(**arguments)
+                
+            elif tool_name == "batch":
+                result = batch_impl(**arguments)
+                
+            elif tool_name == "build_timeline":
+                result = build_timeline_impl(**arguments)
+                
+            elif tool_name == "search_catalog":
+                result = search_catalog_impl(**arguments)
+                
             elif tool_name == "get_video_duration":
                 duration = get_video_duration(arguments["video_url"])
                 result = {"duration": duration}
@@ -365,110 +483,345 @@ def execute_tool(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        print(f"[ERROR] Tool execution error: {e}", file=sys.stderr)
-        print(f"[ERROR] Traceback: {traceback.format_exc()}", file=sys.stderr)
+        logger.error(f"Tool execution error: {e}", exc_info=True)
         return {"success": False, "error": str(e)}
 
-def handle_request(request_data: str) -> Optional[str]:
-    """处理JSON-RPC请求"""
-    try:
-        request = json.loads(request_data.strip())
-        print(f"[DEBUG] Received request: {request.get('method', 'unknown')}", file=sys.stderr)
-        
-        if request.get("method") == "initialize":
-            response = {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "experimental": {},
-                        "tools": {"listChanged": False}
-                    },
-                    "serverInfo": {
-                        "name": "capcut-api",
-                        "version": "1.12.3"
-                    }
+def tool_call_response(request_id: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+    """将execute_tool的结果包装为tools/call的JSON-RPC响应"""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "content": [
+                {
+                    "type": "text",
+                    "text": json.dumps(result, ensure_ascii=False, indent=2)
                 }
-            }
-            return json.dumps(response)
-            
-        elif request.get("method") == "notifications/initialized":
-            return None
-            
-        elif request.get("method") == "tools/list":
-            response = {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {"tools": TOOLS}
-            }
-            return json.dumps(response)
-            
-        elif request.get("method") == "tools/call":
-            tool_name = request["params"]["name"]
-            arguments = request["params"].get("arguments", {})
-            
-            result = execute_tool(tool_name, arguments)
-            
-            response = {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(result, ensure_ascii=False, indent=2)
-                        }
-                    ]
+            ]
+        }
+    }
+
+def handle_message(request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """处理一条已解析的JSON-RPC消息, 通知类消息返回None"""
+    logger.debug(f"Received request: {request.get('method', 'unknown')}")
+
+    if request.get("method") == "initialize":
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "result": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {
+                    "experimental": {},
+                    "tools": {"listChanged": False}
+                },
+                "serverInfo": {
+                    "name": "capcut-api",
+                    "version": "1.12.3"
                 }
             }
-            return json.dumps(response)
-            
-        else:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "error": {"code": -32601, "message": "Method not found"}
-            }
-            return json.dumps(error_response)
-            
-    except Exception as e:
-        print(f"[ERROR] Request handling error: {e}", file=sys.stderr)
-        print(f"[ERROR] Traceback: {traceback.format_exc()}", file=sys.stderr)
-        error_response = {
+        }
+
+    elif request.get("method") in ("notifications/initialized", "notifications/cancelled"):
+        return None
+
+    elif request.get("method") == "tools/list":
+        return {
             "jsonrpc": "2.0",
-            "id": None,
-            "error": {"code": 0, "message": str(e)}
+            "id": request.get("id"),
+            "result": {"tools": TOOLS}
         }
-        return json.dumps(error_response)
+
+    elif request.get("method") == "tools/call":
+        tool_name = request["params"]["name"]
+        arguments = request["params"].get("arguments", {})
+
+        # 本次调用中所有日志记录都带上请求id、工具名与草稿id
+        with call_context(request_id=request.get("id"), tool=tool_name, draft_id=arguments.get("draft_id")):
+            result = execute_tool(tool_name, arguments)
+        return tool_call_response(request.get("id"), result)
+
+    else:
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get("id"),
+            "error": {"code": -32601, "message": "Method not found"}
+        }
+
+def error_response(e: Exception, request_id: Any = None) -> Dict[str, Any]:
+    """请求无法处理时返回的JSON-RPC错误, 已解析出请求id时须传入, 以便客户端对应到其请求; 消息无法解析时为-32700解析错误"""
+    logger.error(f"Request handling error: {e}", exc_info=True)
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": -32700 if isinstance(e, (json.JSONDecodeError, UnicodeDecodeError)) else 0, "message": str(e)}
+    }
+
+def handle_request(request_data: str) -> Optional[str]:
+    """处理JSON-RPC请求"""
+    try:
+        response = handle_message(json.loads(request_data.strip()))
+        return json.dumps(response) if response is not None else None
+    except Exception as e:
+        return json.dumps(error_response(e))
+
+class ToolCallPool:
+    """执行tools/call的线程池及全局并发上限, 由进程中的所有连接共享"""
+
+    def __init__(self, max_concurrency: int = MCP_MAX_CONCURRENCY):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="mcp-tool")
+
+    async def run(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            # 线程池不继承contextvars, 带上连接编号等日志字段
+            return await loop.run_in_executor(self.executor, run_in_call_context(handle_message, request))
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+class ConcurrentDispatcher:
+    """并发处理一个客户端的JSON-RPC请求
+
+    tools/call在共享的ToolCallPool中执行, 本客户端同时执行的调用数不超过max_concurrency, 其余的排队等待;
+    每个调用完成后立即按其id回复, 因此响应顺序可能与请求顺序不同。
+    收到notifications/cancelled时, 仍在排队的调用不再执行, 正在执行的调用其结果被丢弃, 两者都不回复。
+    其他方法耗时很短, 直接按顺序处理。
+    """
+
+    def __init__(self, write_frame, pool: ToolCallPool, max_concurrency: int = MCP_MAX_CONCURRENCY):
+        self.write_frame = write_frame  # 接收一条序列化后的JSON-RPC消息(str)并发送给客户端
+        self.pool = pool
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight: Dict[Any, asyncio.Task] = {}  # 请求id -> 未完成的tools/call
+
+    def send(self, response: Dict[str, Any]) -> None:
+        self.write_frame(json.dumps(response))
+
+    def dispatch(self, line: str) -> None:
+        """处理收到的一行消息, tools/call在后台任务中执行, 本方法不等待其完成"""
+        request = None
+        try:
+            request = json.loads(line.strip())
+            method = request.get("method")
+
+            if method == "notifications/cancelled":
+                request_id = (request.get("params") or {}).get("requestId")
+                task = self.in_flight.pop(request_id, None)
+                if task is not None:
+                    logger.info(f"Cancelling request {request_id}: {request['params'].get('reason', '')}")
+                    task.cancel()
+                return
+
+            if method == "tools/call" and "id" in request:
+                task = asyncio.ensure_future(self.call_tool(request))
+                self.in_flight[request["id"]] = task
+                task.add_done_callback(lambda done, request_id=request["id"]: self._forget(request_id, done))
+                return
+
+            response = handle_message(request)
+        except Exception as e:
+            response = error_response(e, request.get("id") if isinstance(request, dict) else None)
+        if response is not None:
+            self.send(response)
+
+    def _forget(self, request_id: Any, task: asyncio.Task) -> None:
+        if self.in_flight.get(request_id) is task:
+            del self.in_flight[request_id]
+
+    async def call_tool(self, request: Dict[str, Any]) -> None:
+        try:
+            async with self.semaphore:
+                response = await self.pool.run(request)
+        except asyncio.CancelledError:
+            # 被取消的请求不回复; 已在线程中开始执行的工具无法中断, 会执行完毕, 但结果被丢弃
+            logger.info(f"Request {request.get('id')} cancelled")
+            return
+        except Exception as e:
+            response = error_response(e, request.get("id"))
+        self.send(response)
+
+    async def drain(self) -> None:
+        """等待本客户端所有未完成的tools/call回复"""
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight.values(), return_exceptions=True)
+
+    def cancel_all(self) -> None:
+        """客户端断开时取消其所有未完成的调用"""
+        for task in self.in_flight.values():
+            task.cancel()
+        self.in_flight.clear()
+
+async def serve_stdio() -> None:
+    """通过标准输入输出收发按行分隔的JSON-RPC消息"""
+    loop = asyncio.get_running_loop()
+    # 标准输出只用于JSON-RPC消息; 其余代码中残留的print改为写入标准错误, 不会混入协议流
+    rpc_stdout = sys.stdout
+    sys.stdout = sys.stderr
+
+    def write_frame(frame: str) -> None:
+        rpc_stdout.write(frame + "\n")
+        rpc_stdout.flush()
+
+    pool = ToolCallPool()
+    dispatcher = ConcurrentDispatcher(write_frame, pool)
+    try:
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                logger.info("EOF received, shutting down")
+                break
+            if line.strip():
+                dispatcher.dispatch(line)
+    finally:
+        await dispatcher.drain()
+        pool.shutdown()
+        sys.stdout = rpc_stdout
+
+class SocketServer:
+    """通过TCP或Unix socket提供服务, 每个连接是一个独立的MCP客户端, 收发按行分隔的JSON-RPC消息
+
+    所有连接共享同一个进程, 因此共享已加载的模块与DRAFT_CACHE, 一个客户端创建的草稿可被其他客户端继续编辑。
+    同时连接数不超过max_connections, 超出的连接收到一条错误消息后被关闭;
+    每个连接同时执行的调用数不超过max_calls_per_connection, 全进程不超过MCP_MAX_CONCURRENCY。
+    """
+
+    def __init__(self, max_connections: int = MCP_MAX_CONNECTIONS,
+                 max_calls_per_connection: int = MCP_CONNECTION_MAX_CALLS):
+        self.max_connections = max_connections
+        self.max_calls_per_connection = max_calls_per_connection
+        self.pool = ToolCallPool()
+        self.connections = 0
+        self.connection_count = 0  # 累计连接数, 用作日志中的连接编号
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connection_count += 1
+        connection_id = self.connection_count
+
+        def write_frame(frame: str) -> None:
+            if not writer.is_closing():
+                writer.write(frame.encode("utf-8") + b"\n")
+
+        if self.connections >= self.max_connections:
+            logger.warning(f"Connection {connection_id} rejected, {self.connections} connections open")
+            write_frame(json.dumps({
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32000, "message": f"Too many connections, at most {self.max_connections} are served"}
+            }))
+            # 关闭前读掉客户端已发出的消息, 否则连接会被重置, 客户端可能收不到这条错误
+            try:
+                writer.write_eof()
+                await asyncio.wait_for(reader.read(), REJECT_LINGER)
+            except (asyncio.TimeoutError, ValueError, ConnectionError):
+                pass
+            await self._close(writer)
+            return
+
+        self.connections += 1
+        dispatcher = ConcurrentDispatcher(write_frame, self.pool, self.max_calls_per_connection)
+        with call_context(connection=connection_id):
+            logger.info(f"Connection {connection_id} opened, {self.connections} connections open")
+            try:
+                while True:
+                    try:
+                        line = await reader.readline()
+                    except ValueError:
+                        # 单条消息超过MAX_FRAME_BYTES, 无法继续按行解析
+                        write_frame(json.dumps(error_response(ValueError(f"Message longer than {MAX_FRAME_BYTES} bytes"))))
+                        break
+                    if not line:
+                        break
+                    if line.strip():
+                        try:
+                            text = line.decode("utf-8")
+                        except UnicodeDecodeError as e:
+                            # 与无法解析的JSON一样回复解析错误, 连接及其未完成的调用不受影响
+                            write_frame(json.dumps(error_response(e)))
+                        else:
+                            dispatcher.dispatch(text)
+                        await writer.drain()
+                # 客户端关闭写端后仍等待已发出的调用回复
+                await dispatcher.drain()
+            except ConnectionError:
+                dispatcher.cancel_all()
+            finally:
+                self.connections -= 1
+                logger.info(f"Connection {connection_id} closed")
+                await self._close(writer)
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter) -> None:
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def serve(self, address: str) -> None:
+        """监听address直到进程被终止, address为unix:/path/to.sock或host:port"""
+        socket_inode = None
+        if address.startswith("unix:"):
+            path = address[len("unix:"):]
+            self._remove_stale_socket(path)
+            server = await asyncio.start_unix_server(self.handle_connection, path=path, limit=MAX_FRAME_BYTES)
+            socket_inode = os.stat(path).st_ino
+        else:
+            host, _, port = address.rpartition(":")
+            server = await asyncio.start_server(self.handle_connection, host=host or "127.0.0.1", port=int(port),
+                                                limit=MAX_FRAME_BYTES)
+        logger.info(f"Listening on {address}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown()
+            # 只删除本服务器创建的socket文件, 不删除其后被替换成的其他文件
+            if socket_inode is not None:
+                path = address[len("unix:"):]
+                with contextlib.suppress(OSError):
+                    if os.stat(path).st_ino == socket_inode:
+                        os.unlink(path)
+
+    @staticmethod
+    def _remove_stale_socket(path: str) -> None:
+        """删除上次运行遗留的socket文件; path是其他类型的文件, 或仍有服务器在其上监听时抛出异常"""
+        try:
+            mode = os.stat(path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                pass
+            else:
+                raise OSError(f"Another server is listening on {path}")
+        os.unlink(path)
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="CapCut API MCP Server")
+    parser.add_argument("--listen", metavar="ADDRESS",
+                        help="serve many clients over a socket instead of stdio: unix:/path/to.sock or host:port")
+    args = parser.parse_args()
+
+    configure_logging(level=logging.DEBUG if os.environ.get("DEBUG") else logging.INFO)
     print("🚀 Starting CapCut API MCP Server (Complete Version)...", file=sys.stderr)
     print(f"📋 Available tools: {len(TOOLS)} tools loaded", file=sys.stderr)
     print("✨ Features: 视频、音频、图片、文本、字幕、特效、贴纸、关键帧", file=sys.stderr)
-    print("🔌 Waiting for client connections...", file=sys.stderr)
+    print(f"⚡ Up to {MCP_MAX_CONCURRENCY} concurrent tool calls", file=sys.stderr)
+    if args.listen:
+        print(f"🔌 Listening on {args.listen}, up to {MCP_MAX_CONNECTIONS} connections", file=sys.stderr)
+    else:
+        print("🔌 Waiting for client connections...", file=sys.stderr)
     
     try:
-        while True:
-            try:
-                line = sys.stdin.readline()
-                if not line:
-                    print("[DEBUG] EOF received, shutting down", file=sys.stderr)
-                    break
-                
-                response = handle_request(line)
-                if response:
-                    print(response)
-                    sys.stdout.flush()
-                    
-            except EOFError:
-                print("[DEBUG] EOF exception, shutting down", file=sys.stderr)
-                break
-            except Exception as e:
-                print(f"[ERROR] Server error: {e}", file=sys.stderr)
-                print(f"[ERROR] Traceback: {traceback.format_exc()}", file=sys.stderr)
-                
+        asyncio.run(SocketServer().serve(args.listen) if args.listen else serve_stdio())
     except KeyboardInterrupt:
         print("[INFO] Server stopped by user", file=sys.stderr)
     except Exception as e:
@@ -476,4 +829,4 @@ def main():
         print(f"[ERROR] Traceback: {traceback.format_exc()}", file=sys.stderr)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
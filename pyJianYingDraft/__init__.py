@@ -1,3 +1,5 @@
+from typing import TYPE_CHECKING, Any, List
+
 from .local_materials import Crop_settings, Video_material, Audio_material
 from .keyframe import Keyframe_property
 
@@ -7,20 +9,6 @@ from .video_segment import Video_segment, Sticker_segment, Clip_settings
 from .effect_segment import Effect_segment, Filter_segment
 from .text_segment import Text_segment, Text_style, Text_border, Text_background, Text_shadow
 
-from .metadata import Font_type
-from .metadata import Mask_type
-from .metadata import CapCut_Mask_type
-from .metadata import Transition_type, Filter_type
-from .metadata import CapCut_Transition_type
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
-from .metadata import Text_intro, Text_outro, Text_loop_anim
-from .metadata import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
-from .metadata import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
-from .metadata import Video_scene_effect_type, Video_character_effect_type
-from .metadata import CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type
-
 from .track import Track_type
 from .template_mode import Shrink_mode, Extend_mode
 from .script_file import Script_file
@@ -28,6 +16,34 @@ from .draft_folder import Draft_folder
 
 from .time_util import SEC, tim, trange
 
+from . import metadata
+
+def __getattr__(name: str) -> Any:
+    # 元数据枚举在首次访问时才加载, 见`metadata.__getattr__`
+    if name in metadata._LAZY_ATTRS:
+        value = getattr(metadata, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(metadata._LAZY_ATTRS))
+
+if TYPE_CHECKING:
+    from .metadata import Font_type
+    from .metadata import Mask_type
+    from .metadata import CapCut_Mask_type
+    from .metadata import Transition_type, Filter_type
+    from .metadata import CapCut_Transition_type
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+    from .metadata import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
+    from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .metadata import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
+    from .metadata import Video_scene_effect_type, Video_character_effect_type
+    from .metadata import CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type
+
 __all__ = [
     "Font_type",
     "Mask_type",
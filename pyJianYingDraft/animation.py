@@ -2,16 +2,17 @@
 
 import uuid
 
-from typing import Union, Optional
+from typing import TYPE_CHECKING, Union, Optional
 from typing import Literal, Dict, List, Any
 
 from .time_util import Timerange
 
-from .metadata.animation_meta import Animation_meta
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
-from .metadata import Text_intro, Text_outro, Text_loop_anim
-from .metadata import CapCut_Text_intro, CapCut_Text_loop_anim, CapCut_Text_outro
+if TYPE_CHECKING:
+    from .metadata.effect_meta import Animation_meta
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+    from .metadata import CapCut_Text_intro, CapCut_Text_loop_anim, CapCut_Text_outro
 
 class Animation:
     """一个视频/文本动画效果"""
@@ -33,7 +34,7 @@ class Animation:
     is_video_animation: bool
     """是否为视频动画, 在子类中定义"""
 
-    def __init__(self, animation_meta: Animation_meta, start: int, duration: int):
+    def __init__(self, animation_meta: "Animation_meta", start: int, duration: int):
         self.name = animation_meta.title
         self.effect_id = animation_meta.effect_id
         self.resource_id = animation_meta.resource_id
@@ -63,15 +64,16 @@ class Video_animation(Animation):
 
     animation_type: Literal["in", "out", "group"]
 
-    def __init__(self, animation_type: Union[Intro_type, Outro_type, Group_animation_type, CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type],
+    def __init__(self, animation_type: "Union[Intro_type, Outro_type, Group_animation_type, CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type]",
                  start: int, duration: int):
+        from . import metadata
         super().__init__(animation_type.value, start, duration)
 
-        if ((isinstance(animation_type, Intro_type) or isinstance(animation_type, CapCut_Intro_type))):
+        if ((isinstance(animation_type, metadata.Intro_type) or isinstance(animation_type, metadata.CapCut_Intro_type))):
             self.animation_type = "in"
-        elif isinstance(animation_type, Outro_type) or isinstance(animation_type, CapCut_Outro_type):
+        elif isinstance(animation_type, metadata.Outro_type) or isinstance(animation_type, metadata.CapCut_Outro_type):
             self.animation_type = "out"
-        elif isinstance(animation_type, Group_animation_type) or isinstance(animation_type, CapCut_Group_animation_type):
+        elif isinstance(animation_type, metadata.Group_animation_type) or isinstance(animation_type, metadata.CapCut_Group_animation_type):
             self.animation_type = "group"
 
         self.is_video_animation = True
@@ -81,15 +83,16 @@ class Text_animation(Animation):
 
     animation_type: Literal["in", "out", "loop"]
 
-    def __init__(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim, CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim],
+    def __init__(self, animation_type: "Union[Text_intro, Text_outro, Text_loop_anim, CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim]",
                  start: int, duration: int):
+        from . import metadata
         super().__init__(animation_type.value, start, duration)
 
-        if (isinstance(animation_type, Text_intro) or isinstance(animation_type, CapCut_Text_intro)):
+        if (isinstance(animation_type, metadata.Text_intro) or isinstance(animation_type, metadata.CapCut_Text_intro)):
             self.animation_type = "in"
-        elif (isinstance(animation_type, Text_outro) or isinstance(animation_type, CapCut_Text_outro)):
+        elif (isinstance(animation_type, metadata.Text_outro) or isinstance(animation_type, metadata.CapCut_Text_outro)):
             self.animation_type = "out"
-        elif (isinstance(animation_type, Text_loop_anim) or isinstance(animation_type, CapCut_Text_loop_anim)):
+        elif (isinstance(animation_type, metadata.Text_loop_anim) or isinstance(animation_type, metadata.CapCut_Text_loop_anim)):
             self.animation_type = "loop"
 
         self.is_video_animation = False
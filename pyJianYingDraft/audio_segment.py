@@ -4,20 +4,21 @@
 """
 
 import uuid
-from copy import deepcopy
+import numpy as np
 
-from typing import Optional, Literal, Union
-from typing import Dict, List, Any
-
-from pyJianYingDraft.metadata.capcut_audio_effect_meta import CapCut_Speech_to_song_effect_type, CapCut_Voice_characters_effect_type, CapCut_Voice_filters_effect_type
+from typing import TYPE_CHECKING, Optional, Literal, Union
+from typing import Dict, List, Sequence, Any
 
 from .time_util import tim, Timerange
 from .segment import Media_segment
 from .local_materials import Audio_material
-from .keyframe import Keyframe_property, Keyframe_list
+from .keyframe import Keyframe_property, Keyframe_list, add_columnar_keyframes
 
 from .metadata import Effect_param_instance
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+
+if TYPE_CHECKING:
+    from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .metadata import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
 
 class Audio_fade:
     """音频淡入淡出效果"""
@@ -61,7 +62,7 @@ class Audio_effect:
 
     audio_adjust_params: List[Effect_param_instance]
 
-    def __init__(self, effect_meta: Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type],
+    def __init__(self, effect_meta: "Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type]",
                  params: Optional[List[Optional[float]]] = None):
         """根据给定的音效元数据及参数列表构造一个音频特效对象, params的范围是0~100"""
 
@@ -70,22 +71,23 @@ class Audio_effect:
         self.resource_id = effect_meta.value.resource_id
         self.audio_adjust_params = []
 
-        if isinstance(effect_meta, Audio_scene_effect_type):
+        from . import metadata
+        if isinstance(effect_meta, metadata.Audio_scene_effect_type):
             self.category_id = "sound_effect"
             self.category_name = "场景音"
-        elif isinstance(effect_meta, Tone_effect_type):
+        elif isinstance(effect_meta, metadata.Tone_effect_type):
             self.category_id = "tone"
             self.category_name = "音色"
-        elif isinstance(effect_meta, Speech_to_song_type):
+        elif isinstance(effect_meta, metadata.Speech_to_song_type):
             self.category_id = "speech_to_song"
             self.category_name = "声音成曲"
-        elif isinstance(effect_meta, CapCut_Voice_filters_effect_type):
+        elif isinstance(effect_meta, metadata.CapCut_Voice_filters_effect_type):
             self.category_id = "sound_effect"
             self.category_name = "Voice filters"
-        elif isinstance(effect_meta, CapCut_Voice_characters_effect_type):
+        elif isinstance(effect_meta, metadata.CapCut_Voice_characters_effect_type):
             self.category_id = "tone"
             self.category_name = "Voice characters"
-        elif isinstance(effect_meta, CapCut_Speech_to_song_effect_type):
+        elif isinstance(effect_meta, metadata.CapCut_Speech_to_song_effect_type):
             self.category_id = "speech_to_song"
             self.category_name = "Speech to song"
         else:
@@ -113,8 +115,10 @@ class Audio_effect:
 class Audio_segment(Media_segment):
     """安放在轨道上的一个音频片段"""
 
+    __slots__ = ("material_instance", "fade", "effects")
+
     material_instance: Audio_material
-    """音频素材实例"""
+    """音频素材实例, 与传入的素材共享同一对象而非拷贝"""
 
     fade: Optional[Audio_fade]
     """音频淡入淡出效果, 可能为空
@@ -155,11 +159,11 @@ class Audio_segment(Media_segment):
 
         super().__init__(material.material_id, source_timerange, target_timerange, speed, volume)
 
-        self.material_instance = deepcopy(material)
+        self.material_instance = material
         self.fade = None
         self.effects = []
 
-    def add_effect(self, effect_type: Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type],
+    def add_effect(self, effect_type: "Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type]",
                    params: Optional[List[Optional[float]]] = None,
                    effect_id: Optional[str] = None) -> "Audio_segment":
         """为音频片段添加一个作用于整个片段的音频效果, 目前"声音成曲"效果不能自动被剪映所识别
@@ -175,7 +179,6 @@ class Audio_segment(Media_segment):
         """
         if params is not None and len(params) > len(effect_type.value.params):
             raise ValueError("为音频效果 %s 传入了过多的参数" % effect_type.value.name)
-        self.material_instance.has_audio_effect = True  # 添加这行代码
         effect_inst = Audio_effect(effect_type, params)
         if effect_id is not None:
             effect_inst.effect_id = effect_id
@@ -224,6 +227,20 @@ class Audio_segment(Media_segment):
         self.common_keyframes.append(kf_list)
         return self
 
+    def add_keyframes(self, time_offsets: Union[Sequence[int], np.ndarray],
+                      volumes: Union[Sequence[float], np.ndarray]) -> "Audio_segment":
+        """为音频片段批量添加*控制音量*的关键帧, 使用列式存储以降低稠密关键帧的内存及导出开销
+
+        Args:
+            time_offsets (`Sequence[int]` or `np.ndarray`): 各关键帧的时间偏移量, 单位为微秒
+            volumes (`Sequence[float]` or `np.ndarray`): 音量在各时间偏移量处的值
+
+        Raises:
+            `ValueError`: 关键帧数据非法
+        """
+        add_columnar_keyframes(self.common_keyframes, Keyframe_property.volume, time_offsets, volumes)
+        return self
+
     def export_json(self) -> Dict[str, Any]:
         json_dict = super().export_json()
         json_dict.update({
@@ -83,8 +83,8 @@ class Draft_folder:
 
         return Script_file.load_template(os.path.join(draft_path, "draft_info.json"))
 
-    def duplicate_as_template(self, template_name: str, new_draft_name: str, allow_replace: bool = False) -> Script_file:
-        """复制一份给定的草稿, 并在复制出的新草稿上进行编辑
+    def duplicate(self, template_name: str, new_draft_name: str, allow_replace: bool = False) -> str:
+        """复制一份给定的草稿, 但不打开它, 适用于随后会整体覆盖`draft_info.json`的场合
 
         Args:
             template_name (`str`): 原草稿名称
@@ -92,7 +92,7 @@ class Draft_folder:
             allow_replace (`bool`, optional): 是否允许覆盖与`new_draft_name`重名的草稿. 默认为否.
 
         Returns:
-            `Script_file`: 以模板模式打开的**复制后的**草稿对象
+            `str`: 新草稿文件夹的路径
 
         Raises:
             `FileNotFoundError`: 原始草稿不存在
@@ -107,6 +107,28 @@ class Draft_folder:
 
         # 复制草稿文件夹
         shutil.copytree(template_path, new_draft_path, dirs_exist_ok=allow_replace)
+        return new_draft_path
+
+    def duplicate_as_template(self, template_name: str, new_draft_name: str, allow_replace: bool = False) -> Script_file:
+        """复制一份给定的草稿, 并在复制出的新草稿上进行编辑
+
+        原草稿的`draft_info.json`未修改时, 其解析结果会被缓存并在多次复制间复用
+
+        Args:
+            template_name (`str`): 原草稿名称
+            new_draft_name (`str`): 新草稿名称
+            allow_replace (`bool`, optional): 是否允许覆盖与`new_draft_name`重名的草稿. 默认为否.
+
+        Returns:
+            `Script_file`: 以模板模式打开的**复制后的**草稿对象
+
+        Raises:
+            `FileNotFoundError`: 原始草稿不存在
+            `FileExistsError`: 已存在与`new_draft_name`重名的草稿, 但不允许覆盖.
+        """
+        new_draft_path = self.duplicate(template_name, new_draft_name, allow_replace)
 
-        # 打开草稿
-        return self.load_template(new_draft_name)
+        # 复制出的文件与原草稿内容相同, 故从原草稿加载以命中缓存, 保存时写入新草稿
+        script = self.load_template(template_name)
+        script.save_path = os.path.join(new_draft_path, "draft_info.json")
+        return script
@@ -1,11 +1,16 @@
 import uuid
+import bisect
+
+import numpy as np
 
 from enum import Enum
-from typing import Dict, List, Any
+from typing import Dict, List, Tuple, Optional, Sequence, Union, Any
 
 class Keyframe:
     """一个关键帧（关键点）, 目前只支持线性插值"""
 
+    __slots__ = ("kf_id", "time_offset", "values")
+
     kf_id: str
     """关键帧全局id, 自动生成"""
     time_offset: int
@@ -65,6 +70,8 @@ class Keyframe_property(Enum):
 class Keyframe_list:
     """关键帧列表, 记录与某个特定属性相关的一系列关键帧"""
 
+    __slots__ = ("list_id", "keyframe_property", "keyframes")
+
     list_id: str
     """关键帧列表全局id, 自动生成"""
     keyframe_property: Keyframe_property
@@ -82,8 +89,7 @@ class Keyframe_list:
     def add_keyframe(self, time_offset: int, value: float):
         """给定时间偏移量及关键值, 向此关键帧列表中添加一个关键帧"""
         keyframe = Keyframe(time_offset, value)
-        self.keyframes.append(keyframe)
-        self.keyframes.sort(key=lambda x: x.time_offset)
+        bisect.insort(self.keyframes, keyframe, key=lambda x: x.time_offset)
 
     def export_json(self) -> Dict[str, Any]:
         return {
@@ -92,3 +98,154 @@ class Keyframe_list:
             "material_id": "",
             "property_type": self.keyframe_property.value
         }
+
+KEYFRAME_VALUE_RANGES: Dict[Keyframe_property, Tuple[Optional[float], Optional[float]]] = {
+    Keyframe_property.scale_x: (0.0, None),
+    Keyframe_property.scale_y: (0.0, None),
+    Keyframe_property.uniform_scale: (0.0, None),
+    Keyframe_property.alpha: (0.0, 1.0),
+    Keyframe_property.saturation: (-1.0, 1.0),
+    Keyframe_property.contrast: (-1.0, 1.0),
+    Keyframe_property.brightness: (-1.0, 1.0),
+    Keyframe_property.volume: (0.0, None),
+}
+"""各关键帧属性的取值范围(闭区间), None表示该侧无限制, 未列出的属性不做范围检查"""
+
+class Columnar_keyframe_list:
+    """以列式数组存储的关键帧列表, 适合逐帧动画等稠密关键帧
+
+    接口与`Keyframe_list`兼容, 但时间偏移量与关键值分别存放在两个NumPy数组中,
+    每个关键帧只占用16字节; 关键帧id在导出时由列表id与序号派生, 不单独存储
+    """
+
+    __slots__ = ("list_id", "keyframe_property", "time_offsets", "values")
+
+    list_id: str
+    """关键帧列表全局id, 自动生成"""
+    keyframe_property: Keyframe_property
+    """关键帧对应的属性"""
+    time_offsets: np.ndarray
+    """按升序排列的时间偏移量, int64数组"""
+    values: np.ndarray
+    """与`time_offsets`一一对应的关键值, float64数组"""
+
+    def __init__(self, keyframe_property: Keyframe_property,
+                 time_offsets: Optional[Union[Sequence[int], np.ndarray]] = None,
+                 values: Optional[Union[Sequence[float], np.ndarray]] = None):
+        """为给定的关键帧属性初始化列式关键帧列表, 可同时传入初始的时间偏移量及关键值
+
+        Raises:
+            `ValueError`: 时间偏移量与关键值的数量不一致, 或存在非法的偏移量/关键值
+        """
+        self.list_id = uuid.uuid4().hex
+
+        self.keyframe_property = keyframe_property
+        self.time_offsets = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=np.float64)
+
+        if time_offsets is not None or values is not None:
+            self.add_keyframes(time_offsets if time_offsets is not None else [],
+                               values if values is not None else [])
+
+    @classmethod
+    def from_keyframe_list(cls, kf_list: Keyframe_list) -> "Columnar_keyframe_list":
+        """将普通关键帧列表转换为列式存储, 保留其列表id"""
+        ret = cls(kf_list.keyframe_property,
+                  [kf.time_offset for kf in kf_list.keyframes],
+                  [kf.values[0] for kf in kf_list.keyframes])
+        ret.list_id = kf_list.list_id
+        return ret
+
+    def __len__(self) -> int:
+        return len(self.time_offsets)
+
+    @property
+    def keyframes(self) -> List[Keyframe]:
+        """以`Keyframe`对象列表的形式返回关键帧的副本, 对其的修改不会写回本列表"""
+        return [Keyframe(offset, value) for offset, value in zip(self.time_offsets.tolist(), self.values.tolist())]
+
+    def validate(self, time_offsets: np.ndarray, values: np.ndarray) -> None:
+        """对一批关键帧做向量化检查: 偏移量非负, 关键值有限且落在`KEYFRAME_VALUE_RANGES`规定的范围内
+
+        Raises:
+            `ValueError`: 存在不满足条件的关键帧, 错误信息中给出第一个非法关键帧的下标
+        """
+        if time_offsets.shape != values.shape or time_offsets.ndim != 1:
+            raise ValueError(f"时间偏移量与关键值应为等长的一维数组, 实际形状为 {time_offsets.shape} 与 {values.shape}")
+
+        bad = np.flatnonzero(time_offsets < 0)
+        if bad.size:
+            raise ValueError(f"第{bad[0]}个关键帧的时间偏移量({time_offsets[bad[0]]})为负数")
+        bad = np.flatnonzero(~np.isfinite(values))
+        if bad.size:
+            raise ValueError(f"第{bad[0]}个关键帧的关键值({values[bad[0]]})不是有限数")
+
+        low, high = KEYFRAME_VALUE_RANGES.get(self.keyframe_property, (None, None))
+        mask = np.zeros(values.shape, dtype=bool)
+        if low is not None: mask |= values < low
+        if high is not None: mask |= values > high
+        bad = np.flatnonzero(mask)
+        if bad.size:
+            raise ValueError(f"第{bad[0]}个关键帧的关键值({values[bad[0]]})超出了{self.keyframe_property.name}的取值范围 [{low}, {high}]")
+
+    def add_keyframe(self, time_offset: int, value: float):
+        """给定时间偏移量及关键值, 向此关键帧列表中添加一个关键帧"""
+        self.add_keyframes([time_offset], [value])
+
+    def add_keyframes(self, time_offsets: Union[Sequence[int], np.ndarray], values: Union[Sequence[float], np.ndarray]):
+        """批量添加关键帧, 添加后整体按时间偏移量稳定排序
+
+        Raises:
+            `ValueError`: 时间偏移量与关键值的数量不一致, 或存在非法的偏移量/关键值
+        """
+        new_offsets = np.asarray(time_offsets, dtype=np.int64)
+        new_values = np.asarray(values, dtype=np.float64)
+        self.validate(new_offsets, new_values)
+
+        offsets = np.concatenate((self.time_offsets, new_offsets))
+        values = np.concatenate((self.values, new_values))
+        if offsets.size > 1 and np.any(offsets[1:] < offsets[:-1]):
+            order = np.argsort(offsets, kind="stable")
+            offsets, values = offsets[order], values[order]
+        self.time_offsets, self.values = offsets, values
+
+    def export_json(self) -> Dict[str, Any]:
+        id_prefix = self.list_id[:24]
+        return {
+            "id": self.list_id,
+            "keyframe_list": [
+                {
+                    "curveType": "Line",
+                    "graphID": "",
+                    "left_control": {"x": 0.0, "y": 0.0},
+                    "right_control": {"x": 0.0, "y": 0.0},
+                    "id": f"{id_prefix}{i:08x}",
+                    "time_offset": offset,
+                    "values": [value]
+                }
+                for i, (offset, value) in enumerate(zip(self.time_offsets.tolist(), self.values.tolist()))
+            ],
+            "material_id": "",
+            "property_type": self.keyframe_property.value
+        }
+
+def add_columnar_keyframes(kf_lists: List[Union[Keyframe_list, Columnar_keyframe_list]], _property: Keyframe_property,
+                           time_offsets: Union[Sequence[int], np.ndarray],
+                           values: Union[Sequence[float], np.ndarray]) -> Columnar_keyframe_list:
+    """向`kf_lists`中对应属性的关键帧列表批量添加关键帧, 必要时新建列表或将普通列表原地替换为列式存储
+
+    Returns:
+        `Columnar_keyframe_list`: 该属性对应的列式关键帧列表
+    """
+    for i, kf_list in enumerate(kf_lists):
+        if kf_list.keyframe_property != _property:
+            continue
+        if not isinstance(kf_list, Columnar_keyframe_list):
+            kf_list = Columnar_keyframe_list.from_keyframe_list(kf_list)
+            kf_lists[i] = kf_list
+        kf_list.add_keyframes(time_offsets, values)
+        return kf_list
+
+    kf_list = Columnar_keyframe_list(_property, time_offsets, values)
+    kf_lists.append(kf_list)
+    return kf_list
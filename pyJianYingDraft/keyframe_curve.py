@@ -0,0 +1,189 @@
+"""根据曲线描述批量生成关键帧
+
+支持具名缓动函数、CSS风格的三次贝塞尔缓动以及任意采样数组, 以向量化方式按给定采样率生成关键帧,
+并可用Ramer-Douglas-Peucker算法去除线性插值下冗余的关键帧
+"""
+
+import numpy as np
+
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .time_util import SEC
+
+Easing_function = Callable[[np.ndarray], np.ndarray]
+"""缓动函数, 将[0, 1]上的进度数组映射为插值比例数组"""
+
+EASING_FUNCTIONS: Dict[str, Easing_function] = {
+    "linear": lambda t: t,
+    "ease_in_quad": lambda t: t * t,
+    "ease_out_quad": lambda t: t * (2 - t),
+    "ease_in_out_quad": lambda t: np.where(t < 0.5, 2 * t * t, 1 - (-2 * t + 2) ** 2 / 2),
+    "ease_in_cubic": lambda t: t ** 3,
+    "ease_out_cubic": lambda t: 1 - (1 - t) ** 3,
+    "ease_in_out_cubic": lambda t: np.where(t < 0.5, 4 * t ** 3, 1 - (-2 * t + 2) ** 3 / 2),
+    "ease_in_sine": lambda t: 1 - np.cos(t * np.pi / 2),
+    "ease_out_sine": lambda t: np.sin(t * np.pi / 2),
+    "ease_in_out_sine": lambda t: (1 - np.cos(t * np.pi)) / 2,
+    "ease_in_expo": lambda t: np.where(t == 0, 0.0, 2.0 ** (10 * t - 10)),
+    "ease_out_expo": lambda t: np.where(t == 1, 1.0, 1 - 2.0 ** (-10 * t)),
+}
+"""内置的具名缓动函数"""
+
+def cubic_bezier_easing(x1: float, y1: float, x2: float, y2: float) -> Easing_function:
+    """构造与CSS `cubic-bezier(x1, y1, x2, y2)`等价的缓动函数
+
+    Raises:
+        `ValueError`: `x1`或`x2`不在[0, 1]范围内, 此时曲线不是时间的函数
+    """
+    if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+        raise ValueError(f"贝塞尔控制点的x坐标必须在[0, 1]范围内, 实际为 {x1}, {x2}")
+
+    def bezier(p1: float, p2: float, s: np.ndarray) -> np.ndarray:
+        return 3 * (1 - s) ** 2 * s * p1 + 3 * (1 - s) * s ** 2 * p2 + s ** 3
+
+    def easing(t: np.ndarray) -> np.ndarray:
+        # 对每个进度值求解x(s) = t, x(s)在[0, 1]上单调, 因此二分法必定收敛
+        low, high = np.zeros_like(t), np.ones_like(t)
+        for _ in range(40):
+            mid = (low + high) / 2
+            too_small = bezier(x1, x2, mid) < t
+            low = np.where(too_small, mid, low)
+            high = np.where(too_small, high, mid)
+        return bezier(y1, y2, (low + high) / 2)
+
+    return easing
+
+MAX_CURVE_SAMPLES = 200_000
+"""一条曲线最多生成的采样点数, 约为30fps下近两小时, 防止过大的采样率或时长耗尽内存"""
+
+def sample_times(start: int, duration: int, sample_rate: float) -> np.ndarray:
+    """在[start, start + duration]上按`sample_rate`(每秒采样数)生成采样时刻, 单位为微秒, 总是包含两个端点
+
+    Raises:
+        `ValueError`: 时长为负数, 采样率不为正数, 或采样点数超过`MAX_CURVE_SAMPLES`
+    """
+    if duration < 0:
+        raise ValueError(f"曲线时长不能为负数: {duration}")
+    if not sample_rate > 0:  # 同时排除NaN
+        raise ValueError(f"采样率必须为正数: {sample_rate}")
+    sample_count = duration * sample_rate / SEC + 2
+    if sample_count > MAX_CURVE_SAMPLES:
+        raise ValueError(f"采样点数 {sample_count:.0f} 超过上限 {MAX_CURVE_SAMPLES}, 请降低采样率(当前为每秒{sample_rate})")
+
+    times = np.round(np.arange(0, duration, SEC / sample_rate)).astype(np.int64)
+    times = np.append(times[times < duration], duration)
+    return start + times
+
+def sample_curve(start: int, duration: int, start_value: float, end_value: float, *,
+                 easing: Union[str, Easing_function, Sequence[float]] = "linear",
+                 sample_rate: float = 30.0) -> Tuple[np.ndarray, np.ndarray]:
+    """按缓动曲线在给定时间范围内生成关键帧
+
+    Args:
+        start (`int`): 曲线起始时刻, 单位为微秒
+        duration (`int`): 曲线时长, 单位为微秒
+        start_value (`float`): 起始时刻的值
+        end_value (`float`): 结束时刻的值
+        easing (`str`, `Easing_function` or `Sequence[float]`, optional): 缓动函数名(见`EASING_FUNCTIONS`),
+            缓动函数本身, 或贝塞尔控制点`[x1, y1, x2, y2]`. 默认为线性
+        sample_rate (`float`, optional): 每秒采样数, 默认为30
+
+    Returns:
+        `Tuple[np.ndarray, np.ndarray]`: 时间偏移量数组(微秒)与对应的值数组
+
+    Raises:
+        `ValueError`: 缓动函数名未知, 控制点数量不为4或参数非法
+    """
+    if isinstance(easing, str):
+        if easing not in EASING_FUNCTIONS:
+            raise ValueError(f"未知的缓动函数: {easing}, 可选值为 {', '.join(EASING_FUNCTIONS)}")
+        easing_func = EASING_FUNCTIONS[easing]
+    elif callable(easing):
+        easing_func = easing
+    else:
+        if len(easing) != 4:
+            raise ValueError(f"贝塞尔缓动需要4个控制点坐标, 实际为{len(easing)}个")
+        easing_func = cubic_bezier_easing(*easing)
+
+    times = sample_times(start, duration, sample_rate)
+    progress = (times - start) / duration if duration > 0 else np.ones(len(times))
+    values = start_value + (end_value - start_value) * np.asarray(easing_func(progress), dtype=np.float64)
+    return times, values
+
+def resample_values(start: int, duration: int, samples: Sequence[float], *,
+                    sample_rate: float = 30.0) -> Tuple[np.ndarray, np.ndarray]:
+    """将均匀分布在[start, start + duration]上的采样值按`sample_rate`线性重采样为关键帧
+
+    Raises:
+        `ValueError`: 采样值少于2个或参数非法
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.ndim != 1 or len(samples) < 2:
+        raise ValueError("采样数组至少需要包含2个值")
+
+    times = sample_times(start, duration, sample_rate)
+    source_times = np.linspace(start, start + duration, len(samples))
+    return times, np.interp(times, source_times, samples)
+
+def simplify_rdp(time_offsets: np.ndarray, values: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """用Ramer-Douglas-Peucker算法去除冗余关键帧
+
+    误差按线性插值下值的竖直偏差计算, 即保留的关键帧在剪映中线性插值后, 与原曲线在每个采样点处的差值都不超过`tolerance`
+
+    Args:
+        time_offsets (`np.ndarray`): 升序排列的时间偏移量
+        values (`np.ndarray`): 对应的值
+        tolerance (`float`): 允许的最大偏差, 单位与值相同
+
+    Returns:
+        `Tuple[np.ndarray, np.ndarray]`: 简化后的时间偏移量与值, 总是保留首尾两点
+    """
+    n = len(time_offsets)
+    if n <= 2:
+        return time_offsets, values
+
+    times = time_offsets.astype(np.float64)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        inner = slice(first + 1, last)
+        span = times[last] - times[first]
+        ratio = (times[inner] - times[first]) / span if span > 0 else np.zeros(last - first - 1)
+        error = np.abs(values[inner] - (values[first] + (values[last] - values[first]) * ratio))
+        index = int(np.argmax(error))
+        if error[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return time_offsets[keep], values[keep]
+
+def generate_keyframes(start: int, duration: int, *,
+                       start_value: Optional[float] = None, end_value: Optional[float] = None,
+                       easing: Union[str, Easing_function, Sequence[float]] = "linear",
+                       samples: Optional[Sequence[float]] = None,
+                       sample_rate: float = 30.0, tolerance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """根据曲线描述生成关键帧, 是`sample_curve`/`resample_values`与`simplify_rdp`的组合
+
+    提供`samples`时按采样数组重采样, 否则需要提供`start_value`与`end_value`并按`easing`插值;
+    `tolerance`不为None时对结果做RDP简化
+
+    Raises:
+        `ValueError`: 曲线描述不完整或参数非法
+    """
+    if samples is not None:
+        times, values = resample_values(start, duration, samples, sample_rate=sample_rate)
+    else:
+        if start_value is None or end_value is None:
+            raise ValueError("未提供采样数组时必须同时指定start_value与end_value")
+        times, values = sample_curve(start, duration, start_value, end_value, easing=easing, sample_rate=sample_rate)
+
+    if tolerance is not None:
+        times, values = simplify_rdp(times, values, tolerance)
+    return times, values
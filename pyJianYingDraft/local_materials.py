@@ -2,13 +2,19 @@ import os
 import uuid
 import subprocess
 import json
+import logging
 from typing import Optional, Literal
 from typing import Dict, Any
 import imageio.v2 as imageio
 
+logger = logging.getLogger('flask_video_generator')
+
 class Crop_settings:
     """素材的裁剪设置, 各属性均在0-1之间, 注意素材的坐标原点在左上角"""
 
+    __slots__ = ("upper_left_x", "upper_left_y", "upper_right_x", "upper_right_y", "lower_left_x",
+                 "lower_left_y", "lower_right_x", "lower_right_y")
+
     upper_left_x: float
     upper_left_y: float
     upper_right_x: float
@@ -281,7 +287,7 @@ class Audio_material:
     """替换路径, 如果设置了这个值, 在导出json时会用这个路径替代原始path"""
 
     has_audio_effect: bool = False
-    """是否有音频效果"""
+    """是否有音频效果, 引用此素材的片段添加音效时无需设置, 导出草稿时会自动标记"""
 
     duration: int
     """素材时长, 单位为微秒"""
@@ -365,7 +371,7 @@ class Audio_material:
                 video_json_str = video_result_str[video_json_start:]
                 video_info = json.loads(video_json_str)
             else:
-                print(f"无法在输出中找到JSON数据: {video_result_str}")
+                logger.warning(f"无法在输出中找到JSON数据: {video_result_str}")
             
             if 'streams' in video_info and len(video_info['streams']) > 0:
                 raise ValueError("音频素材不应包含视频轨道")
@@ -1,21 +1,75 @@
-"""记录各种特效/音效/滤镜等的元数据"""
+"""记录各种特效/音效/滤镜等的元数据
+
+除`Effect_meta`等基础类型外, 各元数据枚举均在首次访问时才加载其所在模块,
+以免在启动时就构造出数以千计的元数据对象. 加载时优先使用`build_catalog`预编译的JSON目录文件,
+见`catalog.load_module`
+"""
+
+from typing import TYPE_CHECKING, Any, List
 
 from .effect_meta import Effect_meta, Effect_param_instance
+from .effect_meta import Mask_meta
+
+_LAZY_ATTRS = {
+    "Font_type": "font_meta",
+    "Mask_type": "mask_meta",
+    "CapCut_Mask_type": "capcut_mask_meta",
+    "Filter_type": "filter_meta",
+    "Transition_type": "transition_meta",
+    "CapCut_Transition_type": "capcut_transition_meta",
+    "Intro_type": "animation_meta",
+    "Outro_type": "animation_meta",
+    "Group_animation_type": "animation_meta",
+    "CapCut_Intro_type": "capcut_animation_meta",
+    "CapCut_Outro_type": "capcut_animation_meta",
+    "CapCut_Group_animation_type": "capcut_animation_meta",
+    "Text_intro": "animation_meta",
+    "Text_outro": "animation_meta",
+    "Text_loop_anim": "animation_meta",
+    "CapCut_Text_intro": "capcut_text_animation_meta",
+    "CapCut_Text_outro": "capcut_text_animation_meta",
+    "CapCut_Text_loop_anim": "capcut_text_animation_meta",
+    "Audio_scene_effect_type": "audio_effect_meta",
+    "Tone_effect_type": "audio_effect_meta",
+    "Speech_to_song_type": "audio_effect_meta",
+    "CapCut_Voice_filters_effect_type": "capcut_audio_effect_meta",
+    "CapCut_Voice_characters_effect_type": "capcut_audio_effect_meta",
+    "CapCut_Speech_to_song_effect_type": "capcut_audio_effect_meta",
+    "Video_scene_effect_type": "video_effect_meta",
+    "Video_character_effect_type": "video_effect_meta",
+    "CapCut_Video_scene_effect_type": "capcut_effect_meta",
+    "CapCut_Video_character_effect_type": "capcut_effect_meta"
+}
+"""延迟导入的属性名及其所在的子模块"""
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from .catalog import load_module
+    value = getattr(load_module(module_name), name)
+    globals()[name] = value  # 之后的访问不再经过__getattr__
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
-from .font_meta import Font_type
-from .mask_meta import Mask_type, Mask_meta
-from .capcut_mask_meta import CapCut_Mask_type
-from .filter_meta import Filter_type
-from .transition_meta import Transition_type
-from .capcut_transition_meta import CapCut_Transition_type
-from .animation_meta import Intro_type, Outro_type, Group_animation_type
-from .capcut_animation_meta import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
-from .animation_meta import Text_intro, Text_outro, Text_loop_anim
-from .capcut_text_animation_meta import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
-from .audio_effect_meta import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
-from .capcut_audio_effect_meta import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
-from .video_effect_meta import Video_scene_effect_type, Video_character_effect_type
-from .capcut_effect_meta import CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type
+if TYPE_CHECKING:
+    from .font_meta import Font_type
+    from .mask_meta import Mask_type
+    from .capcut_mask_meta import CapCut_Mask_type
+    from .filter_meta import Filter_type
+    from .transition_meta import Transition_type
+    from .capcut_transition_meta import CapCut_Transition_type
+    from .animation_meta import Intro_type, Outro_type, Group_animation_type
+    from .capcut_animation_meta import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
+    from .animation_meta import Text_intro, Text_outro, Text_loop_anim
+    from .capcut_text_animation_meta import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
+    from .audio_effect_meta import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .capcut_audio_effect_meta import CapCut_Voice_filters_effect_type, CapCut_Voice_characters_effect_type, CapCut_Speech_to_song_effect_type
+    from .video_effect_meta import Video_scene_effect_type, Video_character_effect_type
+    from .capcut_effect_meta import CapCut_Video_scene_effect_type, CapCut_Video_character_effect_type
 
 __all__ = [
     "Effect_meta",
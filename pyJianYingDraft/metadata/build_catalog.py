@@ -0,0 +1,104 @@
+"""将生成的元数据模块编译为紧凑的JSON目录文件, 供`catalog.load_module`加载
+
+元数据模块有改动时需重新运行:
+
+    python -m pyJianYingDraft.metadata.build_catalog
+
+使用`--check`参数时只检查目录文件是否与源代码一致, 不一致则以非零状态码退出.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import importlib.util
+
+from enum import Enum
+from typing import Any, Dict, List
+
+from . import _LAZY_ATTRS
+from .effect_meta import Effect_param
+from .catalog import CATALOG_DIR, META_CLASSES, catalog_path, source_path
+
+CATALOG_MODULES: List[str] = sorted(set(_LAZY_ATTRS.values()))
+"""需要编译的元数据模块"""
+
+def _exec_source(module: str) -> Any:
+    """从源文件执行元数据模块, 不登记到`sys.modules`, 以免与已加载的目录文件混淆"""
+    spec = importlib.util.spec_from_file_location(f"{__package__}.{module}", source_path(module))
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, list) and all(isinstance(v, Effect_param) for v in value):
+        return [[v.name, v.default_value, v.min_value, v.max_value] for v in value]
+    return value
+
+def compile_module(module: str) -> str:
+    """将元数据模块编译为目录文件的内容"""
+    with open(source_path(module), "rb") as f:
+        source = f.read()
+    mod = _exec_source(module)
+
+    enums: Dict[str, Any] = {}
+    for name, obj in vars(mod).items():
+        if not (isinstance(obj, type) and issubclass(obj, Enum) and obj.__module__ == mod.__name__):
+            continue
+
+        metas = [member.value for member in obj]
+        meta_class = type(metas[0]) if metas else None
+        for meta in metas:
+            if type(meta) is not meta_class or META_CLASSES.get(meta_class.__name__) is not meta_class:
+                raise TypeError(f"Unsupported metadata type {type(meta)!r} in {module}.{name}")
+        fields = list(vars(metas[0])) if metas else []
+
+        enums[name] = {
+            "doc": obj.__dict__.get("__doc__"),
+            "meta": meta_class.__name__ if meta_class else None,
+            "fields": fields,
+            "members": [[member_name, [_encode_value(getattr(member.value, field)) for field in fields]]
+                        for member_name, member in obj.__members__.items()]
+        }
+
+    catalog = {
+        "source_size": len(source),
+        "source_sha1": hashlib.sha1(source).hexdigest(),
+        "doc": mod.__doc__,
+        "enums": enums
+    }
+    return json.dumps(catalog, ensure_ascii=False, separators=(",", ":"))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="将元数据模块编译为JSON目录文件")
+    parser.add_argument("--check", action="store_true", help="只检查目录文件是否为最新")
+    args = parser.parse_args()
+
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    stale: List[str] = []
+    for module in CATALOG_MODULES:
+        content = compile_module(module)
+        path = catalog_path(module)
+        if args.check:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    up_to_date = f.read() == content
+            except OSError:
+                up_to_date = False
+            if not up_to_date:
+                stale.append(module)
+            continue
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        print(f"{module}: {len(content.encode('utf-8'))} bytes -> {os.path.relpath(path)}")
+
+    if stale:
+        print("Outdated catalogs: " + ", ".join(stale), file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
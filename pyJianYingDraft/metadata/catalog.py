@@ -0,0 +1,106 @@
+"""从预编译的JSON目录文件中加载元数据枚举
+
+生成的元数据模块(如`video_effect_meta`)体积庞大, 在没有`.pyc`缓存的环境(如无服务器部署的冷启动)中,
+每次都需要重新解析并编译其源代码. 目录文件由`build_catalog`生成, 仅保存各枚举成员的属性值,
+加载时直接构造元数据对象而不经过源代码. 若目录文件缺失或与源文件不一致, 则回退到导入原始模块.
+"""
+
+import os
+import sys
+import json
+import types
+import hashlib
+import importlib
+import threading
+
+from typing import Any, Dict, List, Optional, Type
+
+from .effect_meta import Effect_enum, Effect_meta, Effect_param
+from .effect_meta import Animation_meta, Transition_meta, Mask_meta
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+"""目录文件所在的文件夹"""
+
+META_CLASSES: Dict[str, type] = {cls.__name__: cls for cls in (Effect_meta, Animation_meta, Transition_meta, Mask_meta)}
+"""目录文件中可能出现的元数据类型"""
+
+_load_lock = threading.Lock()
+
+def catalog_path(module: str) -> str:
+    """元数据模块对应的目录文件路径"""
+    return os.path.join(CATALOG_DIR, module + ".json")
+
+def source_path(module: str) -> str:
+    """元数据模块的源文件路径"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), module + ".py")
+
+def read_catalog(module: str) -> Optional[Dict[str, Any]]:
+    """读取元数据模块的目录文件, 文件不存在或已过期时返回None
+
+    源文件大小与记录不一致即视为过期; 源文件比目录文件更新时, 再比较源文件的SHA-1, 以发现大小不变的修改
+    """
+    try:
+        with open(catalog_path(module), "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+            catalog_mtime = os.fstat(f.fileno()).st_mtime_ns
+    except (OSError, ValueError):
+        return None
+
+    try:
+        source_stat = os.stat(source_path(module))
+    except OSError:
+        return catalog  # 只部署了目录文件而没有源文件
+    if source_stat.st_size != catalog["source_size"]:
+        return None
+    if source_stat.st_mtime_ns > catalog_mtime:
+        try:
+            with open(source_path(module), "rb") as f:
+                if hashlib.sha1(f.read()).hexdigest() != catalog["source_sha1"]:
+                    return None
+        except OSError:
+            return None
+    return catalog
+
+def materialize(meta_class: type, fields: List[str], values: List[Any]) -> Any:
+    """根据目录文件中记录的属性值构造元数据对象, 不经过其`__init__`(避免重复换算时长等属性)"""
+    meta = meta_class.__new__(meta_class)
+    attrs = dict(zip(fields, values))
+    if "params" in attrs:
+        attrs["params"] = [Effect_param(*param) for param in attrs["params"]]
+    meta.__dict__.update(attrs)
+    return meta
+
+def load_module(module: str) -> types.ModuleType:
+    """加载指定的元数据模块(如"video_effect_meta"), 优先使用目录文件
+
+    由目录文件构造的模块会登记到`sys.modules`中, 因此之后直接导入该子模块得到的是同一批枚举类.
+    若该模块此前已从源代码导入, 则直接返回已导入的模块.
+    """
+    full_name = f"{__package__}.{module}"
+    with _load_lock:
+        loaded = sys.modules.get(full_name)
+        if loaded is not None:
+            return loaded
+
+        catalog = read_catalog(module)
+        if catalog is None:
+            return importlib.import_module(full_name)
+
+        mod = types.ModuleType(full_name, catalog["doc"])
+        mod.__file__ = catalog_path(module)
+        mod.__package__ = __package__
+        mod.Effect_enum = Effect_enum
+        mod.Effect_param = Effect_param
+        for meta_name, meta_class in META_CLASSES.items():
+            setattr(mod, meta_name, meta_class)
+
+        for enum_name, spec in catalog["enums"].items():
+            meta_class = META_CLASSES[spec["meta"]] if spec["meta"] else Effect_meta
+            members = [(name, materialize(meta_class, spec["fields"], values)) for name, values in spec["members"]]
+            enum_class: Type[Effect_enum] = Effect_enum(enum_name, members, module=full_name, qualname=enum_name)
+            enum_class.__doc__ = spec["doc"]
+            setattr(mod, enum_name, enum_class)
+
+        sys.modules[full_name] = mod
+        setattr(sys.modules[__package__], module, mod)
+        return mod
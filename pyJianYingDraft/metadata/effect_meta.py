@@ -1,7 +1,7 @@
 from enum import Enum
 
 from typing import List, Dict, Any
-from typing import TypeVar, Optional
+from typing import TypeVar, Optional, Tuple
 
 class Effect_param:
     """特效参数信息"""
@@ -86,11 +86,106 @@ class Effect_meta:
             ret.append(Effect_param_instance(param, i, val))
         return ret
 
+class Animation_meta:
+    title: str
+    is_vip: bool
+    duration: int
+    """效果默认时长, 单位为微秒"""
+
+    resource_id: str
+    effect_id: str
+    md5: str
+
+    def __init__(self, title: str, is_vip: bool, duration: float, resource_id: str, effect_id: str, md5: str):
+        self.title = title
+        self.is_vip = is_vip
+        self.duration = int(round(duration * 1e6))
+        self.resource_id = resource_id
+        self.effect_id = effect_id
+        self.md5 = md5
+
+class Transition_meta:
+    """转场元数据"""
+
+    name: str
+    """转场名称"""
+    is_vip: bool
+    """是否为VIP特权"""
+
+    resource_id: str
+    """资源ID"""
+    effect_id: str
+    """效果ID"""
+    md5: str
+
+    default_duration: int
+    """默认持续时间, 单位为微秒"""
+    is_overlap: bool
+    """是否允许重叠(?)"""
+
+    def __init__(self, name: str, is_vip: bool, resource_id: str, effect_id: str, md5: str, default_duration: float, is_overlap: bool):
+        self.name = name
+        self.is_vip = is_vip
+        self.resource_id = resource_id
+        self.effect_id = effect_id
+        self.md5 = md5
+
+        self.default_duration = int(round(default_duration * 1e6))
+        self.is_overlap = is_overlap
+
+class Mask_meta:
+    """蒙版元数据"""
+
+    name: str
+    """转场名称"""
+
+    resource_type: str
+    """资源类型, 与蒙版形状相关"""
+
+    resource_id: str
+    """资源ID"""
+    effect_id: str
+    """效果ID"""
+    md5: str
+
+    default_aspect_ratio: float
+    """默认宽高比(宽高都是相对素材的比例)"""
+
+    def __init__(self, name: str, resource_type: str, resource_id: str, effect_id: str, md5: str, default_aspect_ratio: float):
+        self.name = name
+        self.resource_type = resource_type
+        self.resource_id = resource_id
+        self.effect_id = effect_id
+        self.md5 = md5
+
+        self.default_aspect_ratio = default_aspect_ratio
 
 Effect_enum_subclass = TypeVar("Effect_enum_subclass", bound="Effect_enum")
 
+def _normalize_name(name: str) -> str:
+    """`from_name`所用的名称规范化: 忽略大小写、空格和下划线"""
+    return name.lower().replace(" ", "").replace("_", "")
+
+_lookup_indexes: Dict[Tuple[type, str], Dict[str, Any]] = {}
+"""各特效枚举的查找索引, 键为(枚举类, 索引类型), 在首次查找时构建"""
+
 class Effect_enum(Enum):
-    """特效枚举基类, 提供一个`from_name`方法用于根据名称获取特效元数据"""
+    """特效枚举基类, 提供`from_name`、`from_resource_id`及`from_effect_id`方法用于查找特效元数据"""
+
+    @classmethod
+    def _lookup_index(cls, key: str) -> Dict[str, Any]:
+        """获取(必要时构建)指定类型的查找索引, 同一键值对应多个成员时保留最先定义的成员"""
+        index = _lookup_indexes.get((cls, key))
+        if index is None:
+            index = {}
+            for effect in cls:
+                if key == "name":
+                    value = _normalize_name(effect.name)
+                else:
+                    value = getattr(effect.value, key)
+                index.setdefault(value, effect)
+            _lookup_indexes[(cls, key)] = index
+        return index
 
     @classmethod
     def from_name(cls: "type[Effect_enum_subclass]", name: str) -> Effect_enum_subclass:
@@ -102,8 +197,32 @@ class Effect_enum(Enum):
         Raises:
             `ValueError`: 特效名称不存在
         """
-        name = name.lower().replace(" ", "").replace("_", "")
-        for effect in cls:
-            if effect.name.lower().replace(" ", "").replace("_", "") == name:
-                return effect
-        raise ValueError(f"Effect named '{name}' not found")
+        name = _normalize_name(name)
+        effect = cls._lookup_index("name").get(name)
+        if effect is None:
+            raise ValueError(f"Effect named '{name}' not found")
+        return effect
+
+    @classmethod
+    def from_resource_id(cls: "type[Effect_enum_subclass]", resource_id: str) -> Effect_enum_subclass:
+        """根据资源ID获取特效元数据
+
+        Raises:
+            `ValueError`: 资源ID不存在
+        """
+        effect = cls._lookup_index("resource_id").get(resource_id)
+        if effect is None:
+            raise ValueError(f"Effect with resource_id '{resource_id}' not found")
+        return effect
+
+    @classmethod
+    def from_effect_id(cls: "type[Effect_enum_subclass]", effect_id: str) -> Effect_enum_subclass:
+        """根据效果ID获取特效元数据
+
+        Raises:
+            `ValueError`: 效果ID不存在
+        """
+        effect = cls._lookup_index("effect_id").get(effect_id)
+        if effect is None:
+            raise ValueError(f"Effect with effect_id '{effect_id}' not found")
+        return effect
@@ -1,26 +1,31 @@
+import io
 import os
 import json
 import math
-from copy import deepcopy
+import uuid
+from copy import copy, deepcopy
 
-from typing import Optional, Literal, Union, overload
-from typing import Type, Dict, List, Any
+from typing import TYPE_CHECKING, Optional, Literal, Union, overload
+from typing import Type, Dict, List, Tuple, Iterable, Any
 
 
 from . import util
 from . import exceptions
 from .template_mode import ImportedTrack, EditableTrack, ImportedMediaTrack, ImportedTextTrack, Shrink_mode, Extend_mode, import_track
-from .time_util import Timerange, tim, srt_tstamp
+from .template_mode import Material_index
+from .time_util import Timerange, tim
+from .subtitle import iter_subtitle_cues
 from .local_materials import Video_material, Audio_material
 from .segment import Base_segment, Speed, Clip_settings
 from .audio_segment import Audio_segment, Audio_fade, Audio_effect
 from .video_segment import Video_segment, Sticker_segment, Segment_animations, Video_effect, Transition, Filter, BackgroundFilling
 from .effect_segment import Effect_segment, Filter_segment
-from .text_segment import Text_segment, Text_style, TextBubble, Text_border, Text_background, TextEffect
+from .text_segment import Text_segment, Text_style, TextBubble, Text_border, Text_background, TextEffect, Interned_style
 from .track import Track_type, Base_track, Track
 
 from settings.local import IS_CAPCUT_ENV
-from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type, Font_type
+if TYPE_CHECKING:
+    from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
 
 class Script_material:
     """草稿文件中的素材信息部分"""
@@ -31,8 +36,8 @@ class Script_material:
     """视频素材列表"""
     stickers: List[Dict[str, Any]]
     """贴纸素材列表"""
-    texts: List[Dict[str, Any]]
-    """文本素材列表"""
+    texts: List[Union[Text_segment, Dict[str, Any]]]
+    """文本素材列表, 文本片段的素材在导出时由片段生成(见`Text_segment.export_material`)"""
 
     audio_effects: List[Audio_effect]
     """音频特效列表"""
@@ -99,6 +104,7 @@ class Script_material:
             raise TypeError("Invalid argument type '%s'" % type(item))
 
     def export_json(self) -> Dict[str, List[Any]]:
+        # 所有列表均为新建, 导出时会向其中合并导入的素材
         result = {
             "ai_translates": [],
             "audio_balances": [],
@@ -133,10 +139,10 @@ class Script_material:
             "smart_relights": [],
             "sound_channel_mappings": [],
             "speeds": [spd.export_json() for spd in self.speeds],
-            "stickers": self.stickers,
+            "stickers": list(self.stickers),
             "tail_leaders": [],
             "text_templates": [],
-            "texts": self.texts,
+            "texts": [text.export_material() if isinstance(text, Text_segment) else text for text in self.texts],
             "time_marks": [],
             "transitions": [transition.export_json() for transition in self.transitions],
             "video_effects": [effect.export_json() for effect in self.video_effects],
@@ -148,9 +154,9 @@ class Script_material:
 
         # 根据IS_CAPCUT_ENV决定使用common_mask还是masks
         if IS_CAPCUT_ENV:
-            result["common_mask"] = self.masks
+            result["common_mask"] = list(self.masks)
         else:
-            result["masks"] = self.masks
+            result["masks"] = list(self.masks)
             
         return result
 
@@ -178,6 +184,8 @@ class Script_file:
 
     imported_materials: Dict[str, List[Dict[str, Any]]]
     """导入的素材信息"""
+    material_index: Material_index
+    """导入素材的id及名称索引, 修改`imported_materials`时应通过它进行"""
     imported_tracks: List[Track]
     """导入的轨道信息"""
 
@@ -202,10 +210,11 @@ class Script_file:
         self.tracks = {}
 
         self.imported_materials = {}
+        self.material_index = Material_index(self.imported_materials)
         self.imported_tracks = []
 
-        with open(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE), "r", encoding="utf-8") as f:
-            self.content = json.load(f)
+        # 导出时只替换顶层字段, 故复制顶层即可与缓存的解析结果隔离
+        self.content = dict(util.load_json_cached(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE)))
 
     @staticmethod
     def load_template(json_path: str) -> "Script_file":
@@ -221,17 +230,39 @@ class Script_file:
         obj.save_path = json_path
         if not os.path.exists(json_path):
             raise FileNotFoundError("JSON文件 '%s' 不存在" % json_path)
-        with open(json_path, "r", encoding="utf-8") as f:
-            obj.content = json.load(f)
+        # 同一模板文件未修改时复用其解析结果, 素材数据写时复制, 轨道与片段的原始数据只读, 见`template_mode.Raw_json_owner`
+        obj.content = dict(util.load_json_cached(json_path))
 
         util.assign_attr_with_json(obj, ["fps", "duration"], obj.content)
         util.assign_attr_with_json(obj, ["width", "height"], obj.content["canvas_config"])
 
-        obj.imported_materials = deepcopy(obj.content["materials"])
-        obj.imported_tracks = [import_track(track_data, obj.imported_materials) for track_data in obj.content["tracks"]]
+        # 素材列表为本草稿独有, 其中的素材数据与解析结果共享, 修改前由`_writable_imported_material`复制
+        obj.imported_materials = {material_type: list(material_list) if isinstance(material_list, list) else material_list
+                                  for material_type, material_list in obj.content["materials"].items()}
+        obj.material_index = Material_index(obj.imported_materials)
+        obj.imported_tracks = [import_track(track_data, obj.imported_materials, obj.material_index)
+                               for track_data in obj.content["tracks"]]
 
         return obj
 
+    def new_variant(self) -> "Script_file":
+        """以当前草稿为模板创建一个变体, 用于由同一模板批量生成仅文字与素材不同的草稿
+
+        变体与当前草稿共享轨道及素材数据, 仅复制素材列表与草稿内容的顶层, 因而创建开销与模板大小基本无关.
+        变体上只应调用`replace_text`与`replace_material_by_name`等仅修改导入素材的方法,
+        修改轨道或片段会同时影响当前草稿及其他变体
+
+        Returns:
+            `Script_file`: 未设置保存路径的变体, 需通过`dump`保存
+        """
+        variant = copy(self)
+        variant.save_path = None
+        variant.content = dict(self.content)
+        variant.imported_materials = {material_type: list(material_list) if isinstance(material_list, list) else material_list
+                                      for material_type, material_list in self.imported_materials.items()}
+        variant.material_index = self.material_index.copy_for(variant.imported_materials)
+        return variant
+
     def add_material(self, material: Union[Video_material, Audio_material]) -> "Script_file":
         """向草稿文件中添加一个素材"""
         if material in self.materials:  # 素材已存在
@@ -399,8 +430,8 @@ class Script_file:
             # 花字效果
             if segment.effect is not None:
                 self.materials.filters.append(segment.effect)
-            # 字体样式
-            self.materials.texts.append(segment.export_material())
+            # 字体样式, 素材在导出时生成
+            self.materials.texts.append(segment)
 
         # 添加片段素材
         if isinstance(segment, (Video_segment, Audio_segment)):
@@ -408,7 +439,84 @@ class Script_file:
 
         return self
 
-    def add_effect(self, effect: Union[Video_scene_effect_type, Video_character_effect_type],
+    def add_segments(self, segments: List[Union[Video_segment, Sticker_segment, Audio_segment, Text_segment, Effect_segment, Filter_segment]],
+                     track_name: Optional[str] = None) -> "Script_file":
+        """向指定轨道中批量添加同类型的片段, 结果等同于按起始时间依次调用`add_segment`(特效/滤镜片段则对应`add_effect`/`add_filter`)
+
+        轨道只查找一次, 重叠检查在全部片段上只进行一次(见`Track.add_segments`), 素材去重使用集合而非逐个遍历素材列表,
+        适合一次性构建包含大量片段的轨道. 任一片段不合法时不会添加任何片段.
+
+        Args:
+            segments (`List[Video_segment | Sticker_segment | Audio_segment | Text_segment | Effect_segment | Filter_segment]`): 要添加的片段, 类型须相同, 无需预先排序
+            track_name (`str`, optional): 添加到的轨道名称. 当此类型的轨道仅有一条时可省略.
+
+        Raises:
+            `NameError`: 未找到指定名称的轨道, 或必须提供`track_name`参数时未提供
+            `TypeError`: 片段类型不匹配轨道类型
+            `SegmentOverlap`: 新片段之间或新片段与已有片段重叠
+        """
+        if not segments:
+            return self
+        target = self._get_track_and_imported_track(type(segments[0]), track_name)[0]
+
+        # 加入轨道并更新时长
+        target.add_segments(segments)
+        self.duration = max(self.duration, max(segment.end for segment in segments))
+
+        # 各素材列表中已有的ID, 首次用到时收集
+        known_ids: Dict[int, set] = {}
+        def append_unique(materials: List[Any], item: Any, id_attr: str) -> None:
+            ids = known_ids.get(id(materials))
+            if ids is None:
+                ids = known_ids[id(materials)] = {getattr(existing, id_attr, None) for existing in materials}
+            item_id = getattr(item, id_attr)
+            if item_id not in ids:
+                ids.add(item_id)
+                materials.append(item)
+
+        # 自动添加相关素材, 规则与`add_segment`一致
+        for segment in sorted(segments, key=lambda seg: seg.start):
+            if isinstance(segment, Video_segment):
+                if segment.animations_instance is not None:
+                    append_unique(self.materials.animations, segment.animations_instance, "animation_id")
+                for effect in segment.effects:
+                    append_unique(self.materials.video_effects, effect, "global_id")
+                for filter_ in segment.filters:
+                    append_unique(self.materials.filters, filter_, "global_id")
+                if segment.mask is not None:
+                    self.materials.masks.append(segment.mask.export_json())
+                if segment.transition is not None:
+                    append_unique(self.materials.transitions, segment.transition, "global_id")
+                if segment.background_filling is not None:
+                    self.materials.canvases.append(segment.background_filling)
+                self.materials.speeds.append(segment.speed)
+                append_unique(self.materials.videos, segment.material_instance, "material_id")
+            elif isinstance(segment, Sticker_segment):
+                self.materials.stickers.append(segment.export_material())
+            elif isinstance(segment, Audio_segment):
+                if segment.fade is not None:
+                    append_unique(self.materials.audio_fades, segment.fade, "fade_id")
+                for effect in segment.effects:
+                    append_unique(self.materials.audio_effects, effect, "effect_id")
+                self.materials.speeds.append(segment.speed)
+                append_unique(self.materials.audios, segment.material_instance, "material_id")
+            elif isinstance(segment, Text_segment):
+                if segment.animations_instance is not None:
+                    append_unique(self.materials.animations, segment.animations_instance, "animation_id")
+                # 多个片段共用的气泡/花字只添加一次
+                if segment.bubble is not None:
+                    append_unique(self.materials.filters, segment.bubble, "global_id")
+                if segment.effect is not None:
+                    append_unique(self.materials.filters, segment.effect, "global_id")
+                self.materials.texts.append(segment)
+            elif isinstance(segment, Effect_segment):
+                append_unique(self.materials.video_effects, segment.effect_inst, "global_id")
+            elif isinstance(segment, Filter_segment):
+                self.materials.filters.append(segment.material)
+
+        return self
+
+    def add_effect(self, effect: "Union[Video_scene_effect_type, Video_character_effect_type]",
                    t_range: Timerange, track_name: Optional[str] = None, *,
                    params: Optional[List[Optional[float]]] = None) -> "Script_file":
         """向指定的特效轨道中添加一个特效片段
@@ -437,7 +545,7 @@ class Script_file:
             self.materials.video_effects.append(segment.effect_inst)
         return self
 
-    def add_filter(self, filter_meta: Filter_type, t_range: Timerange,
+    def add_filter(self, filter_meta: "Filter_type", t_range: Timerange,
                    track_name: Optional[str] = None, intensity: float = 100.0) -> "Script_file":
         """向指定的滤镜轨道中添加一个滤镜片段
 
@@ -473,12 +581,16 @@ class Script_file:
                    background: Optional[Text_background] = None,
                    bubble: Optional[TextBubble] = None,
                    effect: Optional[TextEffect] = None) -> "Script_file":
-        """从SRT文件中导入字幕, 支持传入一个`Text_segment`作为样式参考
+        """从SRT或WebVTT文件中导入字幕, 支持传入一个`Text_segment`作为样式参考
+
+        字幕逐条流式解析(见`subtitle.iter_subtitle_cues`), 所有片段共用同一组只读的样式对象, 但各自拥有独立的`clip_settings`,
+        最后通过`add_segments`一次性加入轨道.
+        任一字幕与已有片段或其他字幕重叠时不会导入任何字幕.
 
         注意: 默认不会使用参考片段的`clip_settings`属性, 若需要请显式为此函数传入`clip_settings=None`
 
         Args:
-            srt_content (`str`): SRT字幕内容或本地文件路径
+            srt_content (`str`): SRT/WebVTT字幕内容或本地文件路径, 以`WEBVTT`开头时按WebVTT解析
             track_name (`str`): 导入到的文本轨道名称, 若不存在则自动创建
             style_reference (`Text_segment`, optional): 作为样式参考的文本片段, 若提供则使用其样式.
             font (`Optional[str]`, optional): 字体, 默认为None.
@@ -493,11 +605,15 @@ class Script_file:
         Raises:
             `NameError`: 已存在同名轨道
             `TypeError`: 轨道类型不匹配
+            `ValueError`: 字幕格式不正确
+            `SegmentOverlap`: 字幕之间或字幕与已有片段重叠
         """
         if style_reference is None and clip_settings is None:
             raise ValueError("未提供样式参考时请提供`clip_settings`参数")
 
+        font_type = None
         if font:
+            from .metadata import Font_type
             try:
                 font_type = getattr(Font_type, font)
             except:
@@ -510,93 +626,62 @@ class Script_file:
         if not track_exists:
             self.add_track(Track_type.text, track_name, relative_index=999)  # 在所有文本轨道的最上层
 
-        # 检查是否为本地文件路径
-        if os.path.exists(srt_content):
-            with open(srt_content, "r", encoding="utf-8-sig") as srt_file:
-                lines = srt_file.readlines()
+        if self.width < self.height:  # 竖屏
+            fixed_width = int(1080 * 0.6)
+        else:  # 横屏
+            fixed_width = int(1920 * 0.7)
+
+        # 各片段共用的样式对象只创建一次, 并与其他草稿中取值相同的样式共用同一实例;
+        # 图像调节设置可被单独修改, 因此每个片段复制一份
+        def __interned(style_obj: Optional[Interned_style]) -> Optional[Interned_style]:
+            return deepcopy(style_obj).intern() if style_obj is not None else None
+
+        if style_reference:
+            shared_styles = {
+                "style": __interned(style_reference.style),
+                "border": __interned(border if border else style_reference.border),
+                "background": __interned(background if background else style_reference.background),
+            }
+            segment_font = font_type.value if font_type else deepcopy(style_reference.font)
         else:
-            # 直接将内容按行分割
-            lines = srt_content.splitlines()
-
-        def __add_text_segment(text: str, t_range: Timerange) -> None:
-            fixed_width = -1
-            if self.width < self.height:  # 竖屏
-                fixed_width = int(1080 * 0.6)
-            else:  # 横屏
-                fixed_width = int(1920 * 0.7)
-            
+            shared_styles = {"style": __interned(text_style),
+                             "border": __interned(border), "background": __interned(background)}
+        clip_template = clip_settings if clip_settings is not None else style_reference.clip_settings
+
+        def __make_text_segment(text: str, t_range: Timerange) -> Text_segment:
+            seg = Text_segment(text, t_range, **shared_styles, clip_settings=copy(clip_template), fixed_width=fixed_width)
             if style_reference:
-                seg = Text_segment.create_from_template(text, t_range, style_reference)
-                if clip_settings is not None:
-                    seg.clip_settings = deepcopy(clip_settings)
-                # 复制其他可选属性
-                if border:
-                    seg.border = deepcopy(border)
-                if background:
-                    seg.background = deepcopy(background)
-                if bubble:
-                    seg.bubble = deepcopy(bubble)
-                if effect:
-                    seg.effect = deepcopy(effect)
-                # 设置固定宽高
-                seg.fixed_width = fixed_width
-                # 设置字体
-                if font_type:
-                    seg.font = font_type.value
-            else:
-                seg = Text_segment(text, t_range, style=text_style, clip_settings=clip_settings,
-                                  border=border, background=background,
-                                  font = font_type,
-                                  fixed_width=fixed_width)
-                # 添加气泡和花字效果
-                if bubble:
-                    seg.bubble = deepcopy(bubble)
-                if effect:
-                    seg.effect = deepcopy(effect)
-            # 如果有气泡或花字效果，需要将它们添加到素材列表中
+                seg.font = segment_font
+                # 动画及参考片段的气泡/花字需为每个片段生成独立的id, 与`Text_segment.create_from_template`一致
+                if style_reference.animations_instance:
+                    seg.animations_instance = deepcopy(style_reference.animations_instance)
+                    seg.animations_instance.animation_id = uuid.uuid4().hex
+                    seg.extra_material_refs.append(seg.animations_instance.animation_id)
+                if style_reference.bubble:
+                    seg.add_bubble(style_reference.bubble.effect_id, style_reference.bubble.resource_id)
+                if style_reference.effect:
+                    seg.add_effect(style_reference.effect.effect_id)
+            elif font_type:
+                seg.font = font_type.value
+            # 气泡和花字效果由各片段共用, 加入轨道时作为素材添加一次
             if bubble:
-                self.materials.filters.append(bubble)
+                seg.bubble = bubble
             if effect:
-                self.materials.filters.append(effect)
-            self.add_segment(seg, track_name)
-
-        index = 0
-        text: str = ""
-        text_trange: Timerange
-        read_state: Literal["index", "timestamp", "content"] = "index"
-        while index < len(lines):
-            line = lines[index].strip()
-            if read_state == "index":
-                if len(line) == 0:
-                    index += 1
-                    continue
-                if not line.isdigit():
-                    raise ValueError("Expected a number at line %d, got '%s'" % (index+1, line))
-                index += 1
-                read_state = "timestamp"
-            elif read_state == "timestamp":
-                # 读取时间戳
-                start_str, end_str = line.split(" --> ")
-                start, end = srt_tstamp(start_str), srt_tstamp(end_str)
-                text_trange = Timerange(start + time_offset, end - start)
-
-                index += 1
-                read_state = "content"
-            elif read_state == "content":
-                # 内容结束, 生成片段
-                if len(line) == 0:
-                    __add_text_segment(text.strip(), text_trange)
-
-                    text = ""
-                    read_state = "index"
-                else:
-                    text += line + "\n"
-                index += 1
+                seg.effect = effect
+            return seg
+
+        def __build_segments(lines: Iterable[str]) -> List[Text_segment]:
+            return [__make_text_segment(cue.text, Timerange(cue.start + time_offset, cue.end - cue.start))
+                    for cue in iter_subtitle_cues(lines)]
 
-        # 添加最后一个片段
-        if len(text) > 0:
-            __add_text_segment(text.strip(), text_trange)
+        # 检查是否为本地文件路径, 文件逐行读取而非整体读入
+        if os.path.exists(srt_content):
+            with open(srt_content, "r", encoding="utf-8-sig") as srt_file:
+                segments = __build_segments(srt_file)
+        else:
+            segments = __build_segments(io.StringIO(srt_content))
 
+        self.add_segments(segments, track_name)
         return self
 
     def get_imported_track(self, track_type: Literal[Track_type.video, Track_type.audio, Track_type.text],
@@ -676,14 +761,22 @@ class Script_file:
             extra_refs: List[str] = segment.get("extra_material_refs", [])
             material_ids.update(extra_refs)
 
-        # 复制素材
-        for material_type, material_list in source_file.imported_materials.items():
-            for material in material_list:
-                if material.get("id") in material_ids:
-                    self.imported_materials[material_type].append(deepcopy(material))
-                    material_ids.remove(material.get("id"))
+        # 按id索引查找素材, 按其在源草稿中的顺序引用, 两个草稿共享素材数据直至任一方修改
+        found_materials: List[Tuple[str, int]] = []
+        missing_ids = set()
+        for material_id in material_ids:
+            found = source_file.material_index.find(material_id)
+            if found is None:
+                missing_ids.add(material_id)
+            else:
+                found_materials.append(found)
+
+        assert len(missing_ids) == 0, "未找到以下素材: %s" % missing_ids
 
-        assert len(material_ids) == 0, "未找到以下素材: %s" % material_ids
+        type_order = {material_type: order for order, material_type in enumerate(source_file.imported_materials)}
+        found_materials.sort(key=lambda found: (type_order[found[0]], found[1]))
+        for material_type, position in found_materials:
+            self.material_index.append(material_type, source_file.imported_materials[material_type][position])
 
         # 更新总时长
         self.duration = max(self.duration, track.end_time)
@@ -707,17 +800,15 @@ class Script_file:
         """
         video_mode = isinstance(material, Video_material)
         # 查找素材
-        target_json_obj: Optional[Dict[str, Any]] = None
-        target_material_list = self.imported_materials["videos" if video_mode else "audios"]
-        name_key = "material_name" if video_mode else "name"
-        for mat in target_material_list:
-            if mat[name_key] == material_name:
-                if target_json_obj is not None:
-                    raise exceptions.AmbiguousMaterial(
-                        "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
-                target_json_obj = mat
-        if target_json_obj is None:
+        material_type = "videos" if video_mode else "audios"
+        name_key = Material_index.NAME_KEYS[material_type]
+        target_indices = self.material_index.find_by_name(material_type, material_name)
+        if len(target_indices) > 1:
+            raise exceptions.AmbiguousMaterial(
+                "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
+        if not target_indices:
             raise exceptions.MaterialNotFound("没有找到名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
+        target_json_obj = self.material_index.writable(material_type, target_indices[0])
 
         # 更新素材信息
         target_json_obj.update({name_key: material.material_name, "path": material.path, "duration": material.duration})
@@ -789,10 +880,11 @@ class Script_file:
             `TypeError`: 轨道类型不正确
             `ValueError`: 文本模板片段的文本数量不匹配
         """
-        if not isinstance(track, ImportedTextTrack):
+        # `load_template`导入的文本轨道为`Track`, 其片段同样引用导入的文本素材
+        if not isinstance(track, ImportedTextTrack) and not (isinstance(track, Track) and track.track_type == Track_type.text):
             raise TypeError("指定的轨道(类型为 %s)不支持文本内容替换" % track.track_type)
-        if not 0 <= segment_index < len(track):
-            raise IndexError("片段下标 %d 超出 [0, %d) 的范围" % (segment_index, len(track)))
+        if not 0 <= segment_index < len(track.segments):
+            raise IndexError("片段下标 %d 超出 [0, %d) 的范围" % (segment_index, len(track.segments)))
 
         def __recalc_style_range(old_len: int, new_len: int, styles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             """调整字体样式分布"""
@@ -808,9 +900,9 @@ class Script_file:
         replaced: bool = False
         material_id: str = track.segments[segment_index].material_id
         # 尝试在文本素材中替换
-        for mat in self.imported_materials["texts"]:
-            if mat["id"] != material_id:
-                continue
+        found = self.material_index.find(material_id, "texts")
+        if found is not None:
+            mat = self.material_index.writable("texts", found[1])
 
             if isinstance(text, list):
                 if len(text) != 1:
@@ -822,16 +914,11 @@ class Script_file:
                 content["styles"] = __recalc_style_range(len(content["text"]), len(text), content["styles"])
             content["text"] = text
             mat["content"] = json.dumps(content, ensure_ascii=False)
-            replaced = True
-            break
-        if replaced:
             return self
 
         # 尝试在文本模板中替换
-        for template in self.imported_materials["text_templates"]:
-            if template["id"] != material_id:
-                continue
-
+        template = self.material_index.get(material_id, "text_templates")
+        if template is not None:
             resources = template["text_info_resources"]
             if isinstance(text, str):
                 text = [text]
@@ -839,21 +926,20 @@ class Script_file:
                 raise ValueError(f"文字模板'{template['name']}'只有{len(resources)}段文本, 但提供了{len(text)}段替换内容")
 
             for sub_material_id, new_text in zip(map(lambda x: x["text_material_id"], resources), text):
-                for mat in self.imported_materials["texts"]:
-                    if mat["id"] != sub_material_id:
-                        continue
-
-                    if isinstance(mat["content"], str):
-                        mat["content"] = new_text
-                    else:
-                        content = json.loads(mat["content"])
-                        if recalc_style:
-                            content["styles"] = __recalc_style_range(len(content["text"]), len(new_text), content["styles"])
-                        content["text"] = new_text
-                        mat["content"] = json.dumps(content, ensure_ascii=False)
-                    break
+                found = self.material_index.find(sub_material_id, "texts")
+                if found is None:
+                    continue
+                mat = self.material_index.writable("texts", found[1])
+
+                if isinstance(mat["content"], str):
+                    mat["content"] = new_text
+                else:
+                    content = json.loads(mat["content"])
+                    if recalc_style:
+                        content["styles"] = __recalc_style_range(len(content["text"]), len(new_text), content["styles"])
+                    content["text"] = new_text
+                    mat["content"] = json.dumps(content, ensure_ascii=False)
             replaced = True
-            break
 
         assert replaced, f"未找到指定片段的素材 {material_id}"
 
@@ -883,6 +969,13 @@ class Script_file:
         self.content["canvas_config"] = {"width": self.width, "height": self.height, "ratio": "original"}
         self.content["materials"] = self.materials.export_json()
 
+        # 音效属于片段, 素材可由多个片段共用: 引用某素材的片段中有一个带音效时, 导出的素材即标记为有音效
+        with_effects = {segment.material_id for track in self.tracks.values() if track.track_type == Track_type.audio
+                        for segment in track.segments if segment.effects}
+        for audio in self.content["materials"]["audios"]:
+            if audio["id"] in with_effects:
+                audio["check_flag"] = 3
+
         self.content["last_modified_platform"] = {
             "app_id": 359289,
             "app_source": "cc",
@@ -918,7 +1011,20 @@ class Script_file:
         track_list.sort(key=lambda track: track.render_index)
         self.content["tracks"] = [track.export_json() for track in track_list]
 
-        return json.dumps(self.content, ensure_ascii=False, indent=4)
+        if not self.materials.texts:
+            return json.dumps(self.content, ensure_ascii=False, indent=4)
+
+        # 文本素材的JSON文本由各片段缓存, 先以占位符代替它们进行编码, 再将缓存的文本拼接进去
+        placeholder = "@@texts_%s@@" % uuid.uuid4().hex
+        materials = dict(self.content["materials"])
+        materials["texts"] = [placeholder] + materials["texts"][len(self.materials.texts):]
+        text_indent = "\n" + " " * 12  # 文本素材位于materials.texts中, 缩进3层
+        texts_json = ("," + text_indent).join(
+            text.export_material_json(text_indent[1:]) if isinstance(text, Text_segment)
+            else json.dumps(text, ensure_ascii=False, indent=4).replace("\n", text_indent)
+            for text in self.materials.texts)
+        return json.dumps({**self.content, "materials": materials}, ensure_ascii=False, indent=4) \
+            .replace(json.dumps(placeholder), texts_json, 1)
 
     def dump(self, file_path: str) -> None:
         """将草稿文件内容写入文件"""
@@ -1,15 +1,18 @@
 """定义片段基类及部分比较通用的属性类"""
 
 import uuid
-from typing import Optional, Dict, List, Any, Union
+import numpy as np
+from typing import Optional, Dict, List, Any, Union, Sequence
 
 from .animation import Segment_animations
 from .time_util import Timerange, tim
-from .keyframe import Keyframe_list, Keyframe_property
+from .keyframe import Keyframe_list, Keyframe_property, add_columnar_keyframes
 
 class Base_segment:
     """片段基类"""
 
+    __slots__ = ("segment_id", "material_id", "target_timerange", "common_keyframes")
+
     segment_id: str
     """片段全局id, 由程序自动生成"""
     material_id: str
@@ -79,6 +82,8 @@ class Base_segment:
 class Speed:
     """播放速度对象, 目前只支持固定速度"""
 
+    __slots__ = ("global_id", "speed")
+
     global_id: str
     """全局id, 由程序自动生成"""
     speed: float
@@ -100,6 +105,9 @@ class Speed:
 class Clip_settings:
     """素材片段的图像调节设置"""
 
+    __slots__ = ("alpha", "flip_horizontal", "flip_vertical", "rotation", "scale_x", "scale_y",
+                 "transform_x", "transform_y")
+
     alpha: float
     """图像不透明度, 0-1"""
     flip_horizontal: bool
@@ -154,6 +162,8 @@ class Clip_settings:
 class Media_segment(Base_segment):
     """媒体片段基类"""
 
+    __slots__ = ("source_timerange", "speed", "volume", "extra_material_refs")
+
     source_timerange: Optional[Timerange]
     """截取的素材片段的时间范围, 对贴纸而言不存在"""
     speed: Speed
@@ -187,6 +197,8 @@ class Media_segment(Base_segment):
 class Visual_segment(Media_segment):
     """视觉片段基类，用于处理所有可见片段（视频、贴纸、文本）的共同属性和行为"""
 
+    __slots__ = ("clip_settings", "uniform_scale", "animations_instance")
+
     clip_settings: Clip_settings
     """图像调节设置, 其效果可被关键帧覆盖"""
 
@@ -228,12 +240,7 @@ class Visual_segment(Media_segment):
         Raises:
             `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者
         """
-        if (_property == Keyframe_property.scale_x or _property == Keyframe_property.scale_y) and self.uniform_scale:
-            self.uniform_scale = False
-        elif _property == Keyframe_property.uniform_scale:
-            if not self.uniform_scale:
-                raise ValueError("已设置 scale_x 或 scale_y 时, 不能再设置 uniform_scale")
-            _property = Keyframe_property.scale_x
+        _property = self._resolve_keyframe_property(_property)
 
         if isinstance(time_offset, str): time_offset = tim(time_offset)
 
@@ -246,6 +253,34 @@ class Visual_segment(Media_segment):
         self.common_keyframes.append(kf_list)
         return self
 
+    def add_keyframes(self, _property: Keyframe_property, time_offsets: Union[Sequence[int], np.ndarray],
+                      values: Union[Sequence[float], np.ndarray]) -> "Visual_segment":
+        """为给定属性批量添加关键帧, 使用列式存储以降低稠密关键帧(如逐帧动画)的内存及导出开销
+
+        若该属性已有普通关键帧列表, 会先将其转换为列式存储
+
+        Args:
+            _property (`Keyframe_property`): 要控制的属性
+            time_offsets (`Sequence[int]` or `np.ndarray`): 各关键帧的时间偏移量, 单位为微秒
+            values (`Sequence[float]` or `np.ndarray`): 属性在各时间偏移量处的值
+
+        Raises:
+            `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者, 或关键帧数据非法
+        """
+        _property = self._resolve_keyframe_property(_property)
+        add_columnar_keyframes(self.common_keyframes, _property, time_offsets, values)
+        return self
+
+    def _resolve_keyframe_property(self, _property: Keyframe_property) -> Keyframe_property:
+        """处理`uniform_scale`与`scale_x`/`scale_y`的互斥关系, 返回实际写入的属性"""
+        if (_property == Keyframe_property.scale_x or _property == Keyframe_property.scale_y) and self.uniform_scale:
+            self.uniform_scale = False
+        elif _property == Keyframe_property.uniform_scale:
+            if not self.uniform_scale:
+                raise ValueError("已设置 scale_x 或 scale_y 时, 不能再设置 uniform_scale")
+            _property = Keyframe_property.scale_x
+        return _property
+
     def export_json(self) -> Dict[str, Any]:
         """导出通用于所有视觉片段的JSON数据"""
         json_dict = super().export_json()
@@ -0,0 +1,134 @@
+"""SRT及WebVTT字幕的流式解析"""
+
+import re
+import html
+
+from typing import Iterable, Iterator, NamedTuple, List, Optional
+
+class Subtitle_cue(NamedTuple):
+    """一条字幕"""
+
+    start: int
+    """起始时间, 单位为微秒"""
+    end: int
+    """结束时间, 单位为微秒"""
+    text: str
+    """字幕文本, 多行以换行符分隔"""
+
+_VTT_TAG = re.compile(r"<[^>]*>")
+
+def parse_timestamp(timestamp: str) -> int:
+    """解析`时:分:秒,毫秒`形式的时间戳, 返回微秒数
+
+    毫秒前的分隔符可以是逗号(SRT)或点(WebVTT), 小时部分可以省略(WebVTT)
+    """
+    clock, _, ms_str = timestamp.strip().replace(",", ".").partition(".")
+    parts = clock.split(":")
+    if len(parts) == 2:
+        parts.insert(0, "0")
+    if len(parts) != 3 or not ms_str.isdigit():
+        raise ValueError("Invalid timestamp '%s'" % timestamp)
+    hours, minutes, seconds = parts
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000000 + int(ms_str.ljust(3, "0")[:3]) * 1000
+
+def _parse_timing(line: str, line_no: int) -> List[int]:
+    """解析`起始 --> 结束 [设置]`形式的时间行"""
+    start_str, arrow, rest = line.partition("-->")
+    if not arrow:
+        raise ValueError("Expected a timestamp line at line %d, got '%s'" % (line_no, line))
+    # 结束时间之后可能跟随位置等设置, 忽略之
+    end_str = rest.split()[0] if rest.split() else ""
+    return [parse_timestamp(start_str), parse_timestamp(end_str)]
+
+def iter_srt_cues(lines: Iterable[str]) -> Iterator[Subtitle_cue]:
+    """逐条解析SRT字幕, 可直接传入打开的文件对象, 无需将整个文件读入内存
+
+    Raises:
+        `ValueError`: 字幕格式不正确
+    """
+    read_state = "index"
+    start = end = 0
+    text_lines: List[str] = []
+    for line_no, raw_line in enumerate(lines, 1):
+        line = raw_line.strip()
+        if read_state == "index":
+            if not line:
+                continue
+            if not line.isdigit():
+                raise ValueError("Expected a number at line %d, got '%s'" % (line_no, line))
+            read_state = "timestamp"
+        elif read_state == "timestamp":
+            start, end = _parse_timing(line, line_no)
+            read_state = "content"
+        elif line:
+            text_lines.append(line)
+        else:
+            # 内容结束
+            yield Subtitle_cue(start, end, "\n".join(text_lines))
+            text_lines = []
+            read_state = "index"
+
+    # 文件末尾没有空行时的最后一条字幕
+    if text_lines:
+        yield Subtitle_cue(start, end, "\n".join(text_lines))
+
+def iter_vtt_cues(lines: Iterable[str]) -> Iterator[Subtitle_cue]:
+    """逐条解析WebVTT字幕, 忽略NOTE/STYLE/REGION块、字幕标识及位置设置, 并去除文本中的标签
+
+    Raises:
+        `ValueError`: 缺少`WEBVTT`文件头
+    """
+    iterator = iter(lines)
+    for header in iterator:
+        if header.strip():
+            if not header.lstrip("\ufeff").startswith("WEBVTT"):
+                raise ValueError("Missing WEBVTT header, got '%s'" % header.strip())
+            break
+
+    block: List[str] = []
+    block_line_no = 0
+    for line_no, raw_line in enumerate(iterator, 2):
+        line = raw_line.strip()
+        if line:
+            if not block:
+                block_line_no = line_no
+            block.append(line)
+            continue
+        if block:
+            cue = _vtt_block_to_cue(block, block_line_no)
+            if cue is not None:
+                yield cue
+            block = []
+    if block:
+        cue = _vtt_block_to_cue(block, block_line_no)
+        if cue is not None:
+            yield cue
+
+def _vtt_block_to_cue(block: List[str], line_no: int) -> Optional[Subtitle_cue]:
+    """将一个以空行分隔的块转换为字幕, 非字幕块返回None"""
+    if block[0].startswith(("NOTE", "STYLE", "REGION")):
+        return None
+    # 第一行可能为字幕标识
+    timing_index = 0 if "-->" in block[0] else 1
+    if timing_index >= len(block) or "-->" not in block[timing_index]:
+        return None
+    start, end = _parse_timing(block[timing_index], line_no + timing_index)
+    text = "\n".join(html.unescape(_VTT_TAG.sub("", line)) for line in block[timing_index + 1:])
+    return Subtitle_cue(start, end, text)
+
+def iter_subtitle_cues(lines: Iterable[str]) -> Iterator[Subtitle_cue]:
+    """逐条解析字幕, 以`WEBVTT`开头时按WebVTT解析, 否则按SRT解析"""
+    iterator = iter(lines)
+    head: List[str] = []
+    for line in iterator:
+        head.append(line)
+        if line.strip():
+            break
+
+    def replay() -> Iterator[str]:
+        yield from head
+        yield from iterator
+
+    if head and head[-1].lstrip("\ufeff").strip().startswith("WEBVTT"):
+        return iter_vtt_cues(replay())
+    return iter_srt_cues(replay())
@@ -12,9 +12,9 @@ from .local_materials import Video_material, Audio_material
 from .video_segment import Video_segment, Clip_settings
 from .audio_segment import Audio_segment
 from .keyframe import Keyframe_list, Keyframe_property, Keyframe
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type, Effect_param_instance
+from .metadata import Effect_param_instance
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Set
 
 class Shrink_mode(Enum):
     """处理替换素材时素材变短情况的方法"""
@@ -44,20 +44,181 @@ class Extend_mode(Enum):
     push_tail = "push_tail"
     """延伸尾部, 若有必要则依次后移后续片段, 此方法总是成功"""
 
-class ImportedSegment(Base_segment):
-    """导入的片段"""
+class Raw_json_owner:
+    """持有模板原始json数据的对象, 原始数据只读
+
+    `raw_data`与解析出的模板内容(以及由其复制出的对象)共享, 不会在导入时深拷贝, 因此不得原地修改.
+    可修改的字段均已解析为对象属性, 导出时覆盖到原始数据上; 导出时只浅拷贝顶层, 嵌套数据直接引用原始数据.
+    若确需修改其他字段, 请将`raw_data`整体替换为修改后的副本.
+    """
 
     raw_data: Dict[str, Any]
-    """原始json数据"""
+    """原始json数据, 可能与其他对象共享, 只读"""
+
+    def _share_raw_data(self, json_data: Dict[str, Any]) -> None:
+        self.raw_data = json_data
+
+    def __deepcopy__(self, memo: Dict[int, Any]):
+        # 复制解析出的属性, 原始数据只读, 继续共享
+        cls = self.__class__
+        result = cls.__new__(cls)
+        memo[id(self)] = result
+        memo[id(self.raw_data)] = self.raw_data
+        for klass in cls.__mro__:
+            for slot in klass.__dict__.get("__slots__", ()):
+                if hasattr(self, slot):
+                    setattr(result, slot, deepcopy(getattr(self, slot), memo))
+        for key, value in self.__dict__.items():
+            setattr(result, key, deepcopy(value, memo))
+        return result
+
+class Material_index:
+    """导入素材的索引, 按id及音视频素材的名称定位素材在`imported_materials`中的位置
+
+    加载模板时建立一次, 此后通过`append`与`writable`修改素材列表时同步更新.
+    不支持绕过这两个方法直接修改素材列表: 查找时只会发现列表长度的变化及查到的下标与素材id不符的情况并重建索引,
+    原位替换素材或修改素材的id、名称后, 可能查不到新素材或仍返回旧下标. 必须直接修改时, 请随后调用`rebuild`
+    """
+
+    NAME_KEYS: Dict[str, str] = {"videos": "material_name", "audios": "name"}
+    """支持按名称查找的素材类型及其名称字段"""
+
+    materials: Dict[str, Any]
+    """被索引的素材数据, 即`imported_materials`"""
+
+    _by_id: Dict[str, List[Tuple[str, int]]]
+    _by_name: Dict[Tuple[str, str], List[int]]
+    _sizes: Dict[str, int]
+    _renamed: Set[Tuple[str, int]]
+
+    def __init__(self, imported_materials: Dict[str, Any]):
+        self.materials = imported_materials
+        self.rebuild()
+
+    def copy_for(self, imported_materials: Dict[str, Any]) -> "Material_index":
+        """返回用于`imported_materials`的索引副本, 后者应为被索引素材列表的浅拷贝, 免去重新扫描"""
+        if self._is_stale():
+            self.rebuild()
+        index = Material_index.__new__(Material_index)
+        index.materials = imported_materials
+        index._by_id = {material_id: list(entries) for material_id, entries in self._by_id.items()}
+        index._by_name = {key: list(positions) for key, positions in self._by_name.items()}
+        index._sizes = dict(self._sizes)
+        index._renamed = set(self._renamed)
+        return index
+
+    def rebuild(self) -> None:
+        """重新扫描全部素材建立索引"""
+        self._by_id = {}
+        self._by_name = {}
+        self._sizes = {}
+        self._renamed = set()
+        for material_type, material_list in self.materials.items():
+            if not isinstance(material_list, list):
+                continue
+            self._sizes[material_type] = len(material_list)
+            for position, material in enumerate(material_list):
+                self._add_entry(material_type, position, material)
+
+    def _add_entry(self, material_type: str, position: int, material: Any) -> None:
+        if not isinstance(material, dict):
+            return
+        material_id = material.get("id")
+        if material_id is not None:
+            self._by_id.setdefault(material_id, []).append((material_type, position))
+        name_key = self.NAME_KEYS.get(material_type)
+        if name_key is not None and name_key in material:
+            self._by_name.setdefault((material_type, material[name_key]), []).append(position)
+
+    def _is_stale(self) -> bool:
+        return any(isinstance(material_list, list) and len(material_list) != self._sizes.get(material_type)
+                   for material_type, material_list in self.materials.items())
+
+    def find(self, material_id: str, material_type: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """查找指定id的素材, 返回其类型及在列表中的下标, 有多个时返回最先导入的一个
+
+        Args:
+            material_id (`str`): 素材id
+            material_type (`str`, optional): 只在此类素材(如"videos")中查找, 默认查找所有类型
+        """
+        for _ in range(2):
+            for entry_type, position in self._by_id.get(material_id, ()):
+                if material_type is not None and entry_type != material_type:
+                    continue
+                material_list = self.materials.get(entry_type)
+                if isinstance(material_list, list) and position < len(material_list) \
+                        and material_list[position].get("id") == material_id:
+                    return entry_type, position
+                break  # 位置错位(列表被直接修改), 重建后重试
+            else:
+                if not self._is_stale():
+                    return None
+            self.rebuild()
+        return None
+
+    def get(self, material_id: str, material_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """返回指定id的素材数据(只读), 未找到时返回None, 参数同`find`"""
+        found = self.find(material_id, material_type)
+        if found is None:
+            return None
+        return self.materials[found[0]][found[1]]
+
+    def find_by_name(self, material_type: str, name: str) -> List[int]:
+        """返回指定类型中名称为`name`的所有素材的下标, 仅支持`NAME_KEYS`中的素材类型"""
+        name_key = self.NAME_KEYS[material_type]
+        if self._is_stale():
+            self.rebuild()
+        # 补录经`writable`修改过的素材的新名称
+        for renamed_type, position in self._renamed:
+            material = self.materials[renamed_type][position]
+            renamed_key = self.NAME_KEYS[renamed_type]
+            if renamed_key in material:
+                self._by_name.setdefault((renamed_type, material[renamed_key]), []).append(position)
+        self._renamed = set()
+
+        material_list = self.materials.get(material_type, [])
+        positions = self._by_name.get((material_type, name), [])
+        if any(material_list[position].get(name_key) != name for position in positions):
+            self.rebuild()
+            positions = self._by_name.get((material_type, name), [])
+        return sorted(positions)
+
+    def append(self, material_type: str, material: Dict[str, Any]) -> None:
+        """向指定类型的素材列表末尾添加素材并建立索引"""
+        if self._is_stale():
+            self.rebuild()
+        material_list = self.materials[material_type]
+        material_list.append(material)
+        self._sizes[material_type] = len(material_list)
+        self._add_entry(material_type, len(material_list) - 1, material)
+
+    def writable(self, material_type: str, position: int) -> Dict[str, Any]:
+        """将指定素材替换为独有的副本并返回, 用于修改前的写时复制
+
+        导入的素材数据与模板解析结果或源草稿共享, 直接修改会影响到它们.
+        返回的副本可以修改名称, 下次按名称查找时更新索引; id不应修改
+        """
+        material = deepcopy(self.materials[material_type][position])
+        self.materials[material_type][position] = material
+        name_key = self.NAME_KEYS.get(material_type)
+        if name_key is not None and name_key in material:
+            positions = self._by_name.get((material_type, material[name_key]), [])
+            if position in positions:
+                positions.remove(position)
+            self._renamed.add((material_type, position))
+        return material
+
+class ImportedSegment(Raw_json_owner, Base_segment):
+    """导入的片段"""
 
     __DATA_ATTRS = ["material_id", "target_timerange"]
     def __init__(self, json_data: Dict[str, Any]):
-        self.raw_data = deepcopy(json_data)
+        self._share_raw_data(json_data)
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
     def export_json(self) -> Dict[str, Any]:
-        json_data = deepcopy(self.raw_data)
+        json_data = dict(self.raw_data)
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
         return json_data
 
@@ -79,22 +240,19 @@ class ImportedMediaSegment(ImportedSegment):
         return json_data
 
 
-class ImportedTrack(Base_track):
+class ImportedTrack(Raw_json_owner, Base_track):
     """模板模式下导入的轨道"""
 
-    raw_data: Dict[str, Any]
-    """原始轨道数据"""
-
     def __init__(self, json_data: Dict[str, Any]):
         self.track_type = Track_type.from_name(json_data["type"])
         self.name = json_data["name"]
         self.track_id = json_data["id"]
         self.render_index = max([int(seg["render_index"]) for seg in json_data["segments"]], default=0)
 
-        self.raw_data = deepcopy(json_data)
+        self._share_raw_data(json_data)
 
     def export_json(self) -> Dict[str, Any]:
-        ret = deepcopy(self.raw_data)
+        ret = dict(self.raw_data)
         ret.update({
             "name": self.name,
             "id": self.track_id
@@ -215,10 +373,12 @@ class ImportedMediaTrack(EditableTrack):
         # 写入素材时间范围
         seg.source_timerange = src_timerange
 
-def import_track(json_data: Dict[str, Any], imported_materials: Dict[str, Any] = None) -> Track:
+def import_track(json_data: Dict[str, Any], imported_materials: Dict[str, Any] = None,
+                 material_index: Optional[Material_index] = None) -> Track:
     """导入轨道
     :param json_data: 轨道数据
     :param imported_materials: 已导入的素材数据，用于创建片段的material实例
+    :param material_index: `imported_materials`的索引, 导入多条轨道时应传入同一索引, 默认为本次导入单独建立
     """
     track_type = Track_type.from_name(json_data["type"])
     # 创建新的Track实例，保留所有原始属性
@@ -234,6 +394,8 @@ def import_track(json_data: Dict[str, Any], imported_materials: Dict[str, Any] =
     
     # 如果轨道类型允许修改，导入所有片段
     if track_type.value.allow_modify and imported_materials:
+        if material_index is None:
+            material_index = Material_index(imported_materials)
         for segment_data in json_data.get("segments", []):
             material_id = segment_data.get("material_id")
             material = None
@@ -257,10 +419,9 @@ def import_track(json_data: Dict[str, Any], imported_materials: Dict[str, Any] =
             # 根据轨道类型查找对应的素材
             if track_type == Track_type.video:
                 # 从imported_materials中查找视频素材
-                for video_material in imported_materials.get("videos", []):
-                    if video_material["id"] == material_id:
-                        material = Video_material.from_dict(video_material)
-                        break
+                video_material = material_index.get(material_id, "videos")
+                if video_material is not None:
+                    material = Video_material.from_dict(video_material)
                 
                 if material:
                     # 创建视频片段
@@ -289,10 +450,9 @@ def import_track(json_data: Dict[str, Any], imported_materials: Dict[str, Any] =
                 
             elif track_type == Track_type.audio:
                 # 从imported_materials中查找音频素材
-                for audio_material in imported_materials.get("audios", []):
-                    if audio_material["id"] == material_id:
-                        material = Audio_material.from_dict(audio_material)
-                        break
+                audio_material = material_index.get(material_id, "audios")
+                if audio_material is not None:
+                    material = Audio_material.from_dict(audio_material)
                 
                 if material:
                     # 创建音频片段
@@ -306,16 +466,19 @@ def import_track(json_data: Dict[str, Any], imported_materials: Dict[str, Any] =
                     )
                     # 添加音频效果
                     if "audio_effects" in imported_materials and imported_materials["audio_effects"]:
+                        from .metadata import Audio_scene_effect_type
                         effect_data = imported_materials["audio_effects"][0]
                         # 根据资源ID查找对应的效果类型
-                        for effect_type in Audio_scene_effect_type:
-                            if effect_type.value.resource_id == effect_data["resource_id"]:
-                                # 将参数值从0-1映射到0-100
-                                params = []
-                                for param in effect_data["audio_adjust_params"]:
-                                    params.append(param["value"] * 100)
-                                segment.add_effect(effect_type, params,effect_id=effect_data["id"])
-                                break
+                        try:
+                            effect_type = Audio_scene_effect_type.from_resource_id(effect_data["resource_id"])
+                        except ValueError:
+                            pass  # 未知的音效直接忽略
+                        else:
+                            # 将参数值从0-1映射到0-100
+                            params = []
+                            for param in effect_data["audio_adjust_params"]:
+                                params.append(param["value"] * 100)
+                            segment.add_effect(effect_type, params,effect_id=effect_data["id"])
                     segment.common_keyframes = common_keyframes
                     track.segments.append(segment)
             else:
@@ -2,23 +2,83 @@
 
 import json
 import uuid
+import weakref
+import operator
+import threading
 from copy import deepcopy
+from collections import OrderedDict
 
-from typing import Dict, Tuple, Any, List
+from typing import TYPE_CHECKING, Dict, Tuple, Any, List
 from typing import Union, Optional, Literal
 
-from pyJianYingDraft.metadata.capcut_text_animation_meta import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
-
 from .time_util import Timerange, tim
 from .segment import Clip_settings, Visual_segment
 from .animation import Segment_animations, Text_animation
 
-from .metadata import Font_type, Effect_meta
-from .metadata import Text_intro, Text_outro, Text_loop_anim
-
-class Text_style:
+from .metadata import Effect_meta
+
+if TYPE_CHECKING:
+    from .metadata import Font_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+    from .metadata import CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim
+
+class Interned_style:
+    """可驻留(hash-consing)的样式参数基类
+
+    值相同的样式对象可通过`intern`方法共用同一实例, 大量字幕片段样式相同时只保留一份.
+    驻留后的实例由多个片段共享, 因此变为只读, 修改其属性会引发`AttributeError`; 需要修改时请创建新的对象,
+    或通过`copy.copy`得到可修改的副本.
+    """
+
+    __slots__ = ("__weakref__", "_interned")
+
+    _fields: Tuple[str, ...] = ()
+    """参与比较的属性名"""
+    _pool: "weakref.WeakValueDictionary[Tuple[Any, ...], Interned_style]"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._pool = weakref.WeakValueDictionary()
+        cls._get_values = operator.attrgetter(*cls._fields)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_interned", False):
+            raise AttributeError(f"{type(self).__name__} 已驻留并被共享, 不能修改其属性 {name}")
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        # 副本(及反序列化得到的对象)不继承驻留状态, 可以修改
+        return None, {field: getattr(self, field) for field in self._fields}
+
+    def value_key(self) -> Tuple[Any, ...]:
+        """由各属性值组成的元组, 值相同的对象其元组相等"""
+        values = self._get_values(self)
+        try:
+            hash(values)
+        except TypeError:  # 颜色等以列表给出
+            values = tuple(tuple(value) if isinstance(value, list) else value for value in values)
+        return values
+
+    def intern(self):
+        """返回与此对象值相同的只读共享实例, 尚无此值时将此对象本身冻结并作为共享实例"""
+        key = self.value_key()
+        shared = self._pool.get(key)
+        if shared is None:
+            for field in self._fields:  # 列表形式的属性值转为元组, 以免被原地修改
+                value = getattr(self, field)
+                if isinstance(value, list):
+                    object.__setattr__(self, field, tuple(value))
+            object.__setattr__(self, "_interned", True)
+            self._pool[key] = shared = self
+        return shared
+
+class Text_style(Interned_style):
     """字体样式类"""
 
+    __slots__ = ("size", "bold", "italic", "underline", "color", "alpha", "align", "vertical",
+                 "letter_spacing", "line_spacing")
+    _fields = __slots__
+
     size: float
     """字体大小"""
 
@@ -75,9 +135,12 @@ class Text_style:
         self.letter_spacing = letter_spacing
         self.line_spacing = line_spacing
 
-class Text_border:
+class Text_border(Interned_style):
     """文本描边的参数"""
 
+    __slots__ = ("alpha", "color", "width")
+    _fields = __slots__
+
     alpha: float
     """描边不透明度"""
     color: Tuple[float, float, float]
@@ -108,9 +171,12 @@ class Text_border:
             "width": self.width
         }
 
-class Text_background:
+class Text_background(Interned_style):
     """文本背景参数"""
 
+    __slots__ = ("style", "alpha", "color", "round_radius", "height", "width", "horizontal_offset", "vertical_offset")
+    _fields = __slots__
+
     style: Literal[0, 2]
     """背景样式"""
 
@@ -166,9 +232,12 @@ class Text_background:
             "background_vertical_offset": self.vertical_offset,
         }
 
-class Text_shadow:
+class Text_shadow(Interned_style):
     """文本阴影参数"""
 
+    __slots__ = ("has_shadow", "alpha", "angle", "color", "distance", "smoothing")
+    _fields = __slots__
+
     has_shadow: bool
     """是否启用阴影"""
     alpha: float
@@ -274,10 +343,11 @@ class TextStyleRange:
         self.style = style
         self.border = border
         if font_str:
+            from . import metadata
             try:
-                font_type = getattr(Font_type, font_str).value
+                font_type = getattr(metadata.Font_type, font_str).value
             except:
-                available_fonts = [attr for attr in dir(Font_type) if not attr.startswith('_')]
+                available_fonts = [attr for attr in dir(metadata.Font_type) if not attr.startswith('_')]
                 raise ValueError(f"不支持的字体：{font_str}，请使用Font_type中的字体之一：{available_fonts}")
             self.font = font_type
     
@@ -289,9 +359,98 @@ class TextStyleRange:
         """
         return [self.start, self.end]
 
+STYLE_ITEM_CACHE_SIZE = 256
+"""缓存的样式JSON片段数量上限"""
+
+_style_item_cache: "OrderedDict[Tuple[Any, ...], Tuple[str, str]]" = OrderedDict()
+_style_item_cache_lock = threading.Lock()
+_RANGE_MARK = "@@range@@"
+
+def _style_item_json(style: Text_style, border: Optional[Text_border], shadow: Optional[Text_shadow],
+                     font: Optional[Effect_meta], effect: Optional[TextEffect]) -> Tuple[str, str]:
+    """文本素材content的styles中一项的JSON文本, 以range的值为界分为前后两段
+
+    结果按各参数的取值缓存, 样式相同的片段只需拼接各自的range
+
+    Args:
+        style (`Text_style`): 字体样式
+        border (`Text_border`, optional): 描边参数
+        shadow (`Text_shadow`, optional): 阴影参数, 仅在启用阴影时传入
+        font (`Effect_meta`, optional): 字体
+        effect (`TextEffect`, optional): 花字效果
+    """
+    key = (style.value_key(), border.value_key() if border else None, shadow.value_key() if shadow else None,
+           (font.resource_id, font.name) if font else None, effect.effect_id if effect else None)
+    with _style_item_cache_lock:
+        cached = _style_item_cache.get(key)
+        if cached is not None:
+            _style_item_cache.move_to_end(key)
+            return cached
+
+    style_item: Dict[str, Any] = {
+        "fill": {
+            "alpha": 1.0,
+            "content": {
+                "render_type": "solid",
+                "solid": {
+                    "alpha": style.alpha,
+                    "color": list(style.color)
+                }
+            }
+        },
+        "range": _RANGE_MARK,
+        "size": style.size,
+        "bold": style.bold,
+        "italic": style.italic,
+        "underline": style.underline,
+        "strokes": [border.export_json()] if border else []
+    }
+
+    # 如果有阴影设置，添加到样式中
+    if shadow:
+        style_item["shadows"] = [
+            {
+                "diffuse": shadow.smoothing / 6,  # diffuse = smoothing/6
+                "angle": shadow.angle,
+                "content": {
+                    "solid": {
+                        "color": [int(shadow.color[1:3], 16)/255,
+                                  int(shadow.color[3:5], 16)/255,
+                                  int(shadow.color[5:7], 16)/255]
+                    }
+                },
+                "distance": shadow.distance,
+                "alpha": shadow.alpha
+            }
+        ]
+
+    # 如果有字体设置，添加到样式中
+    if font:
+        style_item["font"] = {
+            "id": font.resource_id,
+            "path": "C:/%s.ttf" % font.name  # 并不会真正在此处放置字体文件
+        }
+
+    # 如果有特效设置，添加到样式中
+    if effect:
+        style_item["effectStyle"] = {
+            "id": effect.effect_id,
+            "path": "C:"  # 并不会真正在此处放置素材文件
+        }
+
+    prefix, suffix = json.dumps(style_item, ensure_ascii=False).split(json.dumps(_RANGE_MARK))
+    with _style_item_cache_lock:
+        _style_item_cache[key] = (prefix, suffix)
+        if len(_style_item_cache) > STYLE_ITEM_CACHE_SIZE:
+            _style_item_cache.popitem(last=False)
+    return prefix, suffix
+
 class Text_segment(Visual_segment):
     """文本片段类, 目前仅支持设置基本的字体样式"""
 
+    __slots__ = ("text", "font", "style", "border", "background", "shadow", "bubble", "effect",
+                 "fixed_width", "fixed_height", "text_styles", "_material_cache")
+
     text: str
     """文本内容"""
     font: Optional[Effect_meta]
@@ -321,7 +480,7 @@ class Text_segment(Visual_segment):
     """文本的多种样式列表"""
 
     def __init__(self, text: str, timerange: Timerange, *,
-                 font: Optional[Font_type] = None,
+                 font: Optional["Font_type"] = None,
                  style: Optional[Text_style] = None, clip_settings: Optional[Clip_settings] = None,
                  border: Optional[Text_border] = None, background: Optional[Text_background] = None,
                  shadow: Optional[Text_shadow] = None,
@@ -357,6 +516,8 @@ class Text_segment(Visual_segment):
         self.fixed_height = fixed_height
         self.text_styles = []
 
+        self._material_cache = None
+
     # 修改设置特定范围的文本样式的方法
     def add_text_style(self, textStyleRange: TextStyleRange) -> "Text_segment":
         # 添加新的样式范围
@@ -383,8 +544,8 @@ class Text_segment(Visual_segment):
 
         return new_segment
 
-    def add_animation(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim,
-                                                  CapCut_Text_intro, CapCut_Text_outro, CapCut_Text_loop_anim],
+    def add_animation(self, animation_type: Union["Text_intro", "Text_outro", "Text_loop_anim",
+                                                  "CapCut_Text_intro", "CapCut_Text_outro", "CapCut_Text_loop_anim"],
                       duration: Union[str, float] = 500000) -> "Text_segment":
         """将给定的入场/出场/循环动画添加到此片段的动画列表中, 出入场动画的持续时间可以自行设置, 循环动画则会自动填满其余无动画部分
 
@@ -395,13 +556,15 @@ class Text_segment(Visual_segment):
             duration (`str` or `float`, optional): 动画持续时间, 单位为微秒, 仅对入场/出场动画有效.
                 若传入字符串则会调用`tim()`函数进行解析. 默认为0.5秒
         """
+        from . import metadata
+
         duration = min(tim(duration), self.target_timerange.duration)
 
-        if (isinstance(animation_type, Text_intro) or isinstance(animation_type, CapCut_Text_intro)):
+        if (isinstance(animation_type, metadata.Text_intro) or isinstance(animation_type, metadata.CapCut_Text_intro)):
             start = 0
-        elif (isinstance(animation_type, Text_outro) or isinstance(animation_type, CapCut_Text_outro)):
+        elif (isinstance(animation_type, metadata.Text_outro) or isinstance(animation_type, metadata.CapCut_Text_outro)):
             start = self.target_timerange.duration - duration
-        elif (isinstance(animation_type, Text_loop_anim) or isinstance(animation_type, CapCut_Text_loop_anim)):
+        elif (isinstance(animation_type, metadata.Text_loop_anim) or isinstance(animation_type, metadata.CapCut_Text_loop_anim)):
             intro_trange = self.animations_instance and self.animations_instance.get_animation_trange("in")
             outro_trange = self.animations_instance and self.animations_instance.get_animation_trange("out")
             start = intro_trange.start if intro_trange else 0
@@ -438,8 +601,44 @@ class Text_segment(Visual_segment):
         self.extra_material_refs.append(self.effect.global_id)
         return self
 
+    def _material_key(self) -> Tuple[Any, ...]:
+        """导出素材时用到的全部取值, 与缓存时不同即说明素材需要重新导出"""
+        return (self.material_id, self.text, self.font, self.effect and self.effect.effect_id,
+                self.fixed_width, self.fixed_height, self.style.value_key(),
+                self.border and self.border.value_key(),
+                self.background and self.background.value_key(),
+                self.shadow and self.shadow.value_key(),
+                tuple((style_range.start, style_range.end, style_range.style.value_key(),
+                       style_range.border and style_range.border.value_key(), getattr(style_range, "font", None))
+                      for style_range in self.text_styles) if self.text_styles else ())
+
+    def _cached_material(self) -> List[Any]:
+        """返回[取值, 素材, JSON文本缓存]形式的缓存项, 文本、样式、字体、花字或样式范围变化后重新导出"""
+        key = self._material_key()
+        cache = self._material_cache
+        if cache is None or cache[0] != key:
+            cache = self._material_cache = [key, self._build_material(), None]
+        return cache
+
     def export_material(self) -> Dict[str, Any]:
-        """与此文本片段联系的素材, 以此不再单独定义Text_material类"""
+        """与此文本片段联系的素材, 以此不再单独定义Text_material类
+
+        结果会被缓存, 片段未修改时再次导出直接返回同一字典, 调用方不应修改它
+        """
+        return self._cached_material()[1]
+
+    def export_material_json(self, indent: str) -> str:
+        """素材的JSON文本, 与`json.dumps(..., ensure_ascii=False, indent=4)`一致, 且每个换行后额外缩进`indent`
+
+        用于拼接草稿文件, 同样随素材一起缓存
+        """
+        cache = self._cached_material()
+        if cache[2] is None or cache[2][0] != indent:
+            cache[2] = (indent, json.dumps(cache[1], ensure_ascii=False, indent=4).replace("\n", "\n" + indent))
+        return cache[2][1]
+
+    def _build_material(self) -> Dict[str, Any]:
+        """生成素材的JSON数据"""
         # 叠加各类效果的flag
         check_flag: int = 7
         if self.border:
@@ -449,251 +648,48 @@ class Text_segment(Visual_segment):
         if self.shadow and self.shadow.has_shadow:  # 如果有阴影且启用了阴影
             check_flag |= 32  # 添加阴影标志
     
-        # 构建styles数组
-        styles = []
-        
+        # 构建styles数组, 各项的JSON文本按样式取值缓存, 只有range随片段变化
+        shadow = self.shadow if self.shadow and self.shadow.has_shadow else None
+        styles: List[Tuple[Tuple[str, str], List[int]]] = []
+
         if self.text_styles:
             # 创建一个排序后的样式范围列表
             sorted_styles = sorted(self.text_styles, key=lambda x: x.start)
-            
-            # 检查是否需要在开头添加默认样式
+            # 未被样式范围覆盖的部分使用全局样式
+            default_style = _style_item_json(self.style, self.border, None, self.font, self.effect)
+
+            # 检查是否需要在开头添加默认样式, 此处同时带上阴影设置
             if sorted_styles[0].start > 0:
-                # 添加从0到第一个样式开始的默认样式
-                default_style = {
-                    "fill": {
-                        "alpha": 1.0,
-                        "content": {
-                            "render_type": "solid",
-                            "solid": {
-                                "alpha": self.style.alpha,
-                                "color": list(self.style.color)
-                            }
-                        }
-                    },
-                    "range": [0, sorted_styles[0].start],
-                    "size": self.style.size,
-                    "bold": self.style.bold,
-                    "italic": self.style.italic,
-                    "underline": self.style.underline,
-                    "strokes": [self.border.export_json()] if self.border else []
-                }
-                
-                # 如果有阴影设置，添加到样式中
-                if self.shadow and self.shadow.has_shadow:
-                    style_item["shadows"] = [
-                        {
-                            "diffuse": self.shadow.smoothing / 6,  # diffuse = smoothing/6
-                            "angle": self.shadow.angle,
-                            "content": {
-                                "solid": {
-                                    "color": [int(self.shadow.color[1:3], 16)/255, 
-                                             int(self.shadow.color[3:5], 16)/255, 
-                                             int(self.shadow.color[5:7], 16)/255]
-                                }
-                            },
-                            "distance": self.shadow.distance,
-                            "alpha": self.shadow.alpha
-                        }
-                    ]
-                
-                # 如果有全局字体设置，添加到样式中
-                if self.font:
-                    default_style["font"] = {
-                        "id": self.font.resource_id,
-                        "path": "C:/%s.ttf" % self.font.name
-                    }
-                
-                # 如果有特效设置，添加到样式中
-                if self.effect:
-                    default_style["effectStyle"] = {
-                        "id": self.effect.effect_id,
-                        "path": "C:"  # 并不会真正在此处放置素材文件
-                    }
-                    
-                styles.append(default_style)
-            
+                styles.append((_style_item_json(self.style, self.border, shadow, self.font, self.effect),
+                               [0, sorted_styles[0].start]))
+
             # 处理每个样式范围
             for i, style_range in enumerate(sorted_styles):
-                # 添加当前样式范围的样式
-                style_item = {
-                    "fill": {
-                        "alpha": 1.0,
-                        "content": {
-                            "render_type": "solid",
-                            "solid": {
-                                "alpha": style_range.style.alpha,
-                                "color": list(style_range.style.color)
-                            }
-                        }
-                    },
-                    "range": style_range.get_range(),
-                    "size": style_range.style.size,
-                    "bold": style_range.style.bold,
-                    "italic": style_range.style.italic,
-                    "underline": style_range.style.underline,
-                    "strokes": [style_range.border.export_json()] if style_range.border else []
-                }
-                
-                # 如果TextStyleRange有字体设置，优先使用它
-                if hasattr(style_range, 'font') and style_range.font:
-                    style_item["font"] = {
-                        "id": style_range.font.resource_id,
-                        "path": "C:/%s.ttf" % style_range.font.name
-                    }
-                # 否则，如果有全局字体设置，使用全局字体
-                elif self.font:
-                    style_item["font"] = {
-                        "id": self.font.resource_id,
-                        "path": "C:/%s.ttf" % self.font.name
-                    }
-                
-                # 如果有特效设置，添加到样式中
-                if self.effect:
-                    style_item["effectStyle"] = {
-                        "id": self.effect.effect_id,
-                        "path": "C:"  # 并不会真正在此处放置素材文件
-                    }
-                    
-                styles.append(style_item)
-                
+                # TextStyleRange有字体设置时优先使用它, 否则使用全局字体
+                range_font = getattr(style_range, "font", None) or self.font
+                styles.append((_style_item_json(style_range.style, style_range.border, None, range_font, self.effect),
+                               style_range.get_range()))
+
                 # 检查是否需要在当前样式和下一个样式之间添加默认样式
                 if i < len(sorted_styles) - 1 and style_range.end < sorted_styles[i+1].start:
-                    # 添加从当前样式结束到下一个样式开始的默认样式
-                    gap_style = {
-                        "fill": {
-                            "alpha": 1.0,
-                            "content": {
-                                "render_type": "solid",
-                                "solid": {
-                                    "alpha": self.style.alpha,
-                                    "color": list(self.style.color)
-                                }
-                            }
-                        },
-                        "range": [style_range.end, sorted_styles[i+1].start],
-                        "size": self.style.size,
-                        "bold": self.style.bold,
-                        "italic": self.style.italic,
-                        "underline": self.style.underline,
-                        "strokes": [self.border.export_json()] if self.border else []
-                    }
-                    
-                    # 如果有全局字体设置，添加到样式中
-                    if self.font:
-                        gap_style["font"] = {
-                            "id": self.font.resource_id,
-                            "path": "C:/%s.ttf" % self.font.name
-                        }
-                    
-                    # 如果有特效设置，添加到样式中
-                    if self.effect:
-                        gap_style["effectStyle"] = {
-                            "id": self.effect.effect_id,
-                            "path": "C:"  # 并不会真正在此处放置素材文件
-                        }
-                        
-                    styles.append(gap_style)
-            
+                    styles.append((default_style, [style_range.end, sorted_styles[i+1].start]))
+
             # 检查是否需要在最后一个样式之后添加默认样式
             if sorted_styles[-1].end < len(self.text):
-                # 添加从最后一个样式结束到文本结尾的默认样式
-                end_style = {
-                    "fill": {
-                        "alpha": 1.0,
-                        "content": {
-                            "render_type": "solid",
-                            "solid": {
-                                "alpha": self.style.alpha,
-                                "color": list(self.style.color)
-                            }
-                        }
-                    },
-                    "range": [sorted_styles[-1].end, len(self.text)],
-                    "size": self.style.size,
-                    "bold": self.style.bold,
-                    "italic": self.style.italic,
-                    "underline": self.style.underline,
-                    "strokes": [self.border.export_json()] if self.border else []
-                }
-                
-                # 如果有全局字体设置，添加到样式中
-                if self.font:
-                    end_style["font"] = {
-                        "id": self.font.resource_id,
-                        "path": "C:/%s.ttf" % self.font.name
-                    }
-                
-                # 如果有特效设置，添加到样式中
-                if self.effect:
-                    end_style["effectStyle"] = {
-                        "id": self.effect.effect_id,
-                        "path": "C:"  # 并不会真正在此处放置素材文件
-                    }
-                    
-                styles.append(end_style)
+                styles.append((default_style, [sorted_styles[-1].end, len(self.text)]))
         else:
             # 如果text_styles为空，使用全局样式创建一个默认的style
-            style_item = {
-                "fill": {
-                    "alpha": 1.0,
-                    "content": {
-                        "render_type": "solid",
-                        "solid": {
-                            "alpha": self.style.alpha,
-                            "color": list(self.style.color)
-                        }
-                    }
-                },
-                "range": [0, len(self.text)],
-                "size": self.style.size,
-                "bold": self.style.bold,
-                "italic": self.style.italic,
-                "underline": self.style.underline,
-                "strokes": [self.border.export_json()] if self.border else []
-            }
-            
-            # 如果有阴影设置，添加到样式中
-            if self.shadow and self.shadow.has_shadow:
-                style_item["shadows"] = [
-                    {
-                        "diffuse": self.shadow.smoothing / 6,  # diffuse = smoothing/6
-                        "angle": self.shadow.angle,
-                        "content": {
-                            "solid": {
-                                "color": [int(self.shadow.color[1:3], 16)/255, 
-                                            int(self.shadow.color[3:5], 16)/255, 
-                                            int(self.shadow.color[5:7], 16)/255]
-                            }
-                        },
-                        "distance": self.shadow.distance,
-                        "alpha": self.shadow.alpha
-                    }
-                ]
-                
-            # 如果有全局字体设置，添加到样式中
-            if self.font:
-                style_item["font"] = {
-                    "id": self.font.resource_id,
-                    "path": "C:/%s.ttf" % self.font.name  # 并不会真正在此处放置字体文件
-                }
-            
-            # 如果有特效设置，添加到样式中
-            if self.effect:
-                style_item["effectStyle"] = {
-                    "id": self.effect.effect_id,
-                    "path": "C:"  # 并不会真正在此处放置素材文件
-                }
-                
-            styles.append(style_item)
+            styles.append((_style_item_json(self.style, self.border, shadow, self.font, self.effect),
+                           [0, len(self.text)]))
 
-        content_json = {
-            "styles": styles,
-            "text": self.text
-        }
+        # 与json.dumps({"styles": [...], "text": ...}, ensure_ascii=False)的结果一致
+        content = '{"styles": [%s], "text": %s}' % (
+            ", ".join(prefix + json.dumps(text_range) + suffix for (prefix, suffix), text_range in styles),
+            json.dumps(self.text, ensure_ascii=False))
 
         ret = {
             "id": self.material_id,
-            "content": json.dumps(content_json, ensure_ascii=False),
+            "content": content,
 
             "typesetting": int(self.style.vertical),
             "alignment": self.style.align,
@@ -1,6 +1,7 @@
 """轨道类及其元数据"""
 
 import uuid
+import logging
 
 from enum import Enum
 from typing import TypeVar, Generic, Type
@@ -16,6 +17,8 @@ from .audio_segment import Audio_segment
 from .text_segment import Text_segment
 from .effect_segment import Effect_segment, Filter_segment
 
+logger = logging.getLogger('flask_video_generator')
+
 @dataclass
 class Track_meta:
     """与轨道类型关联的轨道元数据"""
@@ -126,7 +129,7 @@ class Track(Base_track, Generic[Seg_type]):
                 )
                         
                 if target_segment is None:
-                    print(f"警告：在轨道 {self.name} 的时间点 {time}s 找不到对应的片段，跳过此关键帧")
+                    logger.warning(f"在轨道 {self.name} 的时间点 {time}s 找不到对应的片段，跳过此关键帧")
                     continue
                     
                 # 将属性类型字符串转换为枚举值
@@ -154,9 +157,9 @@ class Track(Base_track, Generic[Seg_type]):
                     
                 # 添加关键帧
                 target_segment.add_keyframe(property_enum, offset_time, float_value)
-                print(f"成功添加关键帧: {property_type} 在 {time}s")
+                logger.info(f"成功添加关键帧: {property_type} 在 {time}s")
             except Exception as e:
-                print(f"添加关键帧失败: {str(e)}")
+                logger.error(f"添加关键帧失败: {str(e)}")
         
         # 清空待处理的关键帧
         self.pending_keyframes = []
@@ -195,6 +198,43 @@ class Track(Base_track, Generic[Seg_type]):
         self.segments.append(segment)
         return self
 
+    def add_segments(self, segments: List[Seg_type]) -> "Track[Seg_type]":
+        """向轨道中批量添加片段, 效果等同于按起始时间依次调用`add_segment`
+
+        新片段先按起始时间排序, 再与现有片段一起做一次排序扫描检查重叠, 而非每添加一个片段都遍历整条轨道.
+        任一片段不合法时不会添加任何片段.
+
+        Args:
+            segments (List[Seg_type]): 要添加的片段, 无需预先排序
+
+        Raises:
+            `TypeError`: 新片段类型与轨道类型不匹配
+            `SegmentOverlap`: 新片段之间或新片段与现有片段重叠
+        """
+        accept_type = self.accept_segment_type
+        for segment in segments:
+            if not isinstance(segment, accept_type):
+                raise TypeError("New segment (%s) is not of the same type as the track (%s)" % (type(segment), accept_type))
+
+        new_segments = sorted(segments, key=lambda seg: (seg.target_timerange.start, seg.target_timerange.end))
+
+        # 按起始时间扫描, 若某片段的起始时间早于之前所有片段的最晚结束时间则存在重叠
+        ranges = [(seg.target_timerange.start, seg.target_timerange.end, False) for seg in self.segments]
+        ranges.extend((seg.target_timerange.start, seg.target_timerange.end, True) for seg in new_segments)
+        ranges.sort(key=lambda item: (item[0], item[1]))
+        latest = None  # 目前结束得最晚的片段
+        for current in ranges:
+            if latest is not None and current[0] < latest[1]:
+                # 与`add_segment`一样报告其中的新片段
+                start, end, _ = current if current[2] else latest
+                raise SegmentOverlap("New segment overlaps with existing segment [start: {}, end: {}]"
+                                     .format(start, end))
+            if latest is None or current[1] > latest[1]:
+                latest = current
+
+        self.segments.extend(new_segments)
+        return self
+
     def export_json(self) -> Dict[str, Any]:
         # 为每个片段写入render_index
         segment_exports = [seg.export_json() for seg in self.segments]
@@ -1,12 +1,54 @@
 """辅助函数，主要与模板模式有关"""
 
+import os
+import json
 import inspect
+import threading
+from collections import OrderedDict
 
-from typing import Union, Type
+from typing import Union, Type, Tuple
 from typing import List, Dict, Any
 
 JsonExportable = Union[int, float, bool, str, List["JsonExportable"], Dict[str, "JsonExportable"]]
 
+JSON_CACHE_SIZE = 16
+"""解析结果缓存最多保留的文件数"""
+
+# 绝对路径 -> ((修改时间, 文件大小), 解析结果), 按最近使用排序
+_json_cache: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+_json_cache_lock = threading.Lock()
+
+def load_json_cached(json_path: str) -> Any:
+    """读取并解析JSON文件, 文件的修改时间与大小均未变化时直接返回上次的解析结果
+
+    返回的对象在所有调用者间共享, **不可修改**; 需要修改时应先复制要修改的部分
+
+    Raises:
+        `FileNotFoundError`: 文件不存在
+    """
+    path = os.path.abspath(json_path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _json_cache_lock:
+        cached = _json_cache.get(path)
+        if cached is not None and cached[0] == key:
+            _json_cache.move_to_end(path)
+            return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with _json_cache_lock:
+        _json_cache[path] = (key, data)
+        _json_cache.move_to_end(path)
+        while len(_json_cache) > JSON_CACHE_SIZE:
+            _json_cache.popitem(last=False)
+    return data
+
+def clear_json_cache() -> None:
+    """清空`load_json_cached`的解析结果缓存"""
+    with _json_cache_lock:
+        _json_cache.clear()
+
 def provide_ctor_defaults(cls: Type) -> Dict[str, Any]:
     """为构造函数提供默认值，以绕开构造函数的参数限制"""
 
@@ -4,13 +4,10 @@
 """
 
 import uuid
-from copy import deepcopy
 
-from typing import Optional, Literal, Union, overload
+from typing import TYPE_CHECKING, Optional, Literal, Union, overload
 from typing import Dict, List, Tuple, Any
 
-from pyJianYingDraft.metadata.capcut_effect_meta import CapCut_Video_character_effect_type, CapCut_Video_scene_effect_type
-from pyJianYingDraft.metadata.capcut_mask_meta import CapCut_Mask_type
 from settings import IS_CAPCUT_ENV
 
 from .time_util import tim, Timerange
@@ -19,16 +16,18 @@ from .local_materials import Video_material
 from .animation import Segment_animations, Video_animation
 
 from .metadata import Effect_meta, Effect_param_instance
-from .metadata import Mask_meta, Mask_type, Filter_type, Transition_type, CapCut_Transition_type
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
-from .metadata import Video_scene_effect_type, Video_character_effect_type
+
+if TYPE_CHECKING:
+    from .metadata import Mask_meta, Mask_type, CapCut_Mask_type, Filter_type, Transition_type, CapCut_Transition_type
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type
+    from .metadata import Video_scene_effect_type, Video_character_effect_type
 
 
 class Mask:
     """蒙版对象"""
 
-    mask_meta: Mask_meta
+    mask_meta: "Mask_meta"
     """蒙版元数据"""
     global_id: str
     """蒙版全局id, 由程序自动生成"""
@@ -48,7 +47,7 @@ class Mask:
     round_corner: float
     """矩形蒙版的圆角, 0-1"""
 
-    def __init__(self, mask_meta: Mask_meta,
+    def __init__(self, mask_meta: "Mask_meta",
                  cx: float, cy: float, w: float, h: float,
                  ratio: float, rot: float, inv: bool, feather: float, round_corner: float):
         self.mask_meta = mask_meta
@@ -107,7 +106,7 @@ class Video_effect:
 
     adjust_params: List[Effect_param_instance]
 
-    def __init__(self, effect_meta: Union[Video_scene_effect_type, Video_character_effect_type],
+    def __init__(self, effect_meta: "Union[Video_scene_effect_type, Video_character_effect_type]",
                  params: Optional[List[Optional[float]]] = None, *,
                  apply_target_type: Literal[0, 2] = 0):
         """根据给定的特效元数据及参数列表构造一个视频特效对象, params的范围是0~100"""
@@ -118,17 +117,19 @@ class Video_effect:
         self.resource_id = effect_meta.value.resource_id
         self.adjust_params = []
 
+        # 特效元数据在首次访问时才加载, 因此通过模块属性取得
+        from . import metadata
         if IS_CAPCUT_ENV:
-            if isinstance(effect_meta, CapCut_Video_scene_effect_type):
+            if isinstance(effect_meta, metadata.CapCut_Video_scene_effect_type):
                 self.effect_type = "video_effect"
-            elif isinstance(effect_meta, CapCut_Video_character_effect_type):
+            elif isinstance(effect_meta, metadata.CapCut_Video_character_effect_type):
                 self.effect_type = "face_effect"
             else:
                 raise TypeError("Invalid effect meta type %s" % type(effect_meta))
         else:
-            if isinstance(effect_meta, Video_scene_effect_type):
+            if isinstance(effect_meta, metadata.Video_scene_effect_type):
                 self.effect_type = "video_effect"
-            elif isinstance(effect_meta, Video_character_effect_type):
+            elif isinstance(effect_meta, metadata.Video_character_effect_type):
                 self.effect_type = "face_effect"
             else:
                 raise TypeError("Invalid effect meta type %s" % type(effect_meta))
@@ -236,7 +237,7 @@ class Transition:
     is_overlap: bool
     """是否与上一个片段重叠(?)"""
 
-    def __init__(self, effect_meta: Union[Transition_type, CapCut_Transition_type], duration: Optional[int] = None):
+    def __init__(self, effect_meta: "Union[Transition_type, CapCut_Transition_type]", duration: Optional[int] = None):
         """根据给定的转场元数据及持续时间构造一个转场对象"""
         self.name = effect_meta.value.name
         self.global_id = uuid.uuid4().hex
@@ -291,8 +292,11 @@ class BackgroundFilling:
 class Video_segment(Visual_segment):
     """安放在轨道上的一个视频/图片片段"""
 
+    __slots__ = ("material_instance", "material_size", "effects", "filters", "mask", "transition",
+                 "background_filling", "visible")
+
     material_instance: Video_material
-    """素材实例"""
+    """素材实例, 与传入的素材共享同一对象而非拷贝"""
     material_size: Tuple[int, int]
     """素材尺寸"""
 
@@ -359,7 +363,7 @@ class Video_segment(Visual_segment):
 
         super().__init__(material.material_id, source_timerange, target_timerange, speed, volume, clip_settings=clip_settings)
 
-        self.material_instance = deepcopy(material)
+        self.material_instance = material
         self.material_size = (material.width, material.height)
         self.effects = []
         self.filters = []
@@ -367,7 +371,7 @@ class Video_segment(Visual_segment):
         self.mask = None
         self.background_filling = None
 
-    def add_animation(self, animation_type: Union[Intro_type, Outro_type, Group_animation_type, CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type],
+    def add_animation(self, animation_type: "Union[Intro_type, Outro_type, Group_animation_type, CapCut_Intro_type, CapCut_Outro_type, CapCut_Group_animation_type]",
                       duration: Optional[Union[int, str]] = None) -> "Video_segment":
         """将给定的入场/出场/组合动画添加到此片段的动画列表中
 
@@ -376,15 +380,17 @@ class Video_segment(Visual_segment):
             duration (`int` or `str`, optional): 动画持续时间, 单位为微秒. 若传入字符串则会调用`tim()`函数进行解析.
                 若不指定则使用动画类型定义的默认值. 理论上只适用于入场和出场动画.
         """
+        from . import metadata
+
         if duration is not None:
             duration = tim(duration)
-        if (isinstance(animation_type, Intro_type) or isinstance(animation_type, CapCut_Intro_type)):
+        if (isinstance(animation_type, metadata.Intro_type) or isinstance(animation_type, metadata.CapCut_Intro_type)):
             start = 0
             duration = duration or animation_type.value.duration
-        elif isinstance(animation_type, Outro_type) or isinstance(animation_type, CapCut_Outro_type):
+        elif isinstance(animation_type, metadata.Outro_type) or isinstance(animation_type, metadata.CapCut_Outro_type):
             duration = duration or animation_type.value.duration
             start = self.target_timerange.duration - duration
-        elif isinstance(animation_type, Group_animation_type) or isinstance(animation_type, CapCut_Group_animation_type):
+        elif isinstance(animation_type, metadata.Group_animation_type) or isinstance(animation_type, metadata.CapCut_Group_animation_type):
             start = 0
             duration = duration or self.target_timerange.duration
         else:
@@ -398,7 +404,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_effect(self, effect_type: Union[Video_scene_effect_type, Video_character_effect_type],
+    def add_effect(self, effect_type: "Union[Video_scene_effect_type, Video_character_effect_type]",
                    params: Optional[List[Optional[float]]] = None) -> "Video_segment":
         """为视频片段添加一个作用于整个片段的特效
 
@@ -419,7 +425,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_filter(self, filter_type: Filter_type, intensity: float = 100.0) -> "Video_segment":
+    def add_filter(self, filter_type: "Filter_type", intensity: float = 100.0) -> "Video_segment":
         """为视频片段添加一个滤镜
 
         Args:
@@ -432,7 +438,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_mask(self, draft: "Script_file", mask_type: Union[Mask_type, CapCut_Mask_type], *, center_x: float = 0.0, center_y: float = 0.0, size: float = 0.5,
+    def add_mask(self, draft: "Script_file", mask_type: "Union[Mask_type, CapCut_Mask_type]", *, center_x: float = 0.0, center_y: float = 0.0, size: float = 0.5,
                  rotation: float = 0.0, feather: float = 0.0, invert: bool = False,
                  rect_width: Optional[float] = None, round_corner: Optional[float] = None) -> "Video_segment":
         """为视频片段添加蒙版
@@ -451,12 +457,13 @@ class Video_segment(Visual_segment):
         Raises:
             `ValueError`: 试图添加多个蒙版或不正确地设置了`rect_width`及`round_corner`
         """
+        from . import metadata
 
         if self.mask is not None:
             raise ValueError("当前片段已有蒙版, 不能再添加新的蒙版")
-        if (rect_width is not None or round_corner is not None) and (mask_type != Mask_type.矩形 and mask_type != CapCut_Mask_type.Rectangle):
+        if (rect_width is not None or round_corner is not None) and (mask_type != metadata.Mask_type.矩形 and mask_type != metadata.CapCut_Mask_type.Rectangle):
             raise ValueError("`rect_width` 以及 `round_corner` 仅在蒙版类型为矩形时允许设置")
-        if rect_width is None and (mask_type == Mask_type.矩形 or mask_type == CapCut_Mask_type.Rectangle):
+        if rect_width is None and (mask_type == metadata.Mask_type.矩形 or mask_type == metadata.CapCut_Mask_type.Rectangle):
             rect_width = size
         if round_corner is None:
             round_corner = 0
@@ -472,7 +479,7 @@ class Video_segment(Visual_segment):
         self.extra_material_refs.append(self.mask.global_id)
         return self
 
-    def add_transition(self, transition_type: Union[Transition_type, CapCut_Transition_type], *, duration: Optional[Union[int, str]] = None) -> "Video_segment":
+    def add_transition(self, transition_type: "Union[Transition_type, CapCut_Transition_type]", *, duration: Optional[Union[int, str]] = None) -> "Video_segment":
         """为视频片段添加转场, 注意转场应当添加在**前面的**片段上
 
         Args:
@@ -526,6 +533,8 @@ class Video_segment(Visual_segment):
 class Sticker_segment(Visual_segment):
     """安放在轨道上的一个贴纸片段"""
 
+    __slots__ = ("resource_id",)
+
     resource_id: str
     """贴纸资源id"""
 
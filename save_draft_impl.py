@@ -6,14 +6,16 @@ from util import zip_draft, is_windows_path
 from oss import upload_to_oss
 from typing import Dict, Literal
 from draft_cache import DRAFT_CACHE
-from save_task_cache import DRAFT_TASKS, get_task_status, update_tasks_cache, update_task_field, increment_task_field, update_task_fields, create_task
+from save_task_cache import DRAFT_TASKS, TERMINAL_TASK_STATUSES, get_task_status, increment_task_field, create_task, publish_task_progress, subscribe_task
 from downloader import download_audio, download_file, download_image, download_video
+from call_logging import run_in_call_context
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import imageio.v2 as imageio
 import subprocess
 import json
 from get_duration_impl import get_video_duration
 import uuid
+import queue
 import threading
 from collections import OrderedDict
 import time
@@ -55,15 +57,13 @@ def save_draft_background(draft_id, draft_folder, task_id):
     try:
         # Get draft information from global cache
         if draft_id not in DRAFT_CACHE:
-            task_status = {
-                "status": "failed",
-                "message": f"Draft {draft_id} does not exist in cache",
-                "progress": 0,
-                "completed_files": 0,
-                "total_files": 0,
-                "draft_url": ""
-            }
-            update_tasks_cache(task_id, task_status)  # Use new cache management function
+            publish_task_progress(task_id,
+                                  status="failed",
+                                  message=f"Draft {draft_id} does not exist in cache",
+                                  progress=0,
+                                  completed_files=0,
+                                  total_files=0,
+                                  draft_url="")
             logger.error(f"Draft {draft_id} does not exist in cache, task {task_id} failed.")
             return
             
@@ -71,15 +71,13 @@ def save_draft_background(draft_id, draft_folder, task_id):
         logger.info(f"Successfully retrieved draft {draft_id} from cache.")
         
         # Update task status to processing
-        task_status = {
-            "status": "processing",
-            "message": "Preparing draft files",
-            "progress": 0,
-            "completed_files": 0,
-            "total_files": 0,
-            "draft_url": ""
-        }
-        update_tasks_cache(task_id, task_status)  # Use new cache management function
+        publish_task_progress(task_id, force=True,
+                              status="processing",
+                              message="Preparing draft files",
+                              progress=0,
+                              completed_files=0,
+                              total_files=0,
+                              draft_url="")
         logger.info(f"Task {task_id} status updated to 'processing': Preparing draft files.")
         
         # Delete possibly existing draft_id folder
@@ -93,11 +91,11 @@ def save_draft_background(draft_id, draft_folder, task_id):
         draft_folder_for_duplicate = draft.Draft_folder(current_dir)
         # Choose different template directory based on configuration
         template_dir = "template" if IS_CAPCUT_ENV else "template_jianying"
-        draft_folder_for_duplicate.duplicate_as_template(template_dir, draft_id)
+        # draft_info.json is rewritten from the cached script below, so the copy is not parsed
+        draft_folder_for_duplicate.duplicate(template_dir, draft_id)
         
         # Update task status
-        update_task_field(task_id, "message", "Updating media file metadata")
-        update_task_field(task_id, "progress", 5)
+        publish_task_progress(task_id, force=True, message="Updating media file metadata", progress=5)
         logger.info(f"Task {task_id} progress 5%: Updating media file metadata.")
         
         update_media_metadata(script, task_id)
@@ -163,8 +161,10 @@ def save_draft_background(draft_id, draft_folder, task_id):
                         'material': video
                     })
 
-        update_task_field(task_id, "message", f"Collected {len(download_tasks)} download tasks in total")
-        update_task_field(task_id, "progress", 10)
+        publish_task_progress(task_id, force=True,
+                              message=f"Collected {len(download_tasks)} download tasks in total",
+                              progress=10,
+                              total_files=len(download_tasks))
         logger.info(f"Task {task_id} progress 10%: Collected {len(download_tasks)} download tasks in total.")
 
         # Execute all download tasks concurrently
@@ -175,9 +175,9 @@ def save_draft_background(draft_id, draft_folder, task_id):
             
             # Use thread pool for concurrent downloads, maximum concurrency of 16
             with ThreadPoolExecutor(max_workers=16) as executor:
-                # Submit all download tasks
+                # Submit all download tasks, their log records keep the fields of the calling request
                 future_to_task = {
-                    executor.submit(task['func'], *task['args']): task 
+                    executor.submit(run_in_call_context(task['func'], *task['args'])): task 
                     for task in download_tasks
                 }
                 
@@ -188,17 +188,15 @@ def save_draft_background(draft_id, draft_folder, task_id):
                         local_path = future.result()
                         downloaded_paths.append(local_path)
                         
-                        # Update task status - only update completed files count
+                        # Update task status - one rate-limited update per downloaded file
                         completed_files += 1
-                        update_task_field(task_id, "completed_files", completed_files)
-                        task_status = get_task_status(task_id)
-                        completed = task_status["completed_files"]
                         total = len(download_tasks)
-                        update_task_field(task_id, "total_files", total)
                         # Download part accounts for 60% of the total progress
-                        download_progress = 10 + int((completed / total) * 60)
-                        update_task_field(task_id, "progress", download_progress)
-                        update_task_field(task_id, "message", f"Downloaded {completed}/{total} files")
+                        download_progress = 10 + int((completed_files / total) * 60)
+                        publish_task_progress(task_id,
+                                              completed_files=completed_files,
+                                              progress=download_progress,
+                                              message=f"Downloaded {completed_files}/{total} files")
                         
                         logger.info(f"Task {task_id}: Successfully downloaded {task['type']} file, progress {download_progress}.")
                     except Exception as e:
@@ -208,8 +206,7 @@ def save_draft_background(draft_id, draft_folder, task_id):
             logger.info(f"Task {task_id}: Concurrent download completed, downloaded {len(downloaded_paths)} files in total.")
         
         # Update task status - Start saving draft information
-        update_task_field(task_id, "progress", 70)
-        update_task_field(task_id, "message", "Saving draft information")
+        publish_task_progress(task_id, force=True, progress=70, message="Saving draft information")
         logger.info(f"Task {task_id} progress 70%: Saving draft information.")
         
         script.dump(os.path.join(current_dir, f"{draft_id}/draft_info.json"))
@@ -219,8 +216,7 @@ def save_draft_background(draft_id, draft_folder, task_id):
         # Only upload draft information when IS_UPLOAD_DRAFT is True
         if IS_UPLOAD_DRAFT:
             # Update task status - Start compressing draft
-            update_task_field(task_id, "progress", 80)
-            update_task_field(task_id, "message", "Compressing draft files")
+            publish_task_progress(task_id, force=True, progress=80, message="Compressing draft files")
             logger.info(f"Task {task_id} progress 80%: Compressing draft files.")
             
             # Compress the entire draft directory
@@ -228,14 +224,13 @@ def save_draft_background(draft_id, draft_folder, task_id):
             logger.info(f"Draft directory {os.path.join(current_dir, draft_id)} has been compressed to {zip_path}.")
             
             # Update task status - Start uploading to OSS
-            update_task_field(task_id, "progress", 90)
-            update_task_field(task_id, "message", "Uploading to cloud storage")
+            publish_task_progress(task_id, force=True, progress=90, message="Uploading to cloud storage")
             logger.info(f"Task {task_id} progress 90%: Uploading to cloud storage.")
             
             # Upload to OSS
             draft_url = upload_to_oss(zip_path)
             logger.info(f"Draft archive has been uploaded to OSS, URL: {draft_url}")
-            update_task_field(task_id, "draft_url", draft_url)
+            publish_task_progress(task_id, draft_url=draft_url)
 
             # Clean up temporary files
             if os.path.exists(os.path.join(current_dir, draft_id)):
@@ -244,23 +239,56 @@ def save_draft_background(draft_id, draft_folder, task_id):
 
     
         # Update task status - Completed
-        update_task_field(task_id, "status", "completed")
-        update_task_field(task_id, "progress", 100)
-        update_task_field(task_id, "message", "Draft creation completed")
+        publish_task_progress(task_id, status="completed", progress=100, message="Draft creation completed")
         logger.info(f"Task {task_id} completed, draft URL: {draft_url}")
         return draft_url
 
     except Exception as e:
         # Update task status - Failed
-        update_task_fields(task_id, 
-                          status="failed",
-                          message=f"Failed to save draft: {str(e)}")
+        publish_task_progress(task_id,
+                              status="failed",
+                              message=f"Failed to save draft: {str(e)}")
         logger.error(f"Saving draft {draft_id} task {task_id} failed: {str(e)}", exc_info=True)
         return ""
 
 def query_task_status(task_id: str):
     return get_task_status(task_id)
 
+def stream_task_status(task_id: str, timeout: float = 600, keepalive: float = 15):
+    """
+    Yield the task status every time its progress is published, until the task completes or fails
+    :param task_id: Task ID, the task may be created after the stream is opened
+    :param timeout: Seconds after which the stream ends even if the task is still running
+    :param keepalive: Seconds without progress after which None is yielded so the caller can send a keepalive
+    :return: Generator of task status dictionaries (or None for keepalives)
+    """
+    updates = queue.Queue()
+    unsubscribe = subscribe_task(task_id, updates.put)
+    try:
+        deadline = time.monotonic() + timeout
+        task_status = get_task_status(task_id)
+        if task_status["status"] != "not_found":
+            yield task_status
+            if task_status["status"] in TERMINAL_TASK_STATUSES:
+                return
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                task_status = updates.get(timeout=min(keepalive, remaining))
+            except queue.Empty:
+                yield None
+                continue
+            # Only the latest of several queued updates is worth sending
+            while not updates.empty():
+                task_status = updates.get_nowait()
+            yield task_status
+            if task_status["status"] in TERMINAL_TASK_STATUSES:
+                return
+    finally:
+        unsubscribe()
+
 def save_draft_impl(draft_id: str, draft_folder: str = None) -> Dict[str, str]:
     """Start a background task to save the draft"""
     logger.info(f"Received save draft request: draft_id={draft_id}, draft_folder={draft_folder}")
@@ -337,7 +365,7 @@ def update_media_metadata(script, task_id=None):
                 duration_result = get_video_duration(remote_url)
                 if duration_result["success"]:
                     if task_id:
-                        update_task_field(task_id, "message", f"Processing audio metadata: {material_name}")
+                        publish_task_progress(task_id, message=f"Processing audio metadata: {material_name}")
                     # Convert seconds to microseconds
                     audio.duration = int(duration_result["output"] * 1000000)
                     logger.info(f"Successfully obtained audio {material_name} duration: {duration_result['output']:.2f} seconds ({audio.duration} microseconds).")
@@ -389,7 +417,7 @@ def update_media_metadata(script, task_id=None):
                 # Use imageio to get image width/height and set it
                 try:
                     if task_id:
-                        update_task_field(task_id, "message", f"Processing image metadata: {material_name}")
+                        publish_task_progress(task_id, message=f"Processing image metadata: {material_name}")
                     img = imageio.imread(remote_url)
                     video.height, video.width = img.shape[:2]
                     logger.info(f"Successfully set image {material_name} dimensions: {video.width}x{video.height}.")
@@ -402,7 +430,7 @@ def update_media_metadata(script, task_id=None):
                 # Get video duration and width/height information
                 try:
                     if task_id:
-                        update_task_field(task_id, "message", f"Processing video metadata: {material_name}")
+                        publish_task_progress(task_id, message=f"Processing video metadata: {material_name}")
                     # Use ffprobe to get video information
                     command = [
                         'ffprobe',
@@ -672,9 +700,9 @@ def download_script(draft_id: str, draft_folder: str = None, script_data: Dict =
             
             # Use thread pool for concurrent downloads, maximum concurrency of 16
             with ThreadPoolExecutor(max_workers=16) as executor:
-                # Submit all download tasks
+                # Submit all download tasks, their log records keep the fields of the calling request
                 future_to_task = {
-                    executor.submit(task['func'], *task['args']): task 
+                    executor.submit(run_in_call_context(task['func'], *task['args'])): task 
                     for task in download_tasks
                 }
                 
@@ -1,142 +1,243 @@
 from collections import OrderedDict
 import threading
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+from task_store import get_task_backend
+
+# Minimum seconds between two progress notifications of one task, intermediate notifications are skipped
+PROGRESS_MIN_INTERVAL = 0.25
+TERMINAL_TASK_STATUSES = ("completed", "failed")
+
+
+def default_task_status() -> dict:
+    """Status of a task that has just been created"""
+    return {
+        "status": "initialized",
+        "message": "Task initialized",
+        "progress": 0,
+        "completed_files": 0,
+        "total_files": 0,
+        "draft_url": ""
+    }
+
+
+class TaskState:
+    """Status of one task, updated in place under the task's own lock
+
+    Download threads of the same task contend only on this lock; the task index
+    (DRAFT_TASKS) is not touched by updates.
+    """
+
+    __slots__ = ("lock", "fields", "version", "updated_at", "last_published")
+
+    def __init__(self, fields: Optional[dict] = None):
+        self.lock = threading.Lock()
+        self.fields = default_task_status()
+        if fields:
+            self.fields.update(fields)
+        self.version = 0  # Incremented by every change, lets readers detect updates cheaply
+        self.updated_at = time.time()  # Wall-clock time of the last change, orders writes to the durable store
+        self.last_published = 0.0  # time.monotonic() of the last notification of subscribers
+
+    def update(self, fields: Dict[str, Any]) -> None:
+        with self.lock:
+            self.fields.update(fields)
+            self.version += 1
+            self.updated_at = time.time()
+
+    def replace(self, fields: Dict[str, Any]) -> None:
+        with self.lock:
+            self.fields = dict(fields)
+            self.version += 1
+            self.updated_at = time.time()
+
+    def increment(self, field: str, increment: int) -> None:
+        with self.lock:
+            value = self.fields.get(field)
+            self.fields[field] = value + increment if isinstance(value, (int, float)) else increment
+            self.version += 1
+            self.updated_at = time.time()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.fields)
+
+    def persist(self, task_id: str) -> None:
+        """Write the current status through to the durable backend, if one is configured"""
+        backend = get_task_backend()
+        if backend is not None:
+            with self.lock:
+                task_status, updated_at = dict(self.fields), self.updated_at
+            backend.save(task_id, task_status, updated_at)
+
 
 # Using OrderedDict to implement LRU cache, limiting the maximum number to 1000
-DRAFT_TASKS: Dict[str, dict] = OrderedDict()  # Using Dict for type hinting
+# Only creating and reading a task reorders it; field updates go to the TaskState directly
+DRAFT_TASKS: Dict[str, TaskState] = OrderedDict()  # Using Dict for type hinting
 MAX_TASKS_CACHE_SIZE = 1000
+_tasks_lock = threading.Lock()  # Guards DRAFT_TASKS itself, never held while a task is updated
+
+# Task ID -> callbacks receiving a copy of the task status after every publication
+TASK_SUBSCRIBERS: Dict[str, List[Callable[[dict], None]]] = {}
+_subscribers_lock = threading.Lock()
+
+
+def _get_or_create_task(task_id: str) -> TaskState:
+    """Return the state of a task, creating it with the default status if it does not exist"""
+    task = DRAFT_TASKS.get(task_id)
+    if task is not None:
+        return task
+    with _tasks_lock:
+        task = DRAFT_TASKS.get(task_id)
+        if task is None:
+            if len(DRAFT_TASKS) >= MAX_TASKS_CACHE_SIZE:
+                # If the cache is full, delete the least recently used item (the first item)
+                DRAFT_TASKS.popitem(last=False)
+            task = DRAFT_TASKS[task_id] = TaskState()
+        return task
 
 
 def update_tasks_cache(task_id: str, task_status: dict) -> None:
-    """Update task status LRU cache
-    
+    """Replace the whole task status, creating the task if needed, and mark it as most recently used
+
     :param task_id: Task ID
     :param task_status: Task status information dictionary
     """
-
-    if task_id in DRAFT_TASKS:
-        # If the key exists, delete the old item
-        DRAFT_TASKS.pop(task_id)
-    elif len(DRAFT_TASKS) >= MAX_TASKS_CACHE_SIZE:
-        # If the cache is full, delete the least recently used item (the first item)
-        DRAFT_TASKS.popitem(last=False)
-    # Add new item to the end (most recently used)
-    DRAFT_TASKS[task_id] = task_status
+    task = _get_or_create_task(task_id)
+    task.replace(task_status)
+    task.persist(task_id)
+    with _tasks_lock:
+        if task_id in DRAFT_TASKS:
+            DRAFT_TASKS.move_to_end(task_id)
 
 def update_task_field(task_id: str, field: str, value: Any) -> None:
     """Update a single field in the task status
-    
+
     :param task_id: Task ID
     :param field: Field name to update
     :param value: New value for the field
     """
-    if task_id in DRAFT_TASKS:
-        # Copy the current status, modify the specified field, then update the cache
-        task_status = DRAFT_TASKS[task_id].copy()
-        task_status[field] = value
-        # Delete the old item and add the updated item
-        DRAFT_TASKS.pop(task_id)
-        DRAFT_TASKS[task_id] = task_status
-    else:
-        # If the task doesn't exist, create a default status and set the specified field
-        task_status = {
-            "status": "initialized",
-            "message": "Task initialized",
-            "progress": 0,
-            "completed_files": 0,
-            "total_files": 0,
-            "draft_url": ""
-        }
-        task_status[field] = value
-        # If the cache is full, delete the least recently used item
-        if len(DRAFT_TASKS) >= MAX_TASKS_CACHE_SIZE:
-            DRAFT_TASKS.popitem(last=False)
-        # Add new item
-        DRAFT_TASKS[task_id] = task_status
+    # If the task doesn't exist, it is created with the default status first
+    task = _get_or_create_task(task_id)
+    task.update({field: value})
+    task.persist(task_id)
 
 def update_task_fields(task_id: str, **fields) -> None:
     """Update multiple fields in the task status
-    
+
     :param task_id: Task ID
     :param fields: Fields to update and their values, provided as keyword arguments
     """
-    if task_id in DRAFT_TASKS:
-        # Copy the current status, modify the specified fields, then update the cache
-        task_status = DRAFT_TASKS[task_id].copy()
-        for field, value in fields.items():
-            task_status[field] = value
-        # Delete the old item and add the updated item
-        DRAFT_TASKS.pop(task_id)
-        DRAFT_TASKS[task_id] = task_status
-    else:
-        # If the task doesn't exist, create a default status and set the specified fields
-        task_status = {
-            "status": "initialized",
-            "message": "Task initialized",
-            "progress": 0,
-            "completed_files": 0,
-            "total_files": 0,
-            "draft_url": ""
-        }
-        for field, value in fields.items():
-            task_status[field] = value
-        # If the cache is full, delete the least recently used item
-        if len(DRAFT_TASKS) >= MAX_TASKS_CACHE_SIZE:
-            DRAFT_TASKS.popitem(last=False)
-        # Add new item
-        DRAFT_TASKS[task_id] = task_status
+    # If the task doesn't exist, it is created with the default status first
+    task = _get_or_create_task(task_id)
+    task.update(fields)
+    task.persist(task_id)
 
 def increment_task_field(task_id: str, field: str, increment: int = 1) -> None:
     """Increment a numeric field in the task status
-    
+
     :param task_id: Task ID
     :param field: Field name to increment
     :param increment: Value to increment by, default is 1
     """
-    if task_id in DRAFT_TASKS:
-        # Copy the current status, increment the specified field, then update the cache
-        task_status = DRAFT_TASKS[task_id].copy()
-        if field in task_status and isinstance(task_status[field], (int, float)):
-            task_status[field] += increment
-        else:
-            task_status[field] = increment
-        # Delete the old item and add the updated item
-        DRAFT_TASKS.pop(task_id)
-        DRAFT_TASKS[task_id] = task_status
+    task = DRAFT_TASKS.get(task_id)
+    if task is not None:
+        task.increment(field, increment)
+        task.persist(task_id)
 
 def get_task_status(task_id: str) -> dict:
     """Get task status
-    
+
+    With a durable backend, the newer of this process's status and the stored one is returned,
+    so tasks run by other workers or before a restart are found as well.
+
     :param task_id: Task ID
-    :return: Task status information dictionary
+    :return: Copy of the task status information dictionary
     """
-    task_status = DRAFT_TASKS.get(task_id, {
-        "status": "not_found",
-        "message": "Task does not exist",
-        "progress": 0,
-        "completed_files": 0,
-        "total_files": 0,
-        "draft_url": ""
-    })
-    
-    # If the task is found, update its position in the LRU cache
-    if task_id in DRAFT_TASKS:
-        # First delete, then add to the end, implementing LRU update
-        update_tasks_cache(task_id, task_status)
-        
-    return task_status
+    with _tasks_lock:
+        task = DRAFT_TASKS.get(task_id)
+        if task is not None:
+            # Reading a task marks it as most recently used
+            DRAFT_TASKS.move_to_end(task_id)
+
+    backend = get_task_backend()
+    stored = backend.load(task_id) if backend is not None else None
+    if stored is not None:
+        stored_status, stored_at = stored
+        if task is None or stored_at > task.updated_at:
+            return stored_status
+
+    if task is None:
+        return {
+            "status": "not_found",
+            "message": "Task does not exist",
+            "progress": 0,
+            "completed_files": 0,
+            "total_files": 0,
+            "draft_url": ""
+        }
+    return task.snapshot()
 
 def create_task(task_id: str) -> None:
     """Create a new task and initialize its status
-    
+
     :param task_id: Task ID
     """
-    task_status = {
-        "status": "initialized",
-        "message": "Task initialized",
-        "progress": 0,
-        "completed_files": 0,
-        "total_files": 0,
-        "draft_url": ""
-    }
-    update_tasks_cache(task_id, task_status)
\ No newline at end of file
+    update_tasks_cache(task_id, default_task_status())
+
+def subscribe_task(task_id: str, callback: Callable[[dict], None]) -> Callable[[], None]:
+    """Call callback with a copy of the task status every time progress is published for the task
+
+    The callback runs in the publishing thread and must not block; the task does not need to exist yet.
+
+    :param task_id: Task ID
+    :param callback: Function receiving the task status dictionary
+    :return: Function that removes the subscription
+    """
+    with _subscribers_lock:
+        TASK_SUBSCRIBERS.setdefault(task_id, []).append(callback)
+
+    def unsubscribe() -> None:
+        with _subscribers_lock:
+            callbacks = TASK_SUBSCRIBERS.get(task_id, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                TASK_SUBSCRIBERS.pop(task_id, None)
+    return unsubscribe
+
+def publish_task_progress(task_id: str, force: bool = False, **fields) -> bool:
+    """Update the task status with all fields of one progress event at once and notify subscribers
+
+    The fields are always written, so queries see every event. Notifications of one task are rate
+    limited to one per PROGRESS_MIN_INTERVAL seconds: a skipped notification is covered by the next
+    one, which carries the full status. Events that change the status to completed or failed are
+    always notified.
+
+    :param task_id: Task ID
+    :param force: Notify even if the previous notification is more recent than PROGRESS_MIN_INTERVAL
+    :param fields: Fields to update and their values, provided as keyword arguments
+    :return: Whether subscribers were notified (False if the notification was skipped)
+    """
+    task = _get_or_create_task(task_id)
+    now = time.monotonic()
+    with task.lock:
+        task.fields.update(fields)
+        task.version += 1
+        task.updated_at = time.time()
+        notify = force or fields.get("status") in TERMINAL_TASK_STATUSES \
+            or now - task.last_published >= PROGRESS_MIN_INTERVAL
+        if notify:
+            task.last_published = now
+        task_status = dict(task.fields)
+
+    task.persist(task_id)
+    if not notify:
+        return False
+
+    with _subscribers_lock:
+        callbacks = list(TASK_SUBSCRIBERS.get(task_id, []))
+    for callback in callbacks:
+        callback(dict(task_status))
+    return True
@@ -0,0 +1,221 @@
+"""Server-side search over the effect, animation, transition, mask and font catalogs.
+
+The catalogs behind the ``/get_*_types`` endpoints are indexed once per process,
+on the first search. Every entry is keyed by its enum member name, its display
+name and, when the optional ``pypinyin`` package is installed, the pinyin
+spelling and initials of Chinese names. An inverted index from character
+unigrams/bigrams to entries limits scoring to entries that share at least one
+gram with the query; candidates are then ranked exact match > prefix match >
+substring match > fuzzy (bigram Dice similarity) match.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pyJianYingDraft as draft
+from settings.local import IS_CAPCUT_ENV
+
+try:
+    from pypinyin import lazy_pinyin, Style
+except ImportError:
+    lazy_pinyin = None
+
+# Category -> [(enum name in pyJianYingDraft, type label)], mirroring the /get_*_types endpoints
+CAPCUT_CATEGORIES = {
+    "intro_animation": [("CapCut_Intro_type", None)],
+    "outro_animation": [("CapCut_Outro_type", None)],
+    "combo_animation": [("CapCut_Group_animation_type", None)],
+    "transition": [("CapCut_Transition_type", None)],
+    "mask": [("CapCut_Mask_type", None)],
+    "audio_effect": [("CapCut_Voice_filters_effect_type", "Voice_filters"),
+                     ("CapCut_Voice_characters_effect_type", "Voice_characters"),
+                     ("CapCut_Speech_to_song_effect_type", "Speech_to_song")],
+    "font": [("Font_type", None)],
+    "text_intro": [("CapCut_Text_intro", None)],
+    "text_outro": [("CapCut_Text_outro", None)],
+    "text_loop_anim": [("CapCut_Text_loop_anim", None)],
+    "video_scene_effect": [("CapCut_Video_scene_effect_type", None)],
+    "video_character_effect": [("CapCut_Video_character_effect_type", None)],
+}
+JIANYING_CATEGORIES = {
+    "intro_animation": [("Intro_type", None)],
+    "outro_animation": [("Outro_type", None)],
+    "combo_animation": [("Group_animation_type", None)],
+    "transition": [("Transition_type", None)],
+    "mask": [("Mask_type", None)],
+    "audio_effect": [("Tone_effect_type", "Tone"),
+                     ("Audio_scene_effect_type", "Audio_scene"),
+                     ("Speech_to_song_type", "Speech_to_song")],
+    "font": [("Font_type", None)],
+    "text_intro": [("Text_intro", None)],
+    "text_outro": [("Text_outro", None)],
+    "text_loop_anim": [("Text_loop_anim", None)],
+    "video_scene_effect": [("Video_scene_effect_type", None)],
+    "video_character_effect": [("Video_character_effect_type", None)],
+}
+
+MAX_LIMIT = 100  # Largest page size a single search may return
+FUZZY_THRESHOLD = 0.4  # Minimum bigram Dice similarity for a fuzzy match
+
+
+def normalize(text: str) -> str:
+    """Normalize a name the same way as ``Effect_enum.from_name``: case, spaces and underscores are ignored,
+    so an exact search hit is a name ``from_name`` accepts"""
+    return text.lower().replace(" ", "").replace("_", "")
+
+
+def bigrams(text: str) -> Set[str]:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def search_keys(*names: str) -> List[str]:
+    """Normalized search keys of an entry, including pinyin spellings of Chinese names when available"""
+    keys = []
+    for name in names:
+        if not name:
+            continue
+        candidates = [name]
+        if lazy_pinyin is not None and any("一" <= ch <= "鿿" for ch in name):
+            candidates.append("".join(lazy_pinyin(name)))
+            candidates.append("".join(lazy_pinyin(name, style=Style.FIRST_LETTER)))
+        for candidate in candidates:
+            key = normalize(candidate)
+            if key and key not in keys:
+                keys.append(key)
+    return keys
+
+
+class CatalogIndex:
+    """Prebuilt search index over the catalogs of one environment (CapCut or JianYing)"""
+
+    def __init__(self, categories: Dict[str, List[Tuple[str, Optional[str]]]]):
+        self.entries: List[Dict[str, Any]] = []  # Response items, in catalog order
+        self.keys: List[List[str]] = []  # Normalized search keys per entry
+        self.postings: Dict[str, Set[int]] = {}  # Unigram/bigram -> entry indices
+
+        for category, enums in categories.items():
+            for enum_name, type_label in enums:
+                for name, member in getattr(draft, enum_name).__members__.items():
+                    meta = member.value
+                    title = getattr(meta, "name", None) or getattr(meta, "title", None) or name
+                    params = [{
+                        "name": param.name,
+                        "default_value": param.default_value * 100,
+                        "min_value": param.min_value * 100,
+                        "max_value": param.max_value * 100
+                    } for param in getattr(meta, "params", [])]
+                    self.add_entry({
+                        "name": name,
+                        "title": title,
+                        "category": category,
+                        "type": type_label,
+                        "is_vip": bool(getattr(meta, "is_vip", False)),
+                        "params": params
+                    }, search_keys(name, title))
+
+    def add_entry(self, entry: Dict[str, Any], keys: List[str]) -> None:
+        index = len(self.entries)
+        self.entries.append(entry)
+        self.keys.append(keys)
+        for key in keys:
+            for gram in set(key) | bigrams(key):
+                self.postings.setdefault(gram, set()).add(index)
+
+    def score(self, query: str, query_grams: Set[str], index: int) -> float:
+        """Ranking score of one entry: 4 for an exact match, 2 + x for a prefix match, 1 + x for a substring match
+        and x for a fuzzy match, where x is the fraction of the key covered by the query (or the bigram similarity)"""
+        best = 0.0
+        for key in self.keys[index]:
+            if key == query:
+                return 4.0
+            if key.startswith(query):
+                best = max(best, 2.0 + len(query) / len(key))
+            elif query in key:
+                best = max(best, 1.0 + len(query) / len(key))
+            elif best < 1.0:
+                key_grams = bigrams(key)
+                dice = 2 * len(query_grams & key_grams) / (len(query_grams) + len(key_grams))
+                if dice >= FUZZY_THRESHOLD:
+                    best = max(best, dice)
+        return best
+
+    def search(self, query: str = "", categories: Optional[List[str]] = None,
+               is_vip: Optional[bool] = None, has_params: Optional[bool] = None,
+               offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+        query = normalize(query or "")
+        if query:
+            query_grams = bigrams(query)
+            candidates: Set[int] = set()
+            for gram in query_grams:
+                candidates |= self.postings.get(gram, set())
+        else:
+            candidates = set(range(len(self.entries)))
+
+        matches = []
+        for index in candidates:
+            entry = self.entries[index]
+            if categories and entry["category"] not in categories:
+                continue
+            if is_vip is not None and entry["is_vip"] != is_vip:
+                continue
+            if has_params is not None and bool(entry["params"]) != has_params:
+                continue
+            score = self.score(query, query_grams, index) if query else 0.0
+            if query and score <= 0:
+                continue
+            matches.append((score, index))
+        matches.sort(key=lambda item: (-item[0], item[1]))  # Best matches first, ties in catalog order
+
+        page = matches[offset:offset + limit]
+        return {
+            "total": len(matches),
+            "offset": offset,
+            "limit": limit,
+            "items": [dict(self.entries[index], score=round(score, 3)) for score, index in page]
+        }
+
+
+_index: Optional[CatalogIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_catalog_index() -> CatalogIndex:
+    """Return the search index of the current environment, building it on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CatalogIndex(CAPCUT_CATEGORIES if IS_CAPCUT_ENV else JIANYING_CATEGORIES)
+    return _index
+
+
+def search_catalog_impl(
+    query: str = "",
+    category: Optional[Any] = None,
+    is_vip: Optional[bool] = None,
+    has_params: Optional[bool] = None,
+    offset: int = 0,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """
+    Search the effect/animation/transition/mask/font catalogs by name
+    :param query: Search text, matched against enum names, display names and (if pypinyin is installed) pinyin; empty lists everything
+    :param category: Category name or list of category names to search in, e.g. "transition" or ["intro_animation", "outro_animation"]
+    :param is_vip: Only return VIP (True) or free (False) entries
+    :param has_params: Only return entries with (True) or without (False) adjustable parameters
+    :param offset: Number of matches to skip
+    :param limit: Maximum number of matches to return, at most 100
+    :return: Total match count and the requested page of ranked matches
+    """
+    categories = None
+    if category:
+        categories = [category] if isinstance(category, str) else list(category)
+        valid = CAPCUT_CATEGORIES if IS_CAPCUT_ENV else JIANYING_CATEGORIES
+        unknown = [name for name in categories if name not in valid]
+        if unknown:
+            raise ValueError(f"Unknown catalog category: {', '.join(unknown)}. Supported categories: {', '.join(valid)}")
+
+    offset = max(0, int(offset))
+    limit = min(max(1, int(limit)), MAX_LIMIT)
+    return get_catalog_index().search(query, categories, is_vip, has_params, offset, limit)
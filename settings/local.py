@@ -23,6 +23,34 @@ IS_UPLOAD_DRAFT = False
 # 端口号
 PORT = 9000
 
+# ASGI模式(capcut_asgi.py)下执行保存草稿等阻塞任务的线程数
+ASGI_BLOCKING_WORKERS = 16
+
+# MCP服务器(mcp_server.py)同时执行的工具调用数, 超出的调用排队等待
+MCP_MAX_CONCURRENCY = 8
+
+# MCP服务器以socket方式运行(--listen)时的最大同时连接数, 以及单个连接同时执行的工具调用数
+MCP_MAX_CONNECTIONS = 64
+MCP_CONNECTION_MAX_CALLS = 4
+
+# 保存任务状态的存储后端: "memory"仅保存在当前进程中, "sqlite"写入文件, 可在多个进程间共享且重启后仍然保留
+TASK_STORE_BACKEND = "memory"
+
+# sqlite后端的数据库文件路径
+TASK_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "task_status.db")
+
+# 任务状态在最后一次更新后保留的秒数(仅对sqlite后端有效)
+TASK_STATUS_TTL = 86400
+
+# /render_template_batch可读写的根目录, 请求中的模板、替换表及输出目录均须位于其中
+TEMPLATE_BATCH_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "template_batch")
+
+# 下载远程字幕文件的超时秒数
+SUBTITLE_FETCH_TIMEOUT = 30
+
+# 已下载的远程字幕在多少秒内直接复用而不再请求服务器, 超过后以ETag/Last-Modified向服务器确认是否变化
+SUBTITLE_CACHE_TTL = 300
+
 OSS_CONFIG = []
 MP4_OSS_CONFIG=[]
 
@@ -45,6 +73,36 @@ if os.path.exists(CONFIG_FILE_PATH):
             if "port" in local_config:
                 PORT = local_config["port"]
 
+            # 更新ASGI阻塞任务线程数
+            if "asgi_blocking_workers" in local_config:
+                ASGI_BLOCKING_WORKERS = local_config["asgi_blocking_workers"]
+
+            # 更新MCP并发工具调用数
+            if "mcp_max_concurrency" in local_config:
+                MCP_MAX_CONCURRENCY = local_config["mcp_max_concurrency"]
+            if "mcp_max_connections" in local_config:
+                MCP_MAX_CONNECTIONS = local_config["mcp_max_connections"]
+            if "mcp_connection_max_calls" in local_config:
+                MCP_CONNECTION_MAX_CALLS = local_config["mcp_connection_max_calls"]
+
+            # 更新任务状态存储配置, 数据库文件的相对路径相对于项目目录
+            if "task_store_backend" in local_config:
+                TASK_STORE_BACKEND = local_config["task_store_backend"]
+            if "task_store_path" in local_config:
+                TASK_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), local_config["task_store_path"])
+            if "task_status_ttl" in local_config:
+                TASK_STATUS_TTL = local_config["task_status_ttl"]
+
+            # 更新模板批量渲染的根目录, 相对路径相对于项目目录
+            if "template_batch_root" in local_config:
+                TEMPLATE_BATCH_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), local_config["template_batch_root"])
+
+            # 更新远程字幕下载配置
+            if "subtitle_fetch_timeout" in local_config:
+                SUBTITLE_FETCH_TIMEOUT = local_config["subtitle_fetch_timeout"]
+            if "subtitle_cache_ttl" in local_config:
+                SUBTITLE_CACHE_TTL = local_config["subtitle_cache_ttl"]
+
             # 更新预览路由
             if "preview_router" in local_config:
                 PREVIEW_ROUTER = local_config["preview_router"]
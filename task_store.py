@@ -0,0 +1,112 @@
+"""Durable backends for save task status.
+
+``save_task_cache`` keeps the live status of the tasks running in this process
+in memory. When a durable backend is configured (``task_store_backend`` in
+config.json), every change is also written through to it, and status queries
+fall back to it, so a status is found by any worker process sharing the store
+and completed results (``draft_url``) survive restarts until they expire.
+
+Backends:
+
+* ``memory``: no durable store, the default and the previous behavior;
+* ``sqlite``: one SQLite file (WAL mode) shared by every process on the host,
+  entries expire ``task_status_ttl`` seconds after their last update.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from settings.local import TASK_STORE_BACKEND, TASK_STORE_PATH, TASK_STATUS_TTL
+
+PURGE_EVERY = 500  # Writes between two deletions of expired entries
+
+
+class TaskStatusBackend:
+    """Interface of a durable task status store"""
+
+    def save(self, task_id: str, task_status: dict, updated_at: float) -> None:
+        """Store the status of a task, unless the stored one was updated later than updated_at"""
+        raise NotImplementedError
+
+    def load(self, task_id: str) -> Optional[Tuple[dict, float]]:
+        """Return the unexpired status of a task and the time it was updated, or None"""
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were deleted"""
+        raise NotImplementedError
+
+
+class SQLiteTaskBackend(TaskStatusBackend):
+    """Task status table in a SQLite file, safe to share between processes"""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()  # One connection per thread
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_status (
+                    task_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS task_status_expires_at ON task_status (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, task_id: str, task_status: dict, updated_at: float) -> None:
+        with self._connection() as conn:
+            # Writers may race, the row only moves forward in time
+            conn.execute("""
+                INSERT INTO task_status (task_id, status, updated_at, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (task_id) DO UPDATE SET
+                    status = excluded.status, updated_at = excluded.updated_at, expires_at = excluded.expires_at
+                WHERE excluded.updated_at >= task_status.updated_at""",
+                         (task_id, json.dumps(task_status, ensure_ascii=False), updated_at, updated_at + self.ttl))
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def load(self, task_id: str) -> Optional[Tuple[dict, float]]:
+        row = self._connection().execute(
+            "SELECT status, updated_at FROM task_status WHERE task_id = ? AND expires_at > ?",
+            (task_id, time.time())).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def purge_expired(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("DELETE FROM task_status WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+_backend: Optional[TaskStatusBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_task_backend() -> Optional[TaskStatusBackend]:
+    """Return the durable backend selected in the settings, None for the in-memory store"""
+    global _backend
+    if _backend is None and TASK_STORE_BACKEND != "memory":
+        with _backend_lock:
+            if _backend is None:
+                if TASK_STORE_BACKEND == "sqlite":
+                    _backend = SQLiteTaskBackend(TASK_STORE_PATH, TASK_STATUS_TTL)
+                else:
+                    raise ValueError(f"Unknown task store backend: {TASK_STORE_BACKEND}, supported backends: memory, sqlite")
+    return _backend
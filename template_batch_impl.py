@@ -0,0 +1,246 @@
+"""Render many variants of one template draft in a process pool.
+
+A substitution table (CSV or JSONL) lists one variant per row:
+
+* ``name``: name of the generated draft folder, required;
+* ``text:<track name>:<segment index>``: new text of that segment, see
+  ``Script_file.replace_text`` (a list of strings for text templates, JSONL only);
+* ``video:<material name>`` / ``audio:<material name>``: URL or local path of the
+  material replacing the template material of that name, see
+  ``Script_file.replace_material_by_name``. In JSONL the value may also be an
+  object with ``url`` or ``path`` and optionally ``duration`` (seconds),
+  ``width``, ``height`` and ``material_type``; metadata that is not given is
+  taken from the replaced material, so no media probing is needed.
+
+Each worker process is started from a fork server (the caller may be a threaded
+web server, whose locks must not be inherited), loads the template once in its
+initializer and renders each variant from a ``Script_file.new_variant`` of it,
+which shares tracks and materials with the template instead of copying them.
+"""
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+import pyJianYingDraft as draft
+
+logger = logging.getLogger('flask_video_generator')
+
+# Template loaded in this process: ((path of draft_info.json, mtime), parsed draft)
+_worker_template: Optional[tuple] = None
+
+
+def load_substitutions(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a substitution table, one variant per CSV row or JSONL line
+    :param path: Path of a .csv file (with a header row) or a .jsonl file
+    :return: List of variants, each a dictionary of column name -> value
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            # Empty cells mean "keep the template value"
+            return [{key: value for key, value in row.items() if value not in (None, "")} for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _template_json_path(template_path: str) -> str:
+    """Accept either a draft folder or its draft_info.json"""
+    if os.path.isdir(template_path):
+        return os.path.join(template_path, "draft_info.json")
+    return template_path
+
+
+def _get_template(json_path: str) -> draft.Script_file:
+    """Return the template draft of this process, loading it on first use"""
+    global _worker_template
+    key = (json_path, os.stat(json_path).st_mtime_ns)
+    if _worker_template is None or _worker_template[0] != key:
+        _worker_template = (key, draft.Script_file.load_template(json_path))
+    return _worker_template[1]
+
+
+def _init_worker(json_path: str) -> None:
+    """Worker process initializer: load the template before the first chunk arrives"""
+    _get_template(json_path)
+
+
+def resolve_in_root(path: str, root: str) -> str:
+    """
+    Resolve a path given by a client against a root directory, refusing anything outside of it
+    :param path: Path relative to root (an absolute path must also lie inside root)
+    :param root: Directory the path must stay in
+    :return: The resolved absolute path
+    :raises ValueError: The path leaves root, also through symbolic links
+    """
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Path is outside of the allowed directory: {path}")
+    return resolved
+
+
+def _check_variant_name(name: Any, output_folder: str) -> str:
+    """Return the draft folder of a variant, refusing names that are not a single plain folder name"""
+    if not isinstance(name, str) or not name or name in (".", "..") \
+            or any(sep in name for sep in ("/", "\\", os.sep, os.altsep) if sep):
+        raise ValueError(f"Invalid variant name: {name!r}")
+    draft_path = os.path.join(output_folder, name)
+    if os.path.dirname(os.path.realpath(draft_path)) != os.path.realpath(output_folder):
+        raise ValueError(f"Variant folder leaves the output folder: {name!r}")
+    return draft_path
+
+
+def _build_material(script: draft.Script_file, kind: str, material_name: str,
+                    value: Union[str, Dict[str, Any]]) -> Union[draft.Video_material, draft.Audio_material]:
+    """Create the replacement material, taking missing metadata from the template material it replaces"""
+    spec = value if isinstance(value, dict) else {"url": value}
+    source = spec.get("url") or spec.get("path")
+    if not source:
+        raise ValueError(f"Replacement for {kind} '{material_name}' needs a url or path")
+    is_url = "://" in source
+    new_name = spec.get("material_name") or os.path.basename(source.split("?")[0])
+
+    material_type = f"{kind}s"
+    positions = script.material_index.find_by_name(material_type, material_name)
+    if not positions:
+        raise draft.exceptions.MaterialNotFound(f"Template has no {kind} material named '{material_name}'")
+    original = script.imported_materials[material_type][positions[0]]
+    duration = spec.get("duration", original.get("duration", 0) / 1e6)
+
+    if kind == "video":
+        return draft.Video_material(
+            material_type=spec.get("material_type", original.get("type", "video")),
+            path=None if is_url else source,
+            remote_url=source if is_url else None,
+            material_name=new_name,
+            duration=duration,
+            width=spec.get("width", original.get("width", 0)),
+            height=spec.get("height", original.get("height", 0)))
+    return draft.Audio_material(
+        path=None if is_url else source,
+        remote_url=source if is_url else None,
+        material_name=new_name,
+        duration=duration)
+
+
+def _render_variant(json_path: str, output_folder: str, variant: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one variant into output_folder/<name>, never raises"""
+    name = variant.get("name")
+    result = {"name": name, "success": False, "path": "", "error": ""}
+    try:
+        draft_path = _check_variant_name(name, output_folder)
+        template = _get_template(json_path)
+        script = template.new_variant()
+
+        for column, value in variant.items():
+            if column == "name":
+                continue
+            kind, _, target = column.partition(":")
+            if kind == "text":
+                track_name, _, segment_index = target.rpartition(":")
+                track = script.get_imported_track(draft.Track_type.text, name=track_name)
+                script.replace_text(track, int(segment_index), value)
+            elif kind in ("video", "audio"):
+                script.replace_material_by_name(target, _build_material(script, kind, target, value))
+            else:
+                raise ValueError(f"Unsupported column: {column}")
+
+        template_folder = os.path.dirname(json_path)
+        if os.path.exists(os.path.join(template_folder, "draft_meta_info.json")):
+            # The template is a draft folder, the variant gets its other files as well
+            shutil.copytree(template_folder, draft_path, dirs_exist_ok=True,
+                            ignore=shutil.ignore_patterns(os.path.basename(json_path)))
+        else:
+            os.makedirs(draft_path, exist_ok=True)
+        script.dump(os.path.join(draft_path, "draft_info.json"))
+
+        result["success"] = True
+        result["path"] = draft_path
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _render_chunk(json_path: str, output_folder: str, variants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [_render_variant(json_path, output_folder, variant) for variant in variants]
+
+
+def render_template_batch_impl(
+    template_path: str,
+    variants: Union[str, List[Dict[str, Any]]],
+    output_folder: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 16
+) -> Dict[str, Any]:
+    """
+    Render one draft per variant from a template draft, in parallel worker processes
+    :param template_path: Template draft folder, or the path of its draft_info.json
+    :param variants: Substitution table path (.csv or .jsonl) or the list of variants itself, see the module docstring
+    :param output_folder: Folder receiving one draft folder per variant, created if missing
+    :param workers: Number of worker processes, default is the number of CPUs; 0 renders in this process
+    :param chunk_size: Variants sent to a worker at a time, at least 1
+    :return: Counts, throughput and one result per variant in input order ({name, success, path, error});
+             a name used by an earlier variant is reported as a failure instead of overwriting its draft
+    """
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer, got {chunk_size!r}")
+    json_path = os.path.abspath(_template_json_path(template_path))
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"Template draft_info.json not found: {json_path}")
+    if isinstance(variants, str):
+        variants = load_substitutions(variants)
+    if not isinstance(variants, list) or not all(isinstance(variant, dict) for variant in variants):
+        raise ValueError("variants must be a list of objects")
+    os.makedirs(output_folder, exist_ok=True)
+    output_folder = os.path.abspath(output_folder)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    start = time.perf_counter()
+    # Load the template here first, so an invalid template fails the call instead of every variant
+    _get_template(json_path)
+
+    # Two variants with the same name would write the same folder, only the first one is rendered
+    results: List[Optional[Dict[str, Any]]] = [None] * len(variants)
+    to_render: List[int] = []
+    seen_names = set()
+    for index, variant in enumerate(variants):
+        name = variant.get("name")
+        if isinstance(name, str) and name in seen_names:
+            results[index] = {"name": name, "success": False, "path": "", "error": f"Duplicate variant name: {name!r}"}
+        else:
+            seen_names.add(name if isinstance(name, str) else None)
+            to_render.append(index)
+
+    chunks = [[variants[index] for index in to_render[i:i + chunk_size]] for i in range(0, len(to_render), chunk_size)]
+    rendered: List[Dict[str, Any]] = []
+    if workers == 0 or len(chunks) <= 1:
+        for chunk in chunks:
+            rendered.extend(_render_chunk(json_path, output_folder, chunk))
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context,
+                                 initializer=_init_worker, initargs=(json_path,)) as executor:
+            for chunk_results in executor.map(_render_chunk, [json_path] * len(chunks),
+                                              [output_folder] * len(chunks), chunks):
+                rendered.extend(chunk_results)
+    for index, result in zip(to_render, rendered):
+        results[index] = result
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for result in results if not result["success"])
+    logger.info(f"Rendered {len(results) - failed} of {len(results)} variants of {json_path} in {elapsed:.2f}s, {failed} failed.")
+    return {
+        "success": failed == 0,
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "variants_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else 0.0,
+        "results": results
+    }
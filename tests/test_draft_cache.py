@@ -0,0 +1,92 @@
+"""Tests of the draft cache and the per-draft locks (draft_cache)."""
+import threading
+
+import pytest
+
+import draft_cache
+from draft_cache import DRAFT_CACHE, DRAFT_LOCKS, get_draft_lock, remove_from_cache, update_cache
+
+
+@pytest.fixture(autouse=True)
+def small_cache(monkeypatch):
+    """Start every test with an empty cache holding at most two drafts"""
+    monkeypatch.setattr(draft_cache, "MAX_CACHE_SIZE", 2)
+    DRAFT_CACHE.clear()
+    DRAFT_LOCKS.clear()
+    yield
+    DRAFT_CACHE.clear()
+    DRAFT_LOCKS.clear()
+
+
+def test_eviction_skips_drafts_in_use():
+    update_cache("a", "draft a")
+    update_cache("b", "draft b")
+    with get_draft_lock("a"):
+        update_cache("c", "draft c")  # "a" is the least recently used but locked by this thread
+        assert list(DRAFT_CACHE) == ["a", "c"]
+        assert "a" in DRAFT_LOCKS
+
+    update_cache("d", "draft d")
+    assert list(DRAFT_CACHE) == ["c", "d"]
+    assert "a" not in DRAFT_LOCKS
+
+
+def test_waiting_caller_keeps_the_lock_registered():
+    """A caller waiting for a draft's lock must not lose it to eviction, or two locks would guard one draft"""
+    update_cache("a", "draft a")
+    update_cache("b", "draft b")
+    holding, waiting, release = threading.Event(), threading.Event(), threading.Event()
+    order = []
+
+    def holder():
+        with get_draft_lock("a"):
+            holding.set()
+            release.wait()
+            order.append("holder")
+
+    def waiter():
+        waiting.set()
+        with get_draft_lock("a"):
+            order.append("waiter")
+
+    threads = [threading.Thread(target=holder), threading.Thread(target=waiter)]
+    threads[0].start()
+    holding.wait()
+    threads[1].start()
+    waiting.wait()
+    while DRAFT_LOCKS["a"].users < 2:
+        pass
+
+    update_cache("c", "draft c")  # Must evict "b", not the locked "a"
+    assert list(DRAFT_CACHE) == ["a", "c"]
+    acquired = threading.Event()
+
+    def third():
+        with get_draft_lock("a"):
+            acquired.set()
+
+    thread = threading.Thread(target=third)
+    thread.start()
+    assert not acquired.wait(0.05)  # The same lock, still held by the holder
+    release.set()
+    for t in threads + [thread]:
+        t.join()
+    assert order == ["holder", "waiter"]
+
+
+def test_locks_of_uncached_drafts_are_dropped():
+    with get_draft_lock("missing"):
+        assert "missing" in DRAFT_LOCKS
+    assert "missing" not in DRAFT_LOCKS
+
+    update_cache("a", "draft a")
+    with get_draft_lock("a"):
+        remove_from_cache("a")
+        assert "a" in DRAFT_LOCKS  # Still in use
+    assert "a" not in DRAFT_LOCKS
+
+    update_cache("b", "draft b")
+    with get_draft_lock("b"):
+        pass
+    remove_from_cache("b")
+    assert DRAFT_LOCKS == {}
@@ -0,0 +1,142 @@
+"""Concurrency and persistence tests of the save task store (save_task_cache, task_store)."""
+import sys
+import threading
+import time
+
+import pytest
+
+import save_task_cache
+from save_task_cache import (create_task, get_task_status, increment_task_field, publish_task_progress,
+                             subscribe_task, update_task_fields)
+from task_store import SQLiteTaskBackend
+
+THREADS = 32
+TASKS = 4
+UPDATES = 1000
+READERS = 4
+
+
+@pytest.fixture(autouse=True)
+def clean_task_store():
+    """Start every test with no tasks or subscribers and a small thread switch interval"""
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # Switch threads often, so races are likely to show up
+    save_task_cache.DRAFT_TASKS.clear()
+    save_task_cache.TASK_SUBSCRIBERS.clear()
+    yield
+    save_task_cache.DRAFT_TASKS.clear()
+    save_task_cache.TASK_SUBSCRIBERS.clear()
+    sys.setswitchinterval(switch_interval)
+
+
+def test_concurrent_increments_are_not_lost():
+    """Writers share tasks, the way the download threads of save_draft_background report progress,
+    while readers poll the status and other tasks are created concurrently; no increment may be lost."""
+    task_ids = [f"stress_{i}" for i in range(TASKS)]
+    expected = THREADS // TASKS * UPDATES
+    for task_id in task_ids:
+        create_task(task_id)
+        update_task_fields(task_id, status="processing", total_files=expected)
+
+    errors = []
+    published = {task_id: 0 for task_id in task_ids}
+    published_lock = threading.Lock()
+
+    def on_progress(task_status):
+        with published_lock:
+            published[task_status["task"]] += 1
+
+    unsubscribes = [subscribe_task(task_id, on_progress) for task_id in task_ids]
+    stop = threading.Event()
+
+    def writer(index):
+        task_id = task_ids[index % TASKS]
+        try:
+            for i in range(UPDATES):
+                increment_task_field(task_id, "completed_files")
+                if i % 16 == 0:
+                    update_task_fields(task_id, message=f"writer {index} at {i}")
+                if i % 64 == 0:
+                    # Only fields this writer owns: a published snapshot of the shared counter would overwrite it
+                    publish_task_progress(task_id, task=task_id, progress=i * 100 // UPDATES)
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not stop.is_set():
+                for task_id in task_ids:
+                    if get_task_status(task_id)["status"] == "not_found":
+                        errors.append(RuntimeError(f"{task_id} was lost"))
+                        return
+                time.sleep(0.001)  # Clients poll, they do not spin
+        except Exception as e:
+            errors.append(e)
+
+    def churn():
+        # Stays below MAX_TASKS_CACHE_SIZE together with the tasks under test, so nothing may be evicted
+        count = 0
+        while not stop.is_set():
+            create_task(f"churn_{count % (save_task_cache.MAX_TASKS_CACHE_SIZE // 2)}")
+            count += 1
+            if count % 100 == 0:
+                time.sleep(0.001)
+
+    background = [threading.Thread(target=reader) for _ in range(READERS)] + [threading.Thread(target=churn)]
+    writers = [threading.Thread(target=writer, args=(index,)) for index in range(THREADS)]
+    for thread in background + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in background:
+        thread.join()
+    for unsubscribe in unsubscribes:
+        unsubscribe()
+
+    assert errors == []
+    assert {task_id: get_task_status(task_id)["completed_files"] for task_id in task_ids} == \
+        {task_id: expected for task_id in task_ids}
+    assert all(count >= 1 for count in published.values())
+
+
+def test_rate_limited_progress_is_written_immediately():
+    create_task("rate_limited")
+    notified = []
+    unsubscribe = subscribe_task("rate_limited", notified.append)
+    try:
+        assert publish_task_progress("rate_limited", force=True, progress=10) is True
+        assert publish_task_progress("rate_limited", progress=20) is False
+        assert get_task_status("rate_limited")["progress"] == 20
+        assert [status["progress"] for status in notified] == [10]
+
+        # Terminal statuses are always notified
+        assert publish_task_progress("rate_limited", status="completed", progress=100) is True
+        assert [status["progress"] for status in notified] == [10, 100]
+    finally:
+        unsubscribe()
+
+
+def test_sqlite_backend_keeps_the_newest_status(tmp_path):
+    backend = SQLiteTaskBackend(str(tmp_path / "task_status.db"), ttl=60)
+    assert backend.load("task") is None
+
+    now = time.time()
+    backend.save("task", {"status": "processing", "completed_files": 2}, updated_at=now)
+    backend.save("task", {"status": "processing", "completed_files": 1}, updated_at=now - 1)  # Older, ignored
+    assert backend.load("task") == ({"status": "processing", "completed_files": 2}, now)
+
+    # A second connection, as another worker process would open, sees the same row
+    other = SQLiteTaskBackend(str(tmp_path / "task_status.db"), ttl=60)
+    assert other.load("task") == ({"status": "processing", "completed_files": 2}, now)
+
+
+def test_sqlite_backend_expires_entries(tmp_path):
+    backend = SQLiteTaskBackend(str(tmp_path / "task_status.db"), ttl=60)
+    now = time.time()
+    backend.save("expired", {"status": "completed"}, updated_at=now - 120)
+    backend.save("live", {"status": "completed"}, updated_at=now)
+
+    assert backend.load("expired") is None
+    assert backend.purge_expired() == 1
+    assert backend.load("live") == ({"status": "completed"}, now)
@@ -0,0 +1,28 @@
+"""Tests of the styles exported by text segments (pyJianYingDraft.text_segment)."""
+import json
+
+from pyJianYingDraft import Text_segment, Text_shadow, Text_style, trange
+from pyJianYingDraft.text_segment import TextStyleRange
+
+
+def exported_styles(segment: Text_segment) -> list:
+    return json.loads(segment.export_material()["content"])["styles"]
+
+
+def test_shadow_applies_to_the_leading_default_style():
+    """Text before the first style range uses the global style, shadow included; this used to raise NameError"""
+    shadow = Text_shadow(has_shadow=True, color="#ff0000")
+    segment = Text_segment("Hello world", trange("0s", "1s"), style=Text_style(size=10), shadow=shadow)
+    segment.add_text_style(TextStyleRange(6, 11, Text_style(size=12)))
+
+    styles = exported_styles(segment)
+    assert [style["range"] for style in styles] == [[0, 6], [6, 11]]
+    assert styles[0]["shadows"][0]["content"]["solid"]["color"] == [1.0, 0.0, 0.0]
+    assert "shadows" not in styles[1]
+
+
+def test_shadow_without_style_ranges():
+    segment = Text_segment("Hello", trange("0s", "1s"), shadow=Text_shadow(has_shadow=True))
+    styles = exported_styles(segment)
+    assert [style["range"] for style in styles] == [[0, 5]]
+    assert len(styles[0]["shadows"]) == 1
@@ -0,0 +1,121 @@
+import copy
+from typing import Any, Dict, List, Optional
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import trange
+from add_audio_track import build_audio_segment
+from add_effect_impl import resolve_effect_type
+from add_text_impl import build_text_segment, parse_text_styles
+from add_video_track import build_video_segment
+from create_draft import get_or_create_draft
+from draft_cache import get_cached_draft, get_draft_lock, remove_from_cache, update_cache
+from util import generate_draft_url
+
+# Track type -> (Track_type, default track name), the default names match the single-operation endpoints
+TIMELINE_TRACK_TYPES = {
+    "video": (draft.Track_type.video, "main"),
+    "audio": (draft.Track_type.audio, "audio_main"),
+    "text": (draft.Track_type.text, "text_main"),
+    "effect": (draft.Track_type.effect, "effect_01"),
+}
+
+
+def _build_effect_segment(effect_type: str, effect_category: str = "scene", start: float = 0,
+                          end: float = 3.0, params: Optional[List[Optional[float]]] = None) -> draft.Effect_segment:
+    """Build an effect segment, parameters are the same as add_effect_impl"""
+    effect_enum = resolve_effect_type(effect_type, effect_category)
+    return draft.Effect_segment(effect_enum, trange(f"{start}s", f"{end - start}s"), params[::-1] if params else None)
+
+
+def _build_segment(track_type: str, script: draft.Script_file, draft_id: str,
+                   draft_folder: Optional[str], params: Dict[str, Any]) -> Any:
+    """Build one segment of a timeline track from its JSON parameters"""
+    if track_type == "video":
+        return build_video_segment(script, draft_id, draft_folder=draft_folder, **params)
+    if track_type == "audio":
+        return build_audio_segment(draft_id, draft_folder=draft_folder, **params)
+    if track_type == "text":
+        if params.get("text_styles"):
+            params["text_styles"] = parse_text_styles(
+                params["text_styles"],
+                font=params.get("font"),
+                font_size=params.get("font_size", 8.0),
+                font_color=params.get("font_color", "#ffffff"),
+                font_alpha=params.get("font_alpha", 1.0),
+                vertical=params.get("vertical", False),
+                border_alpha=params.get("border_alpha", 1.0),
+                border_color=params.get("border_color", "#000000"),
+                border_width=params.get("border_width", 0.0)
+            )
+        return build_text_segment(script, **params)
+    return _build_effect_segment(**params)
+
+
+def build_timeline_impl(
+    tracks: List[Dict[str, Any]],
+    draft_id: Optional[str] = None,
+    draft_folder: Optional[str] = None,
+    width: int = 1080,
+    height: int = 1920
+) -> Dict[str, Any]:
+    """
+    Build a whole timeline from one declarative document.
+    All segments are constructed first, then each track receives its segments in one bulk, pre-sorted insertion
+    that checks overlaps once per track instead of once per segment. Nothing is kept if any segment is invalid.
+    :param tracks: List of {"type": "video" | "audio" | "text" | "effect", "name": track name, "relative_index": render order,
+                   "mute": bool, "segments": [...]}; every segment takes the parameters of the matching single-operation endpoint
+                   (add_video, add_audio, add_text, add_effect) except draft_id, track_name, relative_index, width and height
+    :param draft_id: Draft ID, if None or not found, a new draft will be created
+    :param draft_folder: Draft folder path used to build local material paths, optional parameter
+    :param width: Video width of a newly created draft, default 1080
+    :param height: Video height of a newly created draft, default 1920
+    :return: Draft information and the number of segments added per track
+    """
+    if not isinstance(tracks, list):
+        raise ValueError("tracks must be a list")
+    for index, track in enumerate(tracks):
+        if not isinstance(track, dict) or track.get("type") not in TIMELINE_TRACK_TYPES:
+            track_type = track.get("type") if isinstance(track, dict) else track
+            raise ValueError(f"Unsupported track type at index {index}: {track_type}, supported types: {', '.join(TIMELINE_TRACK_TYPES)}")
+        if not isinstance(track.get("segments", []), list):
+            raise ValueError(f"segments of track at index {index} must be a list")
+
+    existing = draft_id is not None and get_cached_draft(draft_id) is not None
+    draft_id, script = get_or_create_draft(draft_id=draft_id, width=width, height=height)
+
+    with get_draft_lock(draft_id):
+        snapshot = copy.deepcopy(script) if existing else None
+        try:
+            # Construct every segment before touching the draft
+            built = []
+            for index, track in enumerate(tracks):
+                segments = []
+                for seg_index, params in enumerate(track.get("segments", [])):
+                    try:
+                        segments.append(_build_segment(track["type"], script, draft_id, draft_folder, dict(params)))
+                    except Exception as e:
+                        raise ValueError(f"Invalid segment {seg_index} of track at index {index}: {e}") from e
+                built.append(segments)
+
+            # Create the tracks, then insert each track's segments in one pass
+            added = []
+            for track, segments in zip(tracks, built):
+                track_type, default_name = TIMELINE_TRACK_TYPES[track["type"]]
+                track_name = track.get("name") or default_name
+                script.add_track(track_type, track_name=track_name, mute=bool(track.get("mute", False)),
+                                 relative_index=track.get("relative_index", 0))
+                script.add_segments(segments, track_name=track_name)
+                added.append({"name": track_name, "type": track["type"], "segments": len(segments)})
+        except Exception:
+            # Leave the draft as it was before the call
+            if existing:
+                update_cache(draft_id, snapshot)
+            else:
+                remove_from_cache(draft_id)
+            raise
+
+    return {
+        "draft_id": draft_id,
+        "draft_url": generate_draft_url(draft_id),
+        "tracks": added
+    }
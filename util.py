@@ -6,8 +6,11 @@ import os
 import hashlib
 import functools
 import time
+import logging
 from settings.local import DRAFT_DOMAIN, PREVIEW_ROUTER, IS_CAPCUT_ENV
 
+logger = logging.getLogger('flask_video_generator')
+
 def hex_to_rgb(hex_color: str) -> tuple:
     """Convert hexadecimal color code to RGB tuple (range 0.0-1.0)"""
     hex_color = hex_color.lstrip('#')
@@ -64,17 +67,17 @@ def timing_decorator(func_name):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             start_time = time.time()
-            print(f"[{func_name}] Starting execution...")
+            logger.info(f"[{func_name}] Starting execution...")
             try:
                 result = func(*args, **kwargs)
                 end_time = time.time()
                 duration = end_time - start_time
-                print(f"[{func_name}] Execution completed, time taken: {duration:.3f} seconds")
+                logger.info(f"[{func_name}] Execution completed, time taken: {duration:.3f} seconds")
                 return result
             except Exception as e:
                 end_time = time.time()
                 duration = end_time - start_time
-                print(f"[{func_name}] Execution failed, time taken: {duration:.3f} seconds, error: {e}")
+                logger.error(f"[{func_name}] Execution failed, time taken: {duration:.3f} seconds, error: {e}")
                 raise
         return wrapper
     return decorator